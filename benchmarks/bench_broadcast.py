@@ -0,0 +1,120 @@
+# Description:  Compares sending a live game to many spectators as the whole board after every move, serialized
+#               once per spectator, with the BroadcastHub of janggi.broadcast, which encodes each move once and
+#               shares the frame. Some of the spectators keep a copy of the game from the frames and are checked
+#               against the real game at the end, and a few are slow, to show them being resynced with keyframes
+#               instead of holding up the game.
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.broadcast import BroadcastHub, apply_frame
+from janggi.engine import JanggiGame
+
+
+def random_moves(plies, seed=43):
+    """
+    Description:    Plays seeded random legal moves and returns them as make_move locations
+    """
+
+    generator = random.Random(seed)
+    game = JanggiGame()
+    moves = []
+    for _ in range(plies):
+        legal = game.legal_moves()
+        if len(legal) == 0 or game.get_game_state() != "UNFINISHED":
+            break
+        curr, new = generator.choice(legal)
+        moves.append((game.convert_loc(curr), game.convert_loc(new)))
+        game.make_move(*moves[-1])
+    return moves
+
+
+def full_board(moves, spectators):
+    """
+    Description:    Sends the whole board as JSON to every spectator after every move
+    Output(s):      (seconds taken, bytes sent)
+    """
+
+    game = JanggiGame()
+    sent = 0
+    start = time.perf_counter()
+    for move in moves:
+        game.make_move(*move)
+        for _ in range(spectators):
+            board = {game.convert_loc(coords): piece.get_name() for coords, piece in game.get_board().items()}
+            sent += len(json.dumps({"board": board, "turn": game.get_turn(), "check": game.get_check(),
+                                    "state": game.get_game_state()}))
+    return time.perf_counter() - start, sent
+
+
+async def watch(subscription, mirror, delay):
+    """
+    Description:    Reads frames forever, keeping a copy of the game if mirror is a JanggiGame
+    Output(s):      bytes read, once cancelled
+    """
+
+    received = 0
+    try:
+        async for frame in subscription:
+            received += len(frame)
+            if mirror is not None:
+                apply_frame(mirror, frame)
+            await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        return received
+
+
+async def broadcast(moves, spectators, mirrors, slow):
+    """
+    Description:    Sends the moves through a BroadcastHub
+    Output(s):      (seconds taken, bytes received, whether every copy matches the game, resyncs)
+    """
+
+    game = JanggiGame()
+    hub = BroadcastHub(keyframe_every=16, queue_size=32)
+    hub.add_game(0, game)
+    watchers = []
+    for number in range(spectators):
+        mirror = JanggiGame() if number < mirrors + slow else None
+        delay = 0.02 if number >= spectators - slow else 0
+        subscription = hub.subscribe(0)
+        watchers.append((subscription, mirror, asyncio.ensure_future(watch(subscription, mirror, delay))))
+
+    start = time.perf_counter()
+    for move in moves:
+        game.make_move(*move)
+        await asyncio.sleep(0)          # let the spectators read
+    elapsed = time.perf_counter() - start
+
+    while any(not subscription.get_queue().empty() for subscription, mirror, task in watchers):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    for subscription, mirror, task in watchers:
+        task.cancel()
+    received = sum(await asyncio.gather(*[task for subscription, mirror, task in watchers]))
+    matches = all(mirror.export_position() == game.export_position() for subscription, mirror, task in watchers
+                  if mirror is not None)
+    resyncs = sum(subscription.get_resyncs() for subscription, mirror, task in watchers)
+    return elapsed, received, matches, resyncs
+
+
+def main(spectators=1000, plies=200):
+    moves = random_moves(plies)
+    elapsed, sent = full_board(moves, spectators)
+    print("%d moves, %d spectators" % (len(moves), spectators))
+    print("whole board per spectator  %6.2fs  %10d bytes  %6.1f bytes per move per spectator" %
+          (elapsed, sent, sent / len(moves) / spectators))
+    elapsed, received, matches, resyncs = asyncio.run(broadcast(moves, spectators, 20, 5))
+    print("broadcast hub              %6.2fs  %10d bytes  %6.1f bytes per move per spectator" %
+          (elapsed, received, received / len(moves) / spectators))
+    print("copies kept from frames match the game: %s, slow spectators resynced %d times" % (matches, resyncs))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,143 @@
+# Description:  Plays timed games with janggi.player.EnginePlayer. The first part is engine against engine on a
+#               short clock with byoyomi, comparing searching to a fixed depth, thinking a flat share of the main
+#               time, and janggi.clock.allocate_time, by time losses, depth reached and time per move. The second
+#               part is the engine against a stand-in for a person, who thinks for a while and then plays what a
+#               shallow search likes, with and without pondering. It reports how often the engine guessed the
+#               reply and the depth it reached in the same time on its clock.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.clock import Clock
+from janggi.engine import JanggiGame
+from janggi.player import EnginePlayer
+from janggi.search import Search
+
+
+def flat_time(game, main, increment=0.0, byoyomi=0.0, periods=0):
+    """
+    Description:    Thinks for a thirtieth of the main time, or half a byoyomi period once that is gone
+    """
+
+    think = main / 30 if main > 0 else byoyomi / 2
+    return think, think
+
+
+class Person:
+    """
+    Description:    Stands in for a person: waits a while, then plays the best move of a depth 2 search
+    """
+
+    def __init__(self, delay):
+        self._delay = delay
+
+    def choose_move(self, game):
+        time.sleep(self._delay)
+        return Search(game.fork()).search(2)[0]
+
+    def ponder(self, game):
+        pass
+
+    def stop_pondering(self):
+        pass
+
+
+def play(players, clock, plies):
+    """
+    Description:    Plays a game with the clock pressed after every move
+    Output(s):      the player who lost on time, or None
+    """
+
+    game = JanggiGame()
+    clock.watch(game)
+    clock.start(game.get_turn())
+    for _ in range(plies):
+        if game.get_game_state() != "UNFINISHED" or clock.get_flagged() is not None:
+            break
+        move = players[game.get_turn()].choose_move(game)
+        if move is None:
+            break
+        game.make_move(game.convert_loc(move[0]), game.convert_loc(move[1]))
+        players[other(game.get_turn())].ponder(game)
+    for player in players.values():
+        player.stop_pondering()
+    if clock.get_running() is not None:
+        clock.stop()
+    return clock.get_flagged()
+
+
+def other(player):
+    return "R" if player == "B" else "B"
+
+
+def policy_games(games, plies, main, byoyomi, periods):
+    """
+    Description:    Plays engine against engine with each way of spending the clock
+    """
+
+    policies = [("fixed depth 3", dict(max_depth=3, clock=False)), ("flat share", dict(allocate=flat_time)),
+                ("allocate_time", dict())]
+    for name, settings in policies:
+        losses, depths, used = 0, [], []
+        for _ in range(games):
+            clock = Clock(main, byoyomi=byoyomi, periods=periods)
+            players = dict()
+            for player in ("B", "R"):
+                options = dict(settings, ponder=False)
+                options["clock"] = None if options.get("clock") is False else clock
+                players[player] = EnginePlayer(**options)
+            depth_log = []
+            for player in players.values():
+                player.choose_move = recording(player, depth_log)
+            if play(players, clock, plies) is not None:
+                losses += 1
+            depths.extend(depth_log)
+            used.extend(clock.get_used("B") + clock.get_used("R"))
+        print("%-14s  time losses %d/%d  mean depth %4.2f  mean %5.2fs per move  longest %5.2fs" %
+              (name, losses, games, sum(depths) / len(depths), sum(used) / len(used), max(used)))
+
+
+def recording(player, depths):
+    """
+    Description:    Wraps choose_move of an EnginePlayer to note the depth each search reached
+    """
+
+    choose_move = player.choose_move
+
+    def choose(game):
+        move = choose_move(game)
+        if player.get_last() is not None:
+            depths.append(player.get_last()[3])
+        return move
+    return choose
+
+
+def ponder_games(plies, main, delay):
+    """
+    Description:    Plays the engine against a Person with pondering on and off
+    """
+
+    for ponder in (False, True):
+        clock = Clock(main, byoyomi=1.0, periods=3)
+        engine = EnginePlayer(clock, ponder=ponder)
+        depths = []
+        engine.choose_move = recording(engine, depths)
+        play({"B": engine, "R": Person(delay)}, clock, plies)
+        used = clock.get_used("B")
+        print("pondering %-5s  %2d moves, guessed %2d of %2d pondered replies  mean depth %4.2f  mean %5.2fs per move "
+              "on the clock" % (ponder, len(used), engine.get_hits(), engine.get_ponders(), sum(depths) / len(depths),
+                                sum(used) / len(used)))
+
+
+def main(games=2, plies=60, main_time=6):
+    print("engine against engine, %ds + 3 x 0.3s byoyomi, %d games of up to %d plies" % (main_time, games, plies))
+    policy_games(games, plies, main_time, 0.3, 3)
+    print("engine against a person taking 0.5s a move, %ds + 3 x 1s byoyomi, %d plies" % (main_time, plies // 2))
+    ponder_games(plies // 2, main_time, 0.5)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,76 @@
+# Description:  Compares JanggiGame.fork with copy.deepcopy. Reports the time to make each copy and the memory used
+#               by thousands of copies of one game, both untouched and after one move in each copy. The forks are
+#               measured again from a game 80 plies in, to show that a fork does not copy the history it starts with.
+
+import copy
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+
+
+def measure(name, game, make_copy, count, move=None):
+    """
+    Description:    Makes count copies of the game and prints the time and memory used
+    Input(s):       name:       label for the output
+                    game:       the game to copy
+                    make_copy:  function that copies a game
+                    count:      how many copies to make
+                    move:       a move to make in each copy with do_move, None to leave them untouched
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    copies = []
+    for _ in range(count):
+        branch = make_copy(game)
+        if move is not None:
+            branch.do_move(*move)
+        copies.append(branch)
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print("%-22s %6d copies  %8.1f us/copy  %10.1f KB total  %7.0f bytes/copy" %
+          (name, count, elapsed / count * 1e6, used / 1024, used / count))
+
+
+def long_game(plies, seed=29):
+    """
+    Description:    Plays seeded random legal moves and returns the game reached
+    """
+
+    generator = random.Random(seed)
+    game = JanggiGame()
+    game.set_draw_rules(None)
+    for _ in range(plies):
+        curr, new = generator.choice(game.legal_moves())
+        game.make_move(game.convert_loc(curr), game.convert_loc(new))
+    return game
+
+
+def main(count=2000):
+    game = JanggiGame()
+    game.make_move("c7", "c6")
+    game.make_move("c1", "d3")
+    move = game.legal_moves()[0]
+
+    measure("fork", game, lambda g: g.fork(), count)
+    measure("fork + do_move", game, lambda g: g.fork(), count, move)
+    measure("deepcopy", game, copy.deepcopy, count // 10)
+    measure("deepcopy + do_move", game, copy.deepcopy, count // 10, move)
+
+    game = long_game(80)
+    move = game.legal_moves()[0]
+    measure("80 plies: fork", game, lambda g: g.fork(), count)
+    measure("80 plies: fork + move", game, lambda g: g.fork(), count, move)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
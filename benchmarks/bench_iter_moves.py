@@ -0,0 +1,92 @@
+# Description:  Compares the dictionary move generators with JanggiGame.iter_moves over a set of positions from
+#               random games. Reports the time and the peak memory allocated for generating every move of both
+#               players in each position.
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+
+
+def positions(count, seed=2021):
+    """
+    Description:    Plays random legal moves and keeps a fork of each position reached
+    Input(s):       count:  how many positions to collect
+                    seed:   the seed for the random moves
+    """
+
+    generator = random.Random(seed)
+    found = []
+    while len(found) < count:
+        game = JanggiGame()
+        for _ in range(60):
+            moves = game.legal_moves()
+            if len(moves) == 0:
+                break
+            game.do_move(*generator.choice(moves))
+            found.append(game.fork())
+    return found[:count]
+
+
+def dict_path(game):
+    count = 0
+    for piece in list(game.get_board().values()):
+        count += len(game.piece_moves(piece))
+    return count
+
+
+def iter_path(game):
+    count = 0
+    for player in ("B", "R"):
+        for move in game.iter_moves(player):
+            count += 1
+    return count
+
+
+def captures_path(game):
+    count = 0
+    for player in ("B", "R"):
+        for move in game.iter_moves(player, quiets=False):
+            count += 1
+    return count
+
+
+def measure(name, games, generate):
+    """
+    Description:    Runs a generator over every position and prints the time per position, and the peak memory
+                    allocated while generating the moves of one position, measured with tracemalloc
+    Input(s):       name:       label for the output
+                    games:      the positions
+                    generate:   function that generates the moves of a game and returns how many there were
+    """
+
+    start = time.perf_counter()
+    moves = sum(generate(game) for game in games)
+    elapsed = time.perf_counter() - start
+
+    peaks = 0
+    tracemalloc.start()
+    for game in games:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        generate(game)
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    print("%-14s %7.1f us/position  %6.1f moves/position  %8.0f peak bytes allocated/position" %
+          (name, elapsed / len(games) * 1e6, moves / len(games), peaks / len(games)))
+
+
+def main(count=500):
+    games = positions(count)
+    measure("dict", games, dict_path)
+    measure("iter_moves", games, iter_path)
+    measure("captures only", games, captures_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,124 @@
+# Description:  Measures the game store of janggi.journal with thousands of live games. The same random games are
+#               played through plain JanggiGames and through stores with different group sizes and fsync batching.
+#               make_move takes most of the time, so the log is also timed on its own by appending the same moves
+#               without playing them. Then the time to recover every game is measured, from the log alone and from
+#               a snapshot.
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.journal import MOVE, GameStore
+from janggi.record import encode_move
+
+SETTINGS = [
+    ("group 1, fsync each", dict(group_size=1, sync_every=1)),
+    ("group 64, fsync each", dict(group_size=64, sync_every=1)),
+    ("group 64, fsync per 16", dict(group_size=64, sync_every=16)),
+    ("group 256, no fsync", dict(group_size=256, sync_every=0)),
+]
+
+
+def random_games(count, plies, seed=42):
+    """
+    Description:    Plays seeded random legal moves and returns the moves of each game as make_move locations
+    """
+
+    generator = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = JanggiGame()
+        moves = []
+        for _ in range(plies):
+            legal = game.legal_moves()
+            if len(legal) == 0:
+                break
+            curr, new = generator.choice(legal)
+            moves.append((game.convert_loc(curr), game.convert_loc(new)))
+            game.make_move(*moves[-1])
+            if game.get_game_state() != "UNFINISHED":
+                break
+        games.append(moves)
+    return games
+
+
+def play(games, store=None):
+    """
+    Description:    Plays the games one move of each game at a time, the way a server with many live games would
+    Output(s):      (the number of moves, the seconds taken)
+    """
+
+    start = time.perf_counter()
+    if store is None:
+        live = [JanggiGame() for _ in games]
+    else:
+        live = [store.new_game() for _ in games]
+    count = 0
+    for ply in range(max(len(moves) for moves in games)):
+        for number, moves in enumerate(games):
+            if ply < len(moves):
+                if store is None:
+                    live[number].make_move(*moves[ply])
+                else:
+                    store.make_move(live[number], *moves[ply])
+                count += 1
+    if store is not None:
+        store.commit()
+    return count, time.perf_counter() - start
+
+
+def log_only(games, store):
+    """
+    Description:    Appends the moves of the games to the log of a store without playing them
+    Output(s):      (the number of moves, the seconds taken)
+    """
+
+    game = JanggiGame()
+    records = [(number, encode_move(game.convert_coords(curr), game.convert_coords(new)))
+               for number, moves in enumerate(games) for curr, new in moves]
+    start = time.perf_counter()
+    for number, move in records:
+        store.append(MOVE, number, move)
+    store.commit()
+    return len(records), time.perf_counter() - start
+
+
+def main(count=2000, plies=12):
+    games = random_games(count, plies)
+    moves, plain = play(games)
+    print("%d games, %d moves" % (count, moves))
+    print("%-24s %8.0f moves/s" % ("no store", moves / plain))
+
+    directory = tempfile.mkdtemp(prefix="janggi-journal-")
+    try:
+        for name, settings in SETTINGS:
+            path = os.path.join(directory, name.replace(" ", "").replace(",", "-"))
+            with GameStore(path + "-log", snapshot_every=None, **settings) as store:     # never opened again
+                logged, log_elapsed = log_only(games, store)
+            with GameStore(path, snapshot_every=None, **settings) as store:
+                moves, elapsed = play(games, store)
+            print("%-24s %8.0f moves/s  log alone %9.0f moves/s, %5.1f us per move" %
+                  (name, moves / elapsed, logged / log_elapsed, log_elapsed / logged * 1e6))
+
+        start = time.perf_counter()
+        with GameStore(path, snapshot_every=None) as store:
+            recovered = len(store.get_games())
+            log_time = time.perf_counter() - start
+            store.snapshot()
+        start = time.perf_counter()
+        with GameStore(path, snapshot_every=None) as store:
+            snapshot_time = time.perf_counter() - start
+        print("recovering %d games: %.2fs replaying the log, %.2fs from a snapshot" %
+              (recovered, log_time, snapshot_time))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,65 @@
+# Description:  Measures how much each move ordering heuristic cuts the search. A fixed suite of positions, reached
+#               by seeded random games, is searched to the same depth with more of the heuristics turned on each
+#               time, and the positions searched and the time are added up over the suite.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.ordering import MoveOrdering
+from janggi.search import Search
+
+ORDERINGS = [
+    ("table move only", dict(mvv_lva=False, killers=False, history=False)),
+    ("+ mvv-lva", dict(mvv_lva=True, killers=False, history=False)),
+    ("+ killers", dict(mvv_lva=True, killers=True, history=False)),
+    ("+ history", dict(mvv_lva=True, killers=True, history=True)),
+]
+
+
+def suite(count, seed=38):
+    """
+    Description:    Plays seeded random legal moves for 10 to 40 plies and keeps the position each game ends in
+    Input(s):       count:  how many positions to collect
+                    seed:   the seed for the random moves
+    """
+
+    generator = random.Random(seed)
+    found = []
+    while len(found) < count:
+        game = JanggiGame()
+        for _ in range(generator.randint(10, 40)):
+            moves = game.legal_moves()
+            if len(moves) == 0:
+                break
+            game.do_move(*generator.choice(moves))
+        if len(game.legal_moves()) > 0:
+            found.append(game.export_position())
+    return found
+
+
+def main(depth=3, count=20):
+    positions = suite(count)
+    baseline = None
+    for name, options in ORDERINGS:
+        nodes = 0
+        start = time.perf_counter()
+        for position in positions:
+            game = JanggiGame()
+            game.load_position(*position)
+            search = Search(game, ordering=MoveOrdering(**options))
+            search.search(depth)
+            nodes += search.get_nodes()
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = nodes
+        print("%-16s depth %d  %9d nodes  %5.1f%% of the first  %6.2fs" %
+              (name, depth, nodes, 100.0 * nodes / baseline, elapsed))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,51 @@
+# Description:  Measures how the parallel search scales with the number of worker processes. Each run searches the
+#               same position to a fixed depth and reports the time to depth, positions per second and the speedup
+#               over the serial search. Two workers are always run, even on one core, so the extra positions the
+#               split search looks at can be seen; their time only means something when there are cores for them.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.search import ParallelSearch, Search
+
+
+def opening():
+    """
+    Description:    Returns a game a few moves in, so there are captures to look at
+    """
+
+    game = JanggiGame()
+    for curr, new in [("c7", "c6"), ("c1", "d3"), ("b10", "d7"), ("b3", "e3"), ("c10", "d8"), ("h1", "g3")]:
+        game.make_move(curr, new)
+    return game
+
+
+def main(depth=3):
+    game = opening()
+
+    start = time.perf_counter()
+    search = Search(game)
+    move, score, pv, reached = search.search(depth)
+    serial = time.perf_counter() - start
+    print("serial    depth %d  %.2fs  %8d nodes  %7.0f nodes/s  best %s" %
+          (reached, serial, search.get_nodes(), search.get_nodes() / serial, move))
+
+    cores = os.cpu_count() or 1
+    counts = sorted(set([1, 2, 4, 8, 16, 32, cores]))
+    for workers in [count for count in counts if count <= max(2, cores)]:
+        with ParallelSearch(workers) as parallel:
+            parallel.search(game, 1)                # start the processes before timing
+            start = time.perf_counter()
+            move, score, pv, reached = parallel.search(game, depth)
+            elapsed = time.perf_counter() - start
+        print("workers %2d depth %d  %.2fs  %8d nodes  %7.0f nodes/s  speedup %.2fx  best %s%s" %
+              (workers, reached, elapsed, parallel.get_nodes(), parallel.get_nodes() / elapsed, serial / elapsed,
+               move, "  (more workers than the %d cores)" % cores if workers > cores else ""))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,78 @@
+# Description:  Compares the bitboard board with the dictionary board of JanggiGame on perft: counting every sequence
+#               of legal moves a few plies deep, from the start and from a middlegame position. Both boards have to
+#               reach the same counts, so this is also a check that they follow the same rules. JanggiGame.legal_moves
+#               tries each move on a BitBoard to see if it leaves the general attacked, so the dictionary side does
+#               not use it: it makes each move with do_move and asks general_attacked, as legal_moves used to.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.bitboard import BitBoard
+from janggi.engine import JanggiGame
+
+
+def middlegame():
+    """
+    Description:    Returns a game some moves in, with captures and checks close
+    """
+
+    game = JanggiGame()
+    for curr, new in [("c7", "c6"), ("c1", "d3"), ("b10", "d7"), ("b3", "e3"), ("c10", "d8"), ("h1", "g3"),
+                      ("e7", "e6"), ("e3", "e6"), ("h8", "c8"), ("d3", "e5"), ("c8", "c4"), ("e5", "c4")]:
+        game.make_move(curr, new)
+    return game
+
+
+def dict_legal_moves(game):
+    """
+    Description:    Returns the legal moves of the player to move using only the dictionary board
+    """
+
+    player = game.get_turn()
+    moves = []
+    for curr, new, target in list(game.iter_moves(player)):
+        captured = game.do_move(curr, new)
+        if not game.general_attacked(player):
+            moves.append((curr, new))
+        game.undo_move(curr, new, captured)
+    return moves
+
+
+def dict_perft(game, depth):
+    """
+    Description:    Counts the positions depth plies ahead with dict_legal_moves and do_move on the dictionary board
+    """
+
+    if depth == 0:
+        return 1
+    moves = dict_legal_moves(game)
+    if depth == 1:
+        return len(moves)
+    count = 0
+    for curr, new in moves:
+        captured = game.do_move(curr, new)
+        count += dict_perft(game, depth - 1)
+        game.undo_move(curr, new, captured)
+    return count
+
+
+def main(max_depth=3):
+    for name, game in [("start", JanggiGame()), ("middlegame", middlegame())]:
+        board = BitBoard(game.export_position())
+        for depth in range(1, max_depth + 1):
+            start = time.perf_counter()
+            expected = dict_perft(game, depth)
+            dict_time = time.perf_counter() - start
+            start = time.perf_counter()
+            count = board.perft(depth)
+            bit_time = time.perf_counter() - start
+            print("%-10s depth %d  %9d positions  dict %7.2fs %8.0f/s  bitboard %7.2fs %8.0f/s  %5.1fx%s" %
+                  (name, depth, count, dict_time, expected / dict_time, bit_time, count / bit_time,
+                   dict_time / bit_time, "" if count == expected else "  MISMATCH, dict has %d" % expected))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
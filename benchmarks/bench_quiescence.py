@@ -0,0 +1,76 @@
+# Description:  Compares the search with and without the quiescence search on positions where captures are
+#               hanging. Each position comes from a seeded random game and is only kept if the player to move has a
+#               capture. Reports the positions searched, how many of them were in the quiescence search, the time per
+#               position, and how many positions the search left with a move that loses material in a static
+#               exchange.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.exchange import static_exchange
+from janggi.search import Search
+
+
+def suite(count, seed=39):
+    """
+    Description:    Plays seeded random legal moves and keeps positions where the player to move can capture
+    Input(s):       count:  how many positions to collect
+                    seed:   the seed for the random moves
+    """
+
+    generator = random.Random(seed)
+    found = []
+    while len(found) < count:
+        game = JanggiGame()
+        for _ in range(generator.randint(10, 50)):
+            moves = game.legal_moves()
+            if len(moves) == 0:
+                break
+            game.do_move(*generator.choice(moves))
+        captures = [move for move in game.legal_moves() if move[1] in game.get_board()]
+        if len(captures) > 0:
+            found.append(game.export_position())
+    return found
+
+
+def run(name, positions, depth, quiescence):
+    """
+    Description:    Searches every position of the suite and prints the totals
+    Input(s):       name:       label for the output
+                    positions:  the suite
+                    depth:      the depth to search, in plies
+                    quiescence: whether the search runs the quiescence search
+    """
+
+    nodes = 0
+    quiescence_nodes = 0
+    losing = 0
+    start = time.perf_counter()
+    for position in positions:
+        game = JanggiGame()
+        game.load_position(*position)
+        search = Search(game, quiescence=quiescence)
+        move = search.search(depth)[0]
+        nodes += search.get_nodes()
+        quiescence_nodes += search.get_quiescence_nodes()
+        if move is not None and static_exchange(game, *move) < 0:
+            losing += 1
+    elapsed = time.perf_counter() - start
+    print("%-18s depth %d  %8d nodes  %8d in quiescence  %7.1f ms/position  %2d losing captures played" %
+          (name, depth, nodes, quiescence_nodes, elapsed / len(positions) * 1000, losing))
+
+
+def main(depth=1, count=30):
+    positions = suite(count)
+    run("no quiescence", positions, depth, False)
+    run("quiescence", positions, depth, True)
+    run("no quiescence", positions, depth + 1, False)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,81 @@
+# Description:  Measures the Scheduler of janggi.scheduler with a queue full of bulk game reviews and a trickle of
+#               interactive requests arriving while the reviews run. The same jobs are run twice: once with the
+#               interactive requests in their own class, and once with every job in the bulk class, which is the
+#               queue in submission order. Reports the latency percentiles of the interactive requests and the
+#               deepest the queue got. A last run shows the time and node budgets cutting jobs short.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.scheduler import BULK, INTERACTIVE, Job, Scheduler, percentile_of
+
+
+def random_positions(count, plies, seed=44):
+    """
+    Description:    Plays seeded random legal moves and returns the games reached
+    """
+
+    generator = random.Random(seed)
+    games = []
+    while len(games) < count:
+        game = JanggiGame()
+        for _ in range(plies):
+            legal = game.legal_moves()
+            if len(legal) == 0 or game.get_game_state() != "UNFINISHED":
+                break
+            curr, new = generator.choice(legal)
+            game.make_move(game.convert_loc(curr), game.convert_loc(new))
+        if game.get_game_state() == "UNFINISHED" and len(game.legal_moves()) > 0:
+            games.append(game)
+    return games
+
+
+def run(games, bulk, interactive, depth, every, workers, interactive_priority):
+    """
+    Description:    Queues bulk reviews of the games, then one interactive request every few seconds
+    Output(s):      (sorted interactive latencies, deepest queue, seconds for everything)
+    """
+
+    start = time.perf_counter()
+    with Scheduler(workers) as scheduler:
+        for number in range(bulk):
+            scheduler.submit(Job(games[number % len(games)], depth, BULK))
+        deepest = 0
+        requests = []
+        for number in range(interactive):
+            time.sleep(every)
+            requests.append(scheduler.submit(Job(games[-1 - number % len(games)], 2, interactive_priority)))
+            deepest = max(deepest, sum(stats["queued"] for stats in scheduler.stats().values()))
+        for job in requests:
+            job.wait()
+        latencies = sorted(job.get_latency() for job in requests)
+    return latencies, deepest, time.perf_counter() - start
+
+
+def main(bulk=8, interactive=10, depth=3):
+    games = random_positions(16, 20)
+    print("%d bulk reviews to depth %d, %d interactive requests to depth 2" % (bulk, depth, interactive))
+    for name, priority in (("priority classes", INTERACTIVE), ("submission order", BULK)):
+        latencies, deepest, elapsed = run(games, bulk, interactive, depth, 0.3, None, priority)
+        print("%-18s interactive p50 %6.3fs  p90 %6.3fs  p99 %6.3fs  deepest queue %2d  %5.1fs" %
+              (name, percentile_of(latencies, 50), percentile_of(latencies, 90), percentile_of(latencies, 99),
+               deepest, elapsed))
+
+    with Scheduler() as scheduler:
+        jobs = [scheduler.submit(Job(games[0], 8, BULK, time_budget=0.5)),
+                scheduler.submit(Job(games[1], 8, BULK, node_budget=20000))]
+        for job in jobs:
+            job.wait()
+        report = scheduler.stats()["bulk"]
+    print("budgets: 0.5s budget reached depth %d in %.2fs, 20000 node budget reached depth %d with %d nodes" %
+          (jobs[0].get_result()[3], jobs[0].get_latency(), jobs[1].get_result()[3], jobs[1].get_nodes()))
+    print("workers %d, bulk jobs done %d, p50 %.2fs" % (scheduler.get_workers(), report["done"], report["p50"]))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
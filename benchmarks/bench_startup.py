@@ -0,0 +1,75 @@
+# Description:  Measures how long a fresh interpreter takes to import each part of the janggi package, and the
+#               time to the first legal move: importing the engine, making a JanggiGame and checking one move.
+#               Every command runs in a new process, after one warm-up run so the compiled files are cached.
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+COMMANDS = [
+    ("interpreter only", "pass"),
+    ("import janggi", "import janggi"),
+    ("import janggi.rules", "import janggi.rules"),
+    ("import janggi.engine", "import janggi.engine"),
+    ("import janggi.search", "import janggi.search"),
+    ("import JanggiGame", "import JanggiGame"),
+    ("first legal move", "from janggi.engine import JanggiGame; JanggiGame().make_move('c7', 'c6')"),
+    ("first legal_moves", "from janggi.engine import JanggiGame; JanggiGame().legal_moves()"),
+]
+
+
+def run(code, repeat):
+    """
+    Description:    Runs code in a new interpreter repeat times
+    Input(s):       code:   the Python code to run
+                    repeat: how many times to run it
+    Output(s):      the median time in seconds
+    """
+
+    environment = dict(os.environ)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=environment, check=True)     # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=environment, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def timed(function, *args):
+    """
+    Description:    Calls function with args once
+    Output(s):      the time it took in seconds
+    """
+
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(repeat=15):
+    baseline = None
+    for name, code in COMMANDS:
+        elapsed = run(code, repeat)
+        if baseline is None:
+            baseline = elapsed
+        print("%-22s %7.1f ms  (%+6.1f ms over the interpreter)" % (name, elapsed * 1000,
+                                                                     (elapsed - baseline) * 1000))
+
+    from janggi import tables
+    from janggi.engine import JanggiGame
+
+    built = min(timed(tables.build_tables, JanggiGame) for _ in range(repeat))
+    tables.load_tables(JanggiGame)
+    loaded = min(timed(tables.load_tables, JanggiGame) for _ in range(repeat))
+    print("building the tables %.1f ms, loading the saved tables %.1f ms" % (built * 1000, loaded * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
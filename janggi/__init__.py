@@ -0,0 +1,36 @@
+# Description:  Janggi, or Korean Chess. The rules, engine, search and rendering are separate modules so a program
+#               only pays for importing what it uses:
+#                   janggi.rules    the piece classes, piece values and square numbering
+#                   janggi.engine   JanggiGame, the board and movement rules
+#                   janggi.bitboard the same rules on a bitboard, one int mask per player and piece type
+#                   janggi.search   alpha-beta search
+#                   janggi.ordering move ordering for the search
+#                   janggi.exchange static exchange evaluation of captures
+#                   janggi.render   drawing the board with game2dboard
+#               The names below can also be imported from the package itself, which imports their module the first
+#               time one of them is used.
+
+import importlib
+
+EXPORTS = {"JanggiGame": "janggi.engine", "BitBoard": "janggi.bitboard",
+           "Piece": "janggi.rules", "Soldier": "janggi.rules", "Cannon": "janggi.rules", "Chariot": "janggi.rules",
+           "Elephant": "janggi.rules", "Horse": "janggi.rules", "Advisor": "janggi.rules",
+           "General": "janggi.rules",
+           "Search": "janggi.search", "ParallelSearch": "janggi.search", "MoveOrdering": "janggi.ordering",
+           "static_exchange": "janggi.exchange",
+           "show_board": "janggi.render"}
+
+__all__ = list(EXPORTS)
+
+
+def __getattr__(name):
+    """
+    Description:    Imports the module of an exported name the first time it is asked for
+    Input(s):       name:   the name being looked up on the package
+    """
+
+    if name not in EXPORTS:
+        raise AttributeError("module 'janggi' has no attribute " + repr(name))
+    value = getattr(importlib.import_module(EXPORTS[name]), name)
+    globals()[name] = value
+    return value
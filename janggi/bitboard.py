@@ -0,0 +1,400 @@
+# Description:  A bitboard board for Janggi. The 90 squares fit in one Python int, bit square_index(coords) for each
+#               square, so the pieces of each player and type are kept as one mask each and a question like "is
+#               anything attacking the general" is answered with a few lookups and ands instead of generating moves.
+#               Soldier, advisor and general steps and the horse and elephant jumps come from the same MOVE_TABLES
+#               iter_moves uses, turned into masks, so the two follow the same rules. Chariot and cannon lines use
+#               a mask of each ray: the nearest piece on a ray is its lowest set bit for rays going up the square
+#               numbers and its highest set bit for rays going down.
+#
+#               Squares are given as square numbers (janggi.rules.square_index) rather than (row, column).
+#               Janggi has no river, so unlike chess variants with one there is no river mask, and the palace
+#               only shows up in the step tables of the generals and advisors.
+
+from janggi.engine import JanggiGame, MOVE_TABLES
+from janggi.rules import PIECE_CLASSES, other_player, square_coords, square_index
+
+SQUARES = range(90)
+BITS = [1 << index for index in SQUARES]
+PIECE_TYPES = list(PIECE_CLASSES)
+
+
+def to_mask(coords):
+    """
+    Description:    Returns the mask with a bit set for each of the given squares
+    Input(s):       coords: iterable of (row, column) tuples
+    """
+
+    mask = 0
+    for square in coords:
+        mask |= BITS[square_index(square)]
+    return mask
+
+
+def to_squares(mask):
+    """
+    Description:    Returns the square numbers of the bits set in a mask, lowest first
+    """
+
+    squares = []
+    while mask:
+        low = mask & -mask
+        squares.append(low.bit_length() - 1)
+        mask ^= low
+    return squares
+
+
+# Steps from each square, by player
+SOLDIER = {player: [to_mask(MOVE_TABLES["soldier"][player, square_coords(index)]) for index in SQUARES]
+           for player in ("B", "R")}
+PALACE_STEPS = {player: [to_mask(MOVE_TABLES["palace"][player, square_coords(index)]) for index in SQUARES]
+                for player in ("B", "R")}
+
+# Jumps from each square, as (mask of the squares that block the jump, bit of the square jumped to)
+HORSE = [[(to_mask(blocks), to_mask([new])) for blocks, new in MOVE_TABLES["horse"][square_coords(index)]]
+         for index in SQUARES]
+ELEPHANT = [[(to_mask(blocks), to_mask([new])) for blocks, new in MOVE_TABLES["elephant"][square_coords(index)]]
+            for index in SQUARES]
+
+# The ray of each square in the directions of MOVE_TABLES["rays"]: down the board, up, right and left
+RAYS = [[to_mask(ray) for ray in MOVE_TABLES["rays"][square_coords(index)]] for index in SQUARES]
+RAY_UP = (True, False, True, False)     # whether each ray goes up the square numbers
+
+
+def reverse_steps(steps):
+    """
+    Description:    Turns a table of where a piece can step to from each square into where it can step from
+    """
+
+    result = [0] * 90
+    for index in SQUARES:
+        for target in to_squares(steps[index]):
+            result[target] |= BITS[index]
+    return result
+
+
+def reverse_jumps(jumps):
+    """
+    Description:    Turns a table of jumps from each square into a table of (bit of the square jumped from, mask of
+                    the squares that block the jump) for each square jumped to
+    """
+
+    result = [[] for index in SQUARES]
+    for index in SQUARES:
+        for blocks, target in jumps[index]:
+            result[target.bit_length() - 1].append((BITS[index], blocks))
+    return result
+
+
+SOLDIER_FROM = {player: reverse_steps(SOLDIER[player]) for player in ("B", "R")}
+PALACE_FROM = {player: reverse_steps(PALACE_STEPS[player]) for player in ("B", "R")}
+HORSE_FROM = reverse_jumps(HORSE)
+ELEPHANT_FROM = reverse_jumps(ELEPHANT)
+
+
+def nearest(blockers, direction):
+    """
+    Description:    Returns the square number of the piece nearest the start of a ray
+    Input(s):       blockers:   the mask of the pieces on the ray, not empty
+                    direction:  which of the four rays
+    """
+
+    if RAY_UP[direction]:
+        return (blockers & -blockers).bit_length() - 1
+    return blockers.bit_length() - 1
+
+
+def chariot_attacks(index, occupied):
+    """
+    Description:    Returns the mask of the squares a chariot on a square reaches, up to and including the first
+                    piece in each direction
+    Input(s):       index:      the square number of the chariot
+                    occupied:   the mask of every piece on the board
+    """
+
+    attacks = 0
+    for direction in range(4):
+        ray = RAYS[index][direction]
+        blockers = ray & occupied
+        if blockers:
+            ray &= ~RAYS[nearest(blockers, direction)][direction]
+        attacks |= ray
+    return attacks
+
+
+def cannon_attacks(index, occupied, cannons):
+    """
+    Description:    Returns the mask of the squares a cannon on a square reaches. A cannon jumps exactly one piece,
+                    which can't be a cannon, and moves to any square past it up to and including the next piece,
+                    unless that piece is a cannon.
+    Input(s):       index:      the square number of the cannon
+                    occupied:   the mask of every piece on the board
+                    cannons:    the mask of every cannon on the board
+    """
+
+    attacks = 0
+    for direction in range(4):
+        blockers = RAYS[index][direction] & occupied
+        if not blockers:
+            continue
+        screen = nearest(blockers, direction)
+        if BITS[screen] & cannons:
+            continue
+        ray = RAYS[screen][direction]
+        blockers = ray & occupied
+        if blockers:
+            target = nearest(blockers, direction)
+            ray &= ~RAYS[target][direction]
+            if BITS[target] & cannons:
+                ray &= ~BITS[target]
+        attacks |= ray
+    return attacks
+
+
+class BitBoard:
+    """
+    Description:    A position kept as masks: one for each player and piece type and one for each player, with a
+                    list of what is on each square for looking up a single square.
+    """
+
+    def __init__(self, position=None):
+        """
+        Description:    Sets up the board
+        Input(s):       position:   (turn, placements) as returned by JanggiGame.export_position, defaults to the
+                                    start of the game
+        """
+
+        if position is None:
+            position = JanggiGame().export_position()
+        turn, placements = position
+        self._turn = turn
+        self._pieces = {(player, piece_type): 0 for player in ("B", "R") for piece_type in PIECE_TYPES}
+        self._occupied = {"B": 0, "R": 0}
+        self._squares = [None] * 90
+        for player, piece_type, row, column in placements:
+            index = square_index((row, column))
+            self._pieces[player, piece_type] |= BITS[index]
+            self._occupied[player] |= BITS[index]
+            self._squares[index] = (player, piece_type)
+
+    def get_turn(self):
+        """
+        Description:    Returns whose turn it is
+        """
+
+        return self._turn
+
+    def get_occupied(self, player=None):
+        """
+        Description:    Returns the mask of the players pieces, or of every piece if player is None
+        """
+
+        if player is None:
+            return self._occupied["B"] | self._occupied["R"]
+        return self._occupied[player]
+
+    def get_pieces(self, player, piece_type):
+        """
+        Description:    Returns the mask of the players pieces of one type
+        """
+
+        return self._pieces[player, piece_type]
+
+    def get_square(self, index):
+        """
+        Description:    Returns (player, piece type) of the piece on a square, None if it is empty
+        """
+
+        return self._squares[index]
+
+    def find_general(self, player):
+        """
+        Description:    Returns the square number of the players general, None if it is not on the board
+        """
+
+        general = self._pieces[player, "general"]
+        if not general:
+            return None
+        return general.bit_length() - 1
+
+    def export_position(self):
+        """
+        Description:    Returns the position in the same form as JanggiGame.export_position
+        """
+
+        placements = []
+        for index in SQUARES:
+            if self._squares[index] is not None:
+                row, column = square_coords(index)
+                placements.append(self._squares[index] + (row, column))
+        return self._turn, tuple(placements)
+
+    def attacks(self, index):
+        """
+        Description:    Returns the mask of the squares the piece on a square can move to, own pieces left out.
+                        Generals only get their palace steps, as in iter_moves.
+        Input(s):       index:  the square number of the piece
+        """
+
+        player, piece_type = self._squares[index]
+        occupied = self._occupied["B"] | self._occupied["R"]
+        if piece_type == "chariot":
+            targets = chariot_attacks(index, occupied)
+        elif piece_type == "cannon":
+            targets = cannon_attacks(index, occupied, self._pieces["B", "cannon"] | self._pieces["R", "cannon"])
+        elif piece_type == "horse" or piece_type == "elephant":
+            targets = 0
+            for blocks, target in (HORSE if piece_type == "horse" else ELEPHANT)[index]:
+                if not blocks & occupied:
+                    targets |= target
+        elif piece_type == "soldier":
+            targets = SOLDIER[player][index]
+        else:
+            targets = PALACE_STEPS[player][index]
+        return targets & ~self._occupied[player]
+
+    def moves(self, player=None):
+        """
+        Description:    Returns every move of the players pieces, without checking if they leave the general
+                        attacked
+        Input(s):       player: "B" or "R", defaults to whose turn it is
+        Output(s):      list of (square number from, square number to)
+        """
+
+        if player is None:
+            player = self._turn
+        moves = []
+        for index in to_squares(self._occupied[player]):
+            for target in to_squares(self.attacks(index)):
+                moves.append((index, target))
+        return moves
+
+    def is_attacked(self, index, player):
+        """
+        Description:    Checks if any of the players pieces could move to a square, by looking from the square for
+                        each kind of piece that could reach it
+        Input(s):       index:  the square number
+                        player: "B" or "R", the player that would be attacking
+        """
+
+        pieces = self._pieces
+        occupied = self._occupied["B"] | self._occupied["R"]
+        if self._occupied[player] & BITS[index]:
+            return False
+        if SOLDIER_FROM[player][index] & pieces[player, "soldier"]:
+            return True
+        if PALACE_FROM[player][index] & (pieces[player, "advisor"] | pieces[player, "general"]):
+            return True
+        horses = pieces[player, "horse"]
+        if horses:
+            for source, blocks in HORSE_FROM[index]:
+                if source & horses and not blocks & occupied:
+                    return True
+        elephants = pieces[player, "elephant"]
+        if elephants:
+            for source, blocks in ELEPHANT_FROM[index]:
+                if source & elephants and not blocks & occupied:
+                    return True
+        if chariot_attacks(index, occupied) & pieces[player, "chariot"]:
+            return True
+        cannons = pieces[player, "cannon"]
+        if cannons and not (pieces[other_player(player), "cannon"] & BITS[index]):     # cannons can't take cannons
+            every_cannon = cannons | pieces[other_player(player), "cannon"]
+            for direction in range(4):
+                blockers = RAYS[index][direction] & occupied
+                if not blockers:
+                    continue
+                screen = nearest(blockers, direction)
+                if BITS[screen] & every_cannon:
+                    continue
+                blockers = RAYS[screen][direction] & occupied
+                if blockers and BITS[nearest(blockers, direction)] & cannons:
+                    return True
+        return False
+
+    def general_attacked(self, player):
+        """
+        Description:    Checks if the players general can be captured by the other player
+        """
+
+        general = self.find_general(player)
+        if general is None:
+            return False
+        return self.is_attacked(general, other_player(player))
+
+    def do_move(self, curr, new):
+        """
+        Description:    Moves a piece and hands the turn to the other player. Moving a piece onto its own square
+                        passes the turn.
+        Input(s):       curr:   square number of the piece to move
+                        new:    square number to move it to
+        Output(s):      (player, piece type) of the captured piece, None if nothing was captured
+        """
+
+        captured = None
+        if curr != new:
+            piece = self._squares[curr]
+            captured = self._squares[new]
+            if captured is not None:
+                self._pieces[captured] ^= BITS[new]
+                self._occupied[captured[0]] ^= BITS[new]
+            move = BITS[curr] | BITS[new]
+            self._pieces[piece] ^= move
+            self._occupied[piece[0]] ^= move
+            self._squares[new] = piece
+            self._squares[curr] = None
+        self._turn = other_player(self._turn)
+        return captured
+
+    def undo_move(self, curr, new, captured):
+        """
+        Description:    Takes back a move made with do_move
+        Input(s):       curr:       square number the piece moved from
+                        new:        square number the piece moved to
+                        captured:   what do_move returned
+        """
+
+        self._turn = other_player(self._turn)
+        if curr != new:
+            piece = self._squares[new]
+            move = BITS[curr] | BITS[new]
+            self._pieces[piece] ^= move
+            self._occupied[piece[0]] ^= move
+            self._squares[curr] = piece
+            self._squares[new] = captured
+            if captured is not None:
+                self._pieces[captured] ^= BITS[new]
+                self._occupied[captured[0]] ^= BITS[new]
+
+    def legal_moves(self, player=None):
+        """
+        Description:    Returns every move of the player that does not leave their general attacked
+        Input(s):       player: "B" or "R", defaults to whose turn it is
+        Output(s):      list of (square number from, square number to)
+        """
+
+        if player is None:
+            player = self._turn
+        legal = []
+        for curr, new in self.moves(player):
+            captured = self.do_move(curr, new)
+            if not self.general_attacked(player):
+                legal.append((curr, new))
+            self.undo_move(curr, new, captured)
+        return legal
+
+    def perft(self, depth):
+        """
+        Description:    Counts the positions reached by every sequence of legal moves depth plies long
+        """
+
+        if depth == 0:
+            return 1
+        moves = self.legal_moves()
+        if depth == 1:
+            return len(moves)
+        count = 0
+        for curr, new in moves:
+            captured = self.do_move(curr, new)
+            count += self.perft(depth - 1)
+            self.undo_move(curr, new, captured)
+        return count
@@ -0,0 +1,289 @@
+# Description:  Sends live games to spectators. A BroadcastHub watches games through JanggiGame.add_observer and
+#               turns each move into a small frame, encoded once and handed to every spectator of the game as the
+#               same bytes object. Every few moves it also sends a keyframe with the whole position, which is what
+#               a spectator joining late starts from, followed by the moves since it, so nobody has to replay the
+#               game from the start.
+#
+#               Each spectator has a bounded queue. A spectator that falls so far behind that its queue fills up
+#               has its queue emptied and gets the latest keyframe and the moves since it instead, so a slow
+#               spectator costs a bounded amount of memory and never holds up the others.
+#
+#               Frames, all numbers little endian:
+#                   move:       "M", sequence number (4 bytes), move packed as in janggi.record (2 bytes), captured
+#                               piece (1 byte, player and type coded as in janggi.record, 255 for none), who is in
+#                               check (1 byte), game state (1 byte)
+#                   keyframe:   "K", sequence number of the last move in it (4 bytes), who is in check (1 byte),
+#                               game state (1 byte), the position as a janggi.record checkpoint
+
+import asyncio
+import struct
+
+from janggi.record import PIECE_TYPES, decode_move, decode_position, encode_move, encode_position
+
+MOVE_FRAME = struct.Struct("<cIHBBB")
+KEYFRAME = struct.Struct("<cIBB")
+NO_PIECE = 255
+CHECKS = [None, "B", "R"]
+STATES = ["UNFINISHED", "RED_WON", "BLUE_WON", "DRAW"]
+
+
+def encode_piece(piece):
+    """
+    Description:    Packs a piece into one byte, the same way janggi.record packs the pieces of a checkpoint
+    """
+
+    if piece is None:
+        return NO_PIECE
+    return (0 if piece.get_player() == "B" else 8) | PIECE_TYPES.index(piece.get_type())
+
+
+def decode_frame(data):
+    """
+    Description:    Unpacks a frame
+    Input(s):       data:   the bytes of the frame
+    Output(s):      ("move", sequence number, current coordinates, new coordinates, captured (player, piece type)
+                    or None, check, game state) or ("keyframe", sequence number, (turn, placements), check,
+                    game state)
+    """
+
+    if data[:1] == b"M":
+        kind, sequence, move, captured, check, state = MOVE_FRAME.unpack(data)
+        curr, new = decode_move(move)
+        if captured == NO_PIECE:
+            captured = None
+        else:
+            captured = ("R" if captured & 8 else "B", PIECE_TYPES[captured & 7])
+        return "move", sequence, curr, new, captured, CHECKS[check], STATES[state]
+    kind, sequence, check, state = KEYFRAME.unpack_from(data, 0)
+    return "keyframe", sequence, decode_position(data, KEYFRAME.size), CHECKS[check], STATES[state]
+
+
+def apply_frame(game, data):
+    """
+    Description:    Brings a spectator's copy of a game up to date with a frame. The moves are trusted, they are
+                    made with do_move without checking them.
+    Input(s):       game:   the JanggiGame the spectator keeps
+                    data:   the bytes of the frame
+    Output(s):      the sequence number of the frame
+    """
+
+    frame = decode_frame(data)
+    if frame[0] == "keyframe":
+        game.load_position(*frame[2])
+    else:
+        game.do_move(frame[2], frame[3])
+    game.set_is_in_check(frame[-2])
+    game.set_game_state(frame[-1])
+    return frame[1]
+
+
+class Subscription:
+    """
+    Description:    One spectator of one game. Read the frames with "async for frame in subscription" or get_frame.
+    """
+
+    def __init__(self, channel, size):
+        """
+        Description:    Makes the spectator's queue
+        Input(s):       channel:    the Channel of the game
+                        size:       the most frames the queue holds
+        """
+
+        self._channel = channel
+        self._queue = asyncio.Queue(size)
+        self._resyncs = 0
+
+    def get_resyncs(self):
+        """
+        Description:    Returns how many times the queue filled up and was replaced with a keyframe
+        """
+
+        return self._resyncs
+
+    def get_queue(self):
+        """
+        Description:    Returns the queue of frames waiting to be read
+        """
+
+        return self._queue
+
+    async def get_frame(self):
+        """
+        Description:    Waits for the next frame
+        """
+
+        return await self._queue.get()
+
+    def send(self, frames):
+        """
+        Description:    Puts frames on the queue, starting over from the latest keyframe if they do not fit
+        """
+
+        for frame in frames:
+            try:
+                self._queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.resync()
+                return
+
+    def resync(self):
+        """
+        Description:    Drops the frames not read yet and queues the latest keyframe and the moves since it
+        """
+
+        self._resyncs += 1
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        for frame in self._channel.catch_up()[:self._queue.maxsize]:
+            self._queue.put_nowait(frame)
+
+    def close(self):
+        """
+        Description:    Stops the spectator getting frames
+        """
+
+        self._channel.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._queue.get()
+
+
+class Channel:
+    """
+    Description:    The frames of one game and the spectators watching it
+    """
+
+    def __init__(self, game, keyframe_every, queue_size):
+        """
+        Description:    Starts watching the game
+        Input(s):       game:           the JanggiGame to broadcast
+                        keyframe_every: moves between keyframes
+                        queue_size:     the most frames each spectator's queue holds
+        """
+
+        self._game = game
+        self._keyframe_every = keyframe_every
+        self._queue_size = queue_size
+        self._subscribers = set()
+        self._sequence = 0
+        self._keyframe = self.encode_keyframe()
+        self._since_keyframe = []
+        game.add_observer(self.on_move)
+
+    def get_subscribers(self):
+        """
+        Description:    Returns the set of Subscriptions to the game
+        """
+
+        return self._subscribers
+
+    def encode_keyframe(self):
+        """
+        Description:    Packs the current position of the game into a keyframe
+        """
+
+        game = self._game
+        return KEYFRAME.pack(b"K", self._sequence, CHECKS.index(game.get_check()),
+                             STATES.index(game.get_game_state())) + encode_position(game)
+
+    def catch_up(self):
+        """
+        Description:    Returns the frames a new spectator needs: the latest keyframe and the moves since it
+        """
+
+        return [self._keyframe] + self._since_keyframe
+
+    def on_move(self, curr, new, captured, check, state):
+        """
+        Description:    Called by the game after each move. Encodes the move once and sends the same frame to
+                        every spectator, followed by a keyframe every keyframe_every moves.
+        """
+
+        self._sequence += 1
+        frames = [MOVE_FRAME.pack(b"M", self._sequence, encode_move(curr, new), encode_piece(captured),
+                                  CHECKS.index(check), STATES.index(state))]
+        self._since_keyframe.append(frames[0])
+        if len(self._since_keyframe) >= self._keyframe_every:
+            self._keyframe = self.encode_keyframe()
+            self._since_keyframe = []
+            frames.append(self._keyframe)
+        for subscriber in list(self._subscribers):
+            subscriber.send(frames)
+
+    def subscribe(self):
+        """
+        Description:    Adds a spectator, whose queue starts with the latest keyframe and the moves since it
+        """
+
+        subscriber = Subscription(self, self._queue_size)
+        subscriber.send(self.catch_up())
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """
+        Description:    Removes a spectator
+        """
+
+        self._subscribers.discard(subscriber)
+
+    def close(self):
+        """
+        Description:    Stops watching the game
+        """
+
+        self._game.remove_observer(self.on_move)
+        self._subscribers.clear()
+
+
+class BroadcastHub:
+    """
+    Description:    The channels of every broadcast game. Moves have to be made on the event loop's thread, since
+                    the observers put frames straight on asyncio queues.
+    """
+
+    def __init__(self, keyframe_every=32, queue_size=256):
+        """
+        Description:    Makes an empty hub
+        Input(s):       keyframe_every: moves between keyframes
+                        queue_size:     the most frames each spectator's queue holds, at least keyframe_every + 2
+                                        so a spectator that just caught up has room for the next move
+        """
+
+        self._keyframe_every = keyframe_every
+        self._queue_size = max(queue_size, keyframe_every + 2)
+        self._channels = dict()
+
+    def get_channel(self, game_id):
+        """
+        Description:    Returns the Channel of a game
+        """
+
+        return self._channels[game_id]
+
+    def add_game(self, game_id, game):
+        """
+        Description:    Starts broadcasting a game
+        Input(s):       game_id:    the name spectators subscribe to it by
+                        game:       the JanggiGame
+        """
+
+        self._channels[game_id] = Channel(game, self._keyframe_every, self._queue_size)
+
+    def remove_game(self, game_id):
+        """
+        Description:    Stops broadcasting a game
+        """
+
+        self._channels.pop(game_id).close()
+
+    def subscribe(self, game_id):
+        """
+        Description:    Adds a spectator to a game
+        Output(s):      the Subscription to read the frames from
+        """
+
+        return self._channels[game_id].subscribe()
@@ -0,0 +1,203 @@
+# Description:  Game clocks and how long an engine should think on them. Each player has a main time, plus an
+#               increment added after each of their moves (Fischer) and/or byoyomi: once the main time is used up
+#               each move has to be made within a byoyomi period, and a move that takes longer uses up one of the
+#               player's periods. A player whose move runs past the main time with no periods left, or uses up
+#               their last period, loses on time. The increment only helps once a move is made in time: it is
+#               added after the move, so it can't save a move that overran.
+#
+#               allocate_time decides how long to think on a move: a share of the main time, most of the increment
+#               and byoyomi, more when there are many legal moves or the player is in check, less when there are
+#               few, and never so much that the clock could run out.
+
+import time
+
+MOVES_TO_GO = 30            # moves the main time is spread over
+INCREMENT_SHARE = 0.8       # share of the increment spent on each move
+BYOYOMI_SHARE = 0.7         # share of a byoyomi period spent on each move once in byoyomi
+AVERAGE_MOVES = 32          # legal moves in a typical middle game position
+COMPLEXITY_RANGE = (0.6, 1.6)
+CHECK_FACTOR = 1.4
+NEW_DEPTH_SHARE = 0.5       # share of the target after which no new depth is started, since it would not finish
+HARD_FACTOR = 2.0           # how far past its target a search may run to finish a depth
+MAX_SHARE = 0.3             # most of the main time one move may use
+MARGIN = 0.05               # seconds kept back for making the move
+
+
+class Clock:
+    """
+    Description:    The clocks of both players. One clock runs at a time, press switches to the other one.
+    """
+
+    def __init__(self, main_time, increment=0.0, byoyomi=0.0, periods=0, timer=time.perf_counter):
+        """
+        Description:    Sets both clocks, neither running
+        Input(s):       main_time:  seconds each player starts with
+                        increment:  seconds added after each move
+                        byoyomi:    seconds in a byoyomi period, 0 for none
+                        periods:    byoyomi periods each player has
+                        timer:      function returning the time in seconds, for running a clock on something else
+                                    than the real time
+        """
+
+        self._increment = increment
+        self._byoyomi = byoyomi
+        self._main = {"B": float(main_time), "R": float(main_time)}
+        self._periods = {"B": periods if byoyomi > 0 else 0, "R": periods if byoyomi > 0 else 0}
+        self._used = {"B": [], "R": []}
+        self._timer = timer
+        self._running = None
+        self._started = None
+        self._flagged = None
+
+    def get_running(self):
+        """
+        Description:    Returns whose clock is running, None if neither
+        """
+
+        return self._running
+
+    def get_flagged(self):
+        """
+        Description:    Returns the player who lost on time, None if nobody has
+        """
+
+        return self._flagged
+
+    def get_used(self, player):
+        """
+        Description:    Returns the seconds the player took for each of their moves
+        """
+
+        return self._used[player]
+
+    def get_main(self, player):
+        """
+        Description:    Returns the main time the player has left, counting the time on their running clock
+        """
+
+        main = self._main[player]
+        if self._running == player:
+            main -= self._timer() - self._started
+        return max(0.0, main)
+
+    def get_periods(self, player):
+        """
+        Description:    Returns the byoyomi periods the player has left, not counting the time on their running clock
+        """
+
+        return self._periods[player]
+
+    def get_state(self, player):
+        """
+        Description:    Returns what allocate_time needs to know about the player's clock
+        Output(s):      (main time left, increment, byoyomi, periods left)
+        """
+
+        return self.get_main(player), self._increment, self._byoyomi, self._periods[player]
+
+    def start(self, player):
+        """
+        Description:    Starts the player's clock, stopping the other one first if it is running
+        """
+
+        if self._running is not None:
+            self.stop()
+        self._running = player
+        self._started = self._timer()
+
+    def stop(self):
+        """
+        Description:    Stops the running clock and charges the player for the time, adding the increment
+        Output(s):      the seconds the move took
+        """
+
+        player = self._running
+        used = self._timer() - self._started
+        self._running = None
+        self._used[player].append(used)
+        self.charge(player, used)
+        if self._flagged is None:
+            self._main[player] += self._increment
+        return used
+
+    def charge(self, player, used):
+        """
+        Description:    Takes the time of a move off the player's clock, using up byoyomi periods once the main
+                        time is gone, and flags the player if nothing is left
+        """
+
+        main = self._main[player] - used
+        if main >= 0:
+            self._main[player] = main
+            return
+        self._main[player] = 0.0
+        if self._periods[player] == 0:
+            self._flagged = player
+            return
+        self._periods[player] -= int(-main // self._byoyomi)       # each whole period the move ran over
+        if self._periods[player] <= 0:
+            self._periods[player] = 0
+            self._flagged = player
+
+    def press(self):
+        """
+        Description:    Ends the move of the player whose clock is running and starts the other player's clock
+        Output(s):      the seconds the move took
+        """
+
+        player = self._running
+        used = self.stop()
+        if self._flagged is None:
+            self.start("R" if player == "B" else "B")
+        return used
+
+    def watch(self, game):
+        """
+        Description:    Presses the clock after every move make_move accepts in a game, and stops it once the game
+                        is over. The clock of the player to move has to be started first.
+        Input(s):       game:   the JanggiGame
+        """
+
+        game.add_observer(self.on_move)
+
+    def on_move(self, curr, new, captured, check, state):
+        """
+        Description:    Called by a watched game after each move
+        """
+
+        if self._running is None:
+            return
+        if state == "UNFINISHED":
+            self.press()
+        else:
+            self.stop()
+
+
+def allocate_time(game, main, increment=0.0, byoyomi=0.0, periods=0):
+    """
+    Description:    Decides how long to think on a move
+    Input(s):       game:       the JanggiGame, with the player to move thinking
+                    main:       main time left in seconds
+                    increment:  seconds added after the move
+                    byoyomi:    seconds in a byoyomi period
+                    periods:    byoyomi periods left
+    Output(s):      (soft, limit): no new depth should be started after soft seconds, and the search must stop at
+                    limit seconds
+    """
+
+    moves = len(game.legal_moves())
+    if moves <= 1:
+        return 0.0, 0.0
+    period = byoyomi if periods > 0 else 0.0
+    available = main + period - MARGIN                  # what the move can use without losing anything
+    if available <= 0:
+        return 0.0, 0.0
+
+    target = main / MOVES_TO_GO + increment * INCREMENT_SHARE + period * BYOYOMI_SHARE
+    complexity = min(max(moves / AVERAGE_MOVES, COMPLEXITY_RANGE[0]), COMPLEXITY_RANGE[1])
+    if game.get_check() == game.get_turn():
+        complexity *= CHECK_FACTOR
+    target *= complexity
+
+    limit = min(available, target * HARD_FACTOR, main * MAX_SHARE + increment + period)
+    return min(target * NEW_DEPTH_SHARE, limit), limit
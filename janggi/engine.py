@@ -0,0 +1,1449 @@
+# Author:       Derek Hand
+# Date:         02/27/2021
+# Description:  A program that implements Janggi, or Korean Chess. The board will have 9 columns and 10 rows,
+#               and each piece will have the same rules for movement as the board game. There will be two
+#               players, and the blue player will always go first.
+
+import itertools
+
+from janggi.rules import (Advisor, Cannon, Chariot, Elephant, General, Horse, Soldier, PIECE_CLASSES, other_player,
+                          square_index)
+from janggi.tables import load_tables
+
+
+class JanggiGame:
+    """
+    Description:    Game class that includes the board, pieces, and state members along with controlling piece
+                    movement.
+    """
+
+    def __init__(self):
+        """
+        Description:    Initializes the board and pieces for a new game.
+        """
+
+        self._pieces = self.new_pieces()
+        self._board = self.new_board(self._pieces)
+        self._version = next(POSITION_VERSIONS)
+        self._turn = "B"
+        self._game_state = "UNFINISHED"
+        self._is_in_check = None
+        self._checkmate = None
+        self._hash = self.compute_hash()
+        self._scores = self.compute_scores()
+        self._check_scores = False
+        self._board_shared = False       # True while the board dictionary may be used by a fork
+        self._owned = None               # pieces this game can change, None if it owns all of them
+        self._repetition_limit = 3
+        self._move_limit = None
+        self._observers = []
+        self.clear_history()
+
+    def get_check(self):
+        """
+        Description:    Returns who is in check, if anyone
+        """
+
+        return self._is_in_check
+
+    def set_is_in_check(self, player):
+        """
+        Description:    Updates who is in check
+        Input(s):       player:     The player in check. None if neither player is in check
+        """
+
+        self._is_in_check = player
+
+    def get_pieces(self):
+        """
+        Description:    Returns the boards pieces. A fork does not keep its own set of pieces, so it is made from
+                        the pieces on the board the first time it is asked for.
+        Output(s):      the boards pieces
+        """
+
+        if self._pieces is None:
+            self._pieces = set(self._board.values())
+        return self._pieces
+
+    def get_board(self):
+        """
+        Description:    Returns the board
+        Output(s):      the board
+        """
+
+        return self._board
+
+    def set_board(self, key, value):
+        """
+        Description:    Updates the board when a piece is moved
+        Input(s):       key:    the new tuple of coordinates
+                        value:  the piece object
+        """
+
+        self.own_board()
+        self._board[key] = value
+        self._version = next(POSITION_VERSIONS)
+
+    def get_game_state(self):
+        """
+        Description:    Returns the state of the game
+        Output(s):      "UNFINISHED" if the game is not complete
+                        "RED_WON" if red player has won
+                        "BLUE_WON" if blue player has won
+                        "DRAW" if a draw rule set by set_draw_rules has been reached
+        """
+
+        return self._game_state
+
+    def set_game_state(self, set_state):
+        """
+        Description:    Updates the game state
+        Input(s):       set_state:  a string with what to update the game_state to.
+        """
+
+        self._game_state = set_state
+
+    def get_turn(self):
+        """
+        Description:    Returns whose turn it is
+        """
+
+        return self._turn
+
+    def set_turn(self, turn):
+        """
+        Description:    Updates whose turn it is
+        Input(s):       "B", or "R" depending on whose turn it will be
+        """
+
+        self._turn = turn
+        self._version = next(POSITION_VERSIONS)
+
+    def new_pieces(self):
+        """
+        Description:    Sets up the pieces for both players by initializing the Piece class objects based on player
+                        and the appropriate starting positions for each piece. This information is stored into a
+                        dictionary. This is called when a new game is initialized.
+        """
+
+        pieces = {Soldier("R", 3, 0), Soldier("R", 3, 2), Soldier("R", 3, 4), Soldier("R", 3, 6), Soldier("R", 3, 8),
+                  Soldier("B", 6, 0), Soldier("B", 6, 2), Soldier("B", 6, 4), Soldier("B", 6, 6), Soldier("B", 6, 8),
+                  Cannon("R", 2, 1), Cannon("R", 2, 7),
+                  Cannon("B", 7, 1), Cannon("B", 7, 7),
+                  Chariot("R", 0, 0), Chariot("R", 0, 8),
+                  Chariot("B", 9, 0), Chariot("B", 9, 8),
+                  Elephant("R", 0, 1), Elephant("R", 0, 6),
+                  Elephant("B", 9, 1), Elephant("B", 9, 6),
+                  Horse("R", 0, 2), Horse("R", 0, 7),
+                  Horse("B", 9, 2), Horse("B", 9, 7),
+                  Advisor("R", 0, 3), Advisor("R", 0, 5),
+                  Advisor("B", 9, 3), Advisor("B", 9, 5),
+                  General("R", 1, 4),
+                  General("B", 8, 4)
+                  }
+
+        return pieces
+
+    def new_board(self, pieces):
+        """
+        Description:    Sets up the board for both players. Initialized when starting a new game.
+        Input(s):       pieces: a dictionary of the piece locations.
+        Output(s):      a new janggi board, ready to play
+        """
+
+        board = dict()
+        for piece in sorted(pieces, key=lambda piece: (piece.get_row(), piece.get_column())):   # same order each run
+            board[(piece.get_row(), piece.get_column())] = piece
+        return board
+
+    def convert_coords(self, loc):
+        """
+        Description:    Converts the algebraic notation to cartesian coordinates
+        Input(s):       loc: algebraic expression for piece placement
+        """
+
+        rows = int(loc[1:]) - 1              # to convert to 0 index
+
+        possible_cols = ["a", "b", "c", "d", "e", "f", "g", "h", "i"]
+        cols = possible_cols.index(loc[0])
+        return (rows, cols)
+
+    def convert_loc(self, coords):
+        """
+        Description:    Converts cartesian coordinates back to algebraic notation. The reverse of convert_coords
+        Input(s):       coords: tuple of (row, column)
+        """
+
+        possible_cols = ["a", "b", "c", "d", "e", "f", "g", "h", "i"]
+        return possible_cols[coords[1]] + str(coords[0] + 1)
+
+    def make_move(self, current_loc, new_loc):
+        """
+        Description:    Attempts to move the piece. If it is able to, captures the opponents piece if applicable,
+                        update the game state if applicable, and updates player turn
+        Input(s):       current_loc:    The location of the piece you want to move
+                        new_loc:        The location you want to move the piece to
+        Output(s):      True:   If the move has been made
+                        False:  If the move is illegal
+        """
+
+        curr = self.convert_coords(current_loc)
+        new  = self.convert_coords(new_loc)
+
+        #print("Testing move from", curr, current_loc, "to", new, new_loc)
+
+        if self.get_game_state() != "UNFINISHED":
+            return False
+        if curr not in self.get_board():    # no pieces at that location
+            return False
+        if self.get_turn() != self.get_board()[curr].get_player():   # is it the players piece/turn?
+            return False
+
+        # should also check if current player is in check. If in check and not moving to get out, invalid move
+        else:
+            if self.get_turn() == "B" and curr == new and self.is_in_check("blue") == False:
+                self.set_turn("R")
+                self._hash ^= ZOBRIST_TURN
+                self.record_position()
+                self.notify(curr, new, None)
+                return True
+            if self.get_turn() == "R" and curr == new and self.is_in_check("red") == False:
+                self.set_turn("B")
+                self._hash ^= ZOBRIST_TURN
+                self.record_position()
+                self.notify(curr, new, None)
+                return True
+
+            if new not in self.get_moves(curr):    # only the moving piece's moves are needed here
+                return False
+            else:
+                captured = self.get_board().get(new)
+                self.own_piece(curr)
+                self.get_board()[curr].set_row(new[0])
+                self.get_board()[curr].set_column(new[1])
+                self.set_board(new, self.get_board()[curr])
+                del self.get_board()[curr]                      # update board
+                self._version = next(POSITION_VERSIONS)
+
+                if self.general_attacked(self.get_turn()):        # the move leaves the players general attacked
+                    self.own_piece(new)
+                    self.get_board()[new].set_row(curr[0])
+                    self.get_board()[new].set_column(curr[1])
+                    self.set_board(curr, self.get_board()[new])
+                    del self.get_board()[new]
+                    if captured is not None:
+                        self.set_board(new, captured)       # put back the piece that was taken
+                    self._version = next(POSITION_VERSIONS)
+                    return False
+                elif self.get_turn() == "B":
+                    self.set_turn("R")
+                    self.check_check()
+                    self.update_running(self.get_board()[new], curr, new, captured)
+                    self._hash ^= ZOBRIST_TURN
+                    self.record_position()
+                    self.check_checkmate()
+                    self.notify(curr, new, captured)
+                    return True
+                elif self.get_turn() == "R":
+                    self.set_turn("B")
+                    self.check_check()
+                    self.update_running(self.get_board()[new], curr, new, captured)
+                    self._hash ^= ZOBRIST_TURN
+                    self.record_position()
+                    self.check_checkmate()
+                    self.notify(curr, new, captured)
+                    return True
+            return False
+
+    def is_in_check(self, player):
+        """
+        Description:    Checks if the player is in check
+        Input(s):       player: string of who we want to check, "red" or "blue"
+        Output(s):      True:   if requested player is in check
+                        False:  if requested player is not in check
+        """
+
+        if player == "blue" and self.get_check() == "B":
+            return True
+        elif player == "red" and self.get_check() == "R":
+            return True
+        else:
+            return False
+
+    def possible_moves(self):
+        """
+        Description:    The goal is to make a list of all of the possible moves on the board for each piece. This will
+                        use the Piece class set_move method. I am not sure what methods it will need from the
+                        JanggiGame class. Will update as needed.
+        """
+
+        for coords in list(self.get_board()):
+            self.get_moves(coords)      # sets all valid moves for each piece
+
+    def get_moves(self, coords):
+        """
+        Description:    Returns the moves of the piece at the given square. The moves are only worked out the first
+                        time they are asked for in a position, and are kept on the piece until the board or the turn
+                        changes, so checking one move does not have to look at every piece.
+        Input(s):       coords: tuple of (row, column) of the piece
+        Output(s):      dictionary of possible moves for the piece
+        """
+
+        piece = self.get_board()[coords]
+        if piece.get_moves_version() != self._version:
+            if piece.get_type() == "soldier":
+                piece.set_moves(self.soldier_moves(piece), self._version)
+            elif piece.get_type() == "cannon":
+                piece.set_moves(self.cannon_moves(piece), self._version)
+            elif piece.get_type() == "chariot":
+                piece.set_moves(self.chariot_moves(piece), self._version)
+            elif piece.get_type() == "elephant":
+                piece.set_moves(self.elephant_moves(piece), self._version)
+            elif piece.get_type() == "horse":
+                piece.set_moves(self.horse_moves(piece), self._version)
+            elif piece.get_type() == "advisor":
+                piece.set_moves(self.advisor_moves(piece), self._version)
+            elif piece.get_type() == "general":
+                piece.set_moves(self.general_moves(piece), self._version)
+        return piece.get_moves()
+
+    def check_check(self):
+        """
+        Description:    Checks if the move resulted in a check, or checkmate.
+        Input(s):       coords:     coords to check
+                        piece:      the general to check for check
+        """
+
+        temp = self.find_general(self.get_turn())
+        self.set_is_in_check(None)
+        if temp is None:
+            return False
+
+        for piece in list(self.get_board()):
+            if self.get_board()[piece].get_player() != self.get_turn() and temp in self.get_moves(piece):
+                self.set_is_in_check(self.get_turn())   # stop at the first piece giving check
+                break
+
+        return False
+
+
+    def check_checkmate(self):
+        """
+        Description:    Ends the game if the player to move is in check and has no move that gets them out of it
+        """
+
+        if self.get_check() == self.get_turn() and len(self.legal_moves()) == 0:
+            self.set_game_state("RED_WON" if self.get_turn() == "B" else "BLUE_WON")
+
+    def soldier_moves(self, piece):
+        """
+        Description:    Determines the moves for a soldier and is called by the possible_moves method. Soldiers do not
+                        move backwards, so do not have to check for that. Once they are at the last row, they can only
+                        move side to side.
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = dict()
+
+        if piece.get_player() == "R":
+            moves = self.soldier_moves_helper(piece, moves, 1, 0)       # test moving soldier forward one space
+            moves = self.soldier_moves_helper(piece, moves, 0, 1)
+            moves = self.soldier_moves_helper(piece, moves, 0, -1)
+            if (piece.get_row() > 6) and (piece.get_column() > 2) and (piece.get_column() < 6):
+                if piece.get_column() - 1 < 3:                      # check diagonals if in enemy palace
+                    moves = self.soldier_moves_helper(piece, moves, 1, 1)
+                elif piece.get_column() + 1 > 5:
+                    moves = self.soldier_moves_helper(piece, moves, 1, -1)
+                else:
+                    moves = self.soldier_moves_helper(piece, moves, 1, 1)
+                    moves = self.soldier_moves_helper(piece, moves, 1, -1)
+                    # don't need to check side to side, or forward. already checked
+        else:
+            moves = self.soldier_moves_helper(piece, moves, -1, 0)      # blue moves "down" the list
+            moves = self.soldier_moves_helper(piece, moves, 0, 1)
+            moves = self.soldier_moves_helper(piece, moves, 0, -1)
+            if (piece.get_row() < 3) and (piece.get_column() > 2) and (piece.get_column() < 6):
+                if piece.get_column() -1 < 3:
+                    moves = self.soldier_moves_helper(piece, moves, -1, 1)
+                elif piece.get_column() + 1 > 5:
+                    moves = self.soldier_moves_helper(piece, moves, -1, -1)
+                else:
+                    moves = self.soldier_moves_helper(piece, moves, -1, -1)
+                    moves = self.soldier_moves_helper(piece, moves, -1, 1)
+        return moves
+
+    def soldier_moves_helper(self, piece, moves, test_row, test_column):
+        """
+        Description:    Instead of writing each test, write a helper function that can be called multiple times to
+                        test if a given move is valid.
+        Input(s):       piece:          the piece to check if the move is valid
+                        moves:          dictionary of possible moves for the piece
+                        test_row:       the row to test the move
+                        test_column:    the column to test the move
+        """
+
+        row = piece.get_row()
+        col = piece.get_column()
+
+        if row + test_row in range(10) and col + test_column in range(9):    # check if the move would leave the board
+            test_coord = (row + test_row, col + test_column)    # check if square is occupied
+            if test_coord not in self.get_board():
+                moves[test_coord] = True
+            elif self.get_board()[test_coord].get_player() != piece.get_player():   # occupied, but by other player
+                moves[test_coord] = self.get_board()[test_coord]
+
+        return moves
+
+    def cannon_moves(self, piece):
+        """
+        Description:    Determines the moves for a cannon and is called by the possible_moves method
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = dict()
+
+        moves = self.cannon_moves_helper(piece, moves, 1, 0)  # vertical
+        moves = self.cannon_moves_helper(piece, moves, -1, 0)
+        moves = self.cannon_moves_helper(piece, moves, 0, 1)  # horizontal
+        moves = self.cannon_moves_helper(piece, moves, 0, -1)
+
+        return moves
+
+    def cannon_moves_helper(self, piece, moves, test_row, test_col):
+        """
+        Description:    Called by cannon_moves to help keep the code clear
+        Input(s):       piece:          the piece to check if the move is valid
+                        moves:          dictionary of possible moves for the piece
+                        test_row:       the row to test the move
+                        test_column:    the column to test the move
+        """
+
+        # will need to implement fortress jumping, but this will take care of things for now
+
+        row = piece.get_row()
+        col = piece.get_column()
+        able_to_jump = False
+
+        if test_row != 0:
+            counter = 1
+            while row + test_row * counter in range(10):
+                test_coord = (row + test_row * counter, col)
+
+                if test_coord not in self.get_board() and able_to_jump == False:    # can't jump yet
+                    counter += 1
+                    continue
+
+                if test_coord in self.get_board() and able_to_jump == False:
+                    if self.get_board()[test_coord].get_type() == "cannon":
+                        # can't jump cannons, no valid moves in this direction
+                        return moves
+                    else:
+                        able_to_jump = True
+                        counter += 1
+                        continue
+
+                if test_coord not in self.get_board() and able_to_jump == True: # able to jump, not taking a piece
+                    moves[test_coord] = True
+                    counter += 1
+                    continue
+
+                if self.get_board()[test_coord].get_type() == "cannon" and able_to_jump == True:
+                    break   # can't capture cannons
+
+                if self.get_board()[test_coord].get_player() == piece.get_player() and able_to_jump == True:
+                    break   # can't jump anymore
+
+                elif self.get_board()[test_coord].get_player() != piece.get_player() and able_to_jump == True:
+                    # able to jump, will capture enemy piece
+                    moves[test_coord] = self.get_board()[test_coord]
+                    break
+
+        else:
+            counter = 1
+            while col + test_col * counter in range(9):
+                test_coord = (row, col + test_col * counter)
+                if test_coord not in self.get_board() and able_to_jump == False:  # can't jump yet
+                    counter += 1
+                    continue
+
+                if test_coord in self.get_board() and able_to_jump == False:
+                    if self.get_board()[test_coord].get_type() == "cannon":
+                        # can't jump cannons, no valid moves in this direction
+                        return moves
+                    else:
+                        able_to_jump = True
+                        counter += 1
+                        continue
+
+                if test_coord not in self.get_board() and able_to_jump == True:  # able to jump, not taking a piece
+                    moves[test_coord] = True
+                    counter += 1
+                    continue
+
+                if self.get_board()[test_coord].get_type() == "cannon" and able_to_jump == True:
+                    break   # can't capture cannons
+
+                if self.get_board()[test_coord].get_player() == piece.get_player() and able_to_jump == True:
+                    break   # can't jump anymore
+
+                if self.get_board()[test_coord].get_player() != piece.get_player() and able_to_jump == True:
+                    # able to jump, will capture enemy piece
+                    moves[test_coord] = self.get_board()[test_coord]
+                    break
+        return moves
+
+    def chariot_moves(self, piece):
+        """
+        Description:    Determines the moves for a chariot and is called by the possible_moves method
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = dict()
+        # need to implement diaganol when they are in the fortress. Waiting for now
+
+        moves = self.chariot_moves_helper(piece, moves, 1, 0) # vertical
+        moves = self.chariot_moves_helper(piece, moves, -1, 0)
+        moves = self.chariot_moves_helper(piece, moves, 0, 1) # horizontal
+        moves = self.chariot_moves_helper(piece, moves, 0, -1)
+
+        return moves
+
+    def chariot_moves_helper(self, piece, moves, test_row, test_col):
+        """
+        Description:    Called by chariot_moves to help keep the code clear
+        Input(s):       piece:          the piece to check if the move is valid
+                        moves:          dictionary of possible moves for the piece
+                        test_row:       the row to test the move
+                        test_column:    the column to test the move
+        """
+
+        row = piece.get_row()
+        col = piece.get_column()
+
+        if test_row != 0:
+            counter = 1
+            while row + test_row*counter in range(10):
+                test_coord = (row + test_row*counter, col)
+                if test_coord not in self.get_board():
+                    moves[test_coord] = True
+                    counter += 1
+                elif self.get_board()[test_coord].get_player() != piece.get_player():   # occupied, but by other player
+                    moves[test_coord] = self.get_board()[test_coord]
+                    break
+                else:
+                    break
+            return moves
+        else:
+            counter = 1
+            while col + test_col*counter in range(9):
+                test_coord = (row, col + test_col*counter)
+                if test_coord not in self.get_board():
+                    moves[test_coord] = True
+                    counter += 1
+                elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                    moves[test_coord] = self.get_board()[test_coord]
+                    break
+                else:
+                    break
+            return moves
+
+    def elephant_moves(self, piece):
+        """
+        Description:    Determines the moves for a elephant and is called by the possible_moves method
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = dict()
+
+        moves = self.elephant_moves_helper(piece, moves, 1, 0)  # vertical 3, over 2
+        moves = self.elephant_moves_helper(piece, moves, -1, 0)
+        moves = self.elephant_moves_helper(piece, moves, 0, 1)  # over 3, up/down 2
+        moves = self.elephant_moves_helper(piece, moves, 0, -1)
+
+        return moves
+
+    def elephant_moves_helper(self, piece, moves, test_row, test_column):
+        """
+        Description:    Called by elephant_moves to help keep the code clear
+        Input(s):       piece:          the piece to check if the move is valid
+                        moves:          dictionary of possible moves for the piece
+                        test_row:       the row to test the move
+                        test_column:    the column to test the move
+                """
+
+        row = piece.get_row()
+        col = piece.get_column()
+
+        if test_row == 1:
+            if (row + test_row, col) not in self.get_board() and (row + test_row + 1, col + 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row + test_row + 2) in range(10) and (col + 2) in range(9):  # up 3, 2 to the right
+                    test_coord = (row + test_row + 2, col + 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():
+                        # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+            if (row + test_row, col) not in self.get_board() and (row + test_row + 1, col - 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row + test_row + 2) in range(10) and (col - 2) in range(9):  # down 3, 2 to the right
+                    test_coord = (row + test_row + 2, col - 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():
+                        # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        if test_row == -1:
+            if (row + test_row, col) not in self.get_board() and (row + test_row - 1, col + 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row + test_row - 2) in range(10) and (col + 2) in range(9):  # up 3, 2 to the right
+                    test_coord = (row + test_row - 2, col + 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():
+                        # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+            if (row + test_row, col) not in self.get_board() and (row + test_row - 1, col - 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row + test_row - 2) in range(10) and (col - 2) in range(9):  # down 3, 2 to the right
+                    test_coord = (row + test_row - 2, col - 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():
+                        # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        if test_column == 1:
+            if (row, col + test_column) not in self.get_board() and (row + 1, col + test_column + 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row + 2) in range(10) and (col + test_column + 2) in range(9):  # over 3, up 2
+                    test_coord = (row + 2, col + test_column + 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():
+                        # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+            if (row, col + test_column) not in self.get_board() and (row - 1, col + test_column + 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row - 2) in range(10) and (col + test_column + 2) in range(9):  # over 3 down 2
+                    test_coord = (row - 2, col + test_column + 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():
+                        # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        if test_column == -1:
+            if (row, col + test_column) not in self.get_board() and (row + 1, col + test_column - 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row + 2) in range(10) and (col + test_column - 2) in range(9):  # over 3, up 2
+                    test_coord = (row + 2, col + test_column - 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+            if (row, col + test_column) not in self.get_board() and (row - 1, col + test_column - 1) not in \
+                    self.get_board():  # if any piece is blocking, can't move
+                if (row - 2) in range(10) and (col + test_column - 2) in range(9):  # over 3 down 2
+                    test_coord = (row - 2, col + test_column - 2)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        return moves
+
+    def horse_moves(self, piece):
+        """
+        Description:    Determines the moves for a horse and is called by the possible_moves method
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = dict()
+
+        moves = self.horse_moves_helper(piece, moves, 1, 0)     # vertical 2, over 1
+        moves = self.horse_moves_helper(piece, moves, -1, 0)
+        moves = self.horse_moves_helper(piece, moves, 0, 1)     # over 2, up/down 1
+        moves = self.horse_moves_helper(piece, moves, 0, -1)
+
+        return moves
+
+    def horse_moves_helper(self, piece, moves, test_row, test_column):
+        """
+        Description:    Called by horse_moves to help keep the code clear
+        Input(s):       piece:          the piece to check if the move is valid
+                        moves:          dictionary of possible moves for the piece
+                        test_row:       the row to test the move
+                        test_column:    the column to test the move
+        """
+
+        row = piece.get_row()
+        col = piece.get_column()
+
+        # need to implement if a piece is blocking
+
+        if test_row == 1:
+            if (row + test_row, col) not in self.get_board():   # if any piece is blocking, can't move
+                if (row + test_row + 1) in range(10) and (col + 1) in range(9):  # down 2, 1 to the right
+                    test_coord = (row + test_row + 1, col + 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+                if (row + test_row + 1) in range(10) and (col - 1) in range(9):  # down 2, 1 to the right
+                    test_coord = (row + test_row + 1, col - 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        if test_row == -1:
+            if (row + test_row, col) not in self.get_board():   # if any piece is blocking, can't move
+                if (row + test_row - 1) in range(10) and (col + 1) in range(9):  # up 2, 1 to the right
+                    test_coord = (row + test_row - 1, col + 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+                if (row + test_row - 1) in range(10) and (col - 1) in range(9):  # up 2, 1 to the right
+                    test_coord = (row + test_row - 1, col - 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        if test_column == 1:
+            if (row, col + test_column) not in self.get_board():    # if any piece is blocking, can't move
+                if (row + 1) in range(10) and (col + test_column + 1) in range(9):  # over 2, up 1
+                    test_coord = (row + 1, col + test_column + 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+                if (row - 1) in range(10) and (col + test_column + 1) in range(9):  # over 2 down 1
+                    test_coord = (row - 1, col + test_column + 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        if test_column == -1:
+            if (row, col + test_column) not in self.get_board():    # if any piece is blocking, can't move
+                if (row + 1) in range(10) and (col + test_column - 1) in range(9):  # over 2, up 1
+                    test_coord = (row + 1, col + test_column - 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+                if (row - 1) in range(10) and (col + test_column - 1) in range(9):  # over 2 down 1
+                    test_coord = (row - 1, col + test_column - 1)
+                    if test_coord not in self.get_board():
+                        moves[test_coord] = True
+                    elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                        moves[test_coord] = self.get_board()[test_coord]
+
+        return moves
+
+    def advisor_moves(self, piece):
+        """
+        Description:    Determines the moves for an advisor and is called by the possible_moves method. Advisors
+                        have to adhere to the same palace rules as the general
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        return self.palace_moves(piece)
+
+    def palace_moves(self, piece):
+        """
+        Description:    Determines the moves inside the palace for an advisor or a general. Will call
+                        general_moves_helper as the advisors have to adhere to the same rules. This does not check if
+                        the squares are attacked by the other player.
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = dict()
+
+        if (piece.get_row(), piece.get_column()) == (0, 3) or (piece.get_row(), piece.get_column()) == (7, 3):
+            moves = self.general_moves_helper(piece, moves, 0, 1)
+            moves = self.general_moves_helper(piece, moves, 1, 0)
+            moves = self.general_moves_helper(piece, moves, 1, 1)
+
+        if (piece.get_row(), piece.get_column()) == (0, 5) or (piece.get_row(), piece.get_column()) == (7, 5):
+            moves = self.general_moves_helper(piece, moves, 0, -1)
+            moves = self.general_moves_helper(piece, moves, 1, 0)
+            moves = self.general_moves_helper(piece, moves, 1, -1)
+
+        if (piece.get_row(), piece.get_column()) == (2, 3) or (piece.get_row(), piece.get_column()) == (9, 3):
+            moves = self.general_moves_helper(piece, moves, -1, 0)
+            moves = self.general_moves_helper(piece, moves, 0, 1)
+            moves = self.general_moves_helper(piece, moves, -1, 1)
+
+        if (piece.get_row(), piece.get_column()) == (2, 5) or (piece.get_row(), piece.get_column()) == (8, 5):
+            moves = self.general_moves_helper(piece, moves, -1, 0)
+            moves = self.general_moves_helper(piece, moves, 0, -1)
+            moves = self.general_moves_helper(piece, moves, -1, -1)
+
+        if (piece.get_row(), piece.get_column()) == (1, 4) or (piece.get_row(), piece.get_column()) == (8, 4):
+            moves = self.general_moves_helper(piece, moves, 1, 0)
+            moves = self.general_moves_helper(piece, moves, 1, 1)
+            moves = self.general_moves_helper(piece, moves, 1, -1)
+
+            moves = self.general_moves_helper(piece, moves, 0, -1)
+            moves = self.general_moves_helper(piece, moves, 0, 1)
+
+            moves = self.general_moves_helper(piece, moves, -1, 0)
+            moves = self.general_moves_helper(piece, moves, -1, 1)
+            moves = self.general_moves_helper(piece, moves, -1, -1)
+
+        else:
+            moves = self.general_moves_helper(piece, moves, 1, 0)
+            moves = self.general_moves_helper(piece, moves, -1, 0)
+            moves = self.general_moves_helper(piece, moves, 0, -1)
+            moves = self.general_moves_helper(piece, moves, 0, 1)
+
+        return moves
+
+    def general_moves(self, piece):
+        """
+        Description:    Determines the moves for a general and is called by the possible_moves method. Each square
+                        is tried by moving the general there, since a piece using the general as a cannon screen or
+                        standing behind it on a line does not attack the squares next to it once the general moves.
+        Input(s):       piece:  The piece that is at a particular location on the board
+        """
+
+        moves = self.palace_moves(piece)
+        curr = (piece.get_row(), piece.get_column())
+        version = self._version
+
+        for new in list(moves):
+            captured = self.do_move(curr, new)
+            if self.is_attacked(new, other_player(piece.get_player())):
+                del moves[new]
+            self.undo_move(curr, new, captured)
+
+        self._version = version     # the position is the same, so the moves kept on the pieces still hold
+        return moves
+
+    def general_moves_helper(self, piece, moves, test_row, test_column):
+        """
+        Description:    Called by general_moves to help keep the code clear
+        Input(s):       piece:          the piece to check if the move is valid
+                        moves:          dictionary of possible moves for the piece
+                        test_row:       the row to test the move
+                        test_column:    the column to test the move
+        """
+
+        row = piece.get_row()
+        col = piece.get_column()
+
+        if piece.get_player() == "R":
+            if (row + test_row >= 0) and (row + test_row < 3) and (col + test_column > 2) and (col + test_column < 6):
+                test_coord = (row + test_row, col + test_column)  # check if square is occupied
+                if test_coord not in self.get_board():
+                    moves[test_coord] = True
+                elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                    moves[test_coord] = self.get_board()[test_coord]
+
+        if piece.get_player() == "B":
+            if (row + test_row > 6) and (row + test_row < 10) and (col + test_column > 2) and (col + test_column < 6):
+                test_coord = (row + test_row, col + test_column)  # check if square is occupied
+                if test_coord not in self.get_board():
+                    moves[test_coord] = True
+                elif self.get_board()[test_coord].get_player() != piece.get_player():  # occupied, but by other player
+                    moves[test_coord] = self.get_board()[test_coord]
+        return moves
+
+
+    def add_observer(self, observer):
+        """
+        Description:    Registers a function to call after every move make_move accepts, passes included. It is
+                        called with the square the piece moved from, the square it moved to, the captured piece
+                        or None, who is in check now ("B", "R" or None) and the game state.
+        Input(s):       observer:   the function to call
+        """
+
+        self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        """
+        Description:    Stops calling a function registered with add_observer
+        """
+
+        self._observers.remove(observer)
+
+    def notify(self, curr, new, captured):
+        """
+        Description:    Tells every observer about a move make_move accepted
+        Input(s):       curr:       tuple of (row, column) the piece moved from
+                        new:        tuple of (row, column) the piece moved to, the same as curr for a pass
+                        captured:   the captured piece, None if nothing was captured
+        """
+
+        for observer in list(self._observers):
+            observer(curr, new, captured, self.get_check(), self.get_game_state())
+
+    def set_draw_rules(self, repetitions=3, move_limit=None):
+        """
+        Description:    Sets when make_move ends the game in a draw
+        Input(s):       repetitions:    the game is drawn when a position is reached this many times, None to never
+                                        draw by repetition
+                        move_limit:     the game is drawn after this many moves, passes included. None for no limit
+        """
+
+        self._repetition_limit = repetitions
+        self._move_limit = move_limit
+
+    def clear_history(self):
+        """
+        Description:    Starts the position history over from the current position
+        """
+
+        self._history_base = None
+        self._history = [self._hash]
+        self._counts = {self._hash: 1}
+
+    def set_history(self, history):
+        """
+        Description:    Replaces the position history, for example with the history of the game a position was
+                        copied from. The last hash should be the current position.
+        Input(s):       history:    list of position hashes, oldest first
+        """
+
+        self._history_base = None
+        self._history = list(history)
+        self._counts = dict()
+        for key in self._history:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get_history(self):
+        """
+        Description:    Returns the hash of every position reached, oldest first, including the current one
+        """
+
+        if self._history_base is None:
+            return self._history
+        return self._history_base.get_hashes() + self._history
+
+    def history_length(self):
+        """
+        Description:    Returns how many positions are in the history, including the current one
+        """
+
+        if self._history_base is None:
+            return len(self._history)
+        return self._history_base.length + len(self._history)
+
+    def repetition_count(self):
+        """
+        Description:    Returns how many times the current position has been reached
+        """
+
+        count = self._counts.get(self._hash, 0)
+        segment = self._history_base
+        while segment is not None:
+            count += segment.counts.get(self._hash, 0)
+            segment = segment.parent
+        return count
+
+    def record_position(self):
+        """
+        Description:    Adds the current position to the history. Called after each move that make_move accepts,
+                        so it also checks the draw rules.
+        """
+
+        self.push_history()
+        if self._repetition_limit is not None and self.repetition_count() >= self._repetition_limit:
+            self.set_game_state("DRAW")
+        elif self._move_limit is not None and self.history_length() - 1 >= self._move_limit:
+            self.set_game_state("DRAW")
+
+    def push_history(self):
+        """
+        Description:    Adds the current position to the history without checking the draw rules
+        """
+
+        self._history.append(self._hash)
+        self._counts[self._hash] = self._counts.get(self._hash, 0) + 1
+
+    def pop_history(self):
+        """
+        Description:    Takes the current position back off the history. Taking back a position from before a fork
+                        copies the shared segment it is in, which search never does.
+        """
+
+        if len(self._history) == 0:
+            segment = self._history_base
+            self._history = list(segment.hashes)
+            self._counts = dict(segment.counts)
+            self._history_base = segment.parent
+        key = self._history.pop()
+        if self._counts[key] == 1:
+            del self._counts[key]
+        else:
+            self._counts[key] -= 1
+
+    def get_hash(self):
+        """
+        Description:    Returns the zobrist hash of the position, including whose turn it is
+        """
+
+        return self._hash
+
+    def compute_hash(self):
+        """
+        Description:    Works out the zobrist hash of the position from scratch
+        Output(s):      the hash as an integer
+        """
+
+        value = 0
+        for coords, piece in self.get_board().items():
+            value ^= ZOBRIST[piece.get_player(), piece.get_type(), coords[0], coords[1]]
+        if self.get_turn() == "R":
+            value ^= ZOBRIST_TURN
+        return value
+
+    def evaluate(self):
+        """
+        Description:    Scores the position for the player to move with material and piece-square values. The
+                        running score of each player is kept up to date as moves are made and taken back, so this
+                        does not have to look at the board.
+        Output(s):      the score, positive if the player to move is ahead
+        """
+
+        if self._check_scores:
+            assert self._scores == self.compute_scores(), "incremental scores do not match the board"
+        if self.get_turn() == "B":
+            return self._scores["B"] - self._scores["R"]
+        return self._scores["R"] - self._scores["B"]
+
+    def compute_scores(self):
+        """
+        Description:    Works out the material and piece-square score of each player from scratch
+        Output(s):      dictionary of player to score
+        """
+
+        scores = {"B": 0, "R": 0}
+        for coords, piece in self.get_board().items():
+            scores[piece.get_player()] += SQUARE_VALUES[piece.get_player(), piece.get_type(), coords[0], coords[1]]
+        return scores
+
+    def set_eval_check(self, value):
+        """
+        Description:    Turns on checking the running scores against compute_scores every time evaluate is called.
+                        Slow, used to test the incremental updates.
+        Input(s):       value:  True to check, False to stop checking
+        """
+
+        self._check_scores = value
+
+    def piece_moves(self, piece):
+        """
+        Description:    Determines the moves for any piece without storing them on the piece. Generals only get their
+                        palace moves here, whether the squares are attacked is left to legal_moves.
+        Input(s):       piece:  The piece that is at a particular location on the board
+        Output(s):      dictionary of possible moves for the piece
+        """
+
+        if piece.get_type() == "soldier":
+            return self.soldier_moves(piece)
+        if piece.get_type() == "cannon":
+            return self.cannon_moves(piece)
+        if piece.get_type() == "chariot":
+            return self.chariot_moves(piece)
+        if piece.get_type() == "elephant":
+            return self.elephant_moves(piece)
+        if piece.get_type() == "horse":
+            return self.horse_moves(piece)
+        return self.palace_moves(piece)
+
+    def load_position(self, turn, placements):
+        """
+        Description:    Replaces the board with the given position. Used by analysis tools that need to set up a
+                        position without playing the moves to reach it.
+        Input(s):       turn:       "B" or "R", whose turn it is
+                        placements: iterable of (player, piece type, row, column) tuples
+        """
+
+        self._board_shared = False
+        self._owned = None
+        self._pieces = set()
+        for player, piece_type, row, column in placements:
+            self._pieces.add(PIECE_CLASSES[piece_type](player, row, column))
+        self._board = self.new_board(self._pieces)
+        self._version = next(POSITION_VERSIONS)
+        self._turn = turn
+        self._game_state = "UNFINISHED"
+        self._is_in_check = None
+        if self.general_attacked(turn):
+            self._is_in_check = turn
+        self._hash = self.compute_hash()
+        self._scores = self.compute_scores()
+        self.clear_history()
+
+    def export_position(self):
+        """
+        Description:    Returns the position as plain tuples so it can be pickled, sent to other processes or
+                        loaded again with load_position
+        Output(s):      (turn, tuple of (player, piece type, row, column) sorted by square)
+        """
+
+        placements = []
+        for coords in sorted(self.get_board()):
+            piece = self.get_board()[coords]
+            placements.append((piece.get_player(), piece.get_type(), coords[0], coords[1]))
+        return self.get_turn(), tuple(placements)
+
+    def find_general(self, player):
+        """
+        Description:    Returns the coordinates of the players general
+        Input(s):       player: "B" or "R"
+        Output(s):      tuple of (row, column), None if the general is not on the board
+        """
+
+        for coords, piece in self.get_board().items():
+            if piece.get_type() == "general" and piece.get_player() == player:
+                return coords
+        return None
+
+    def is_attacked(self, coords, player):
+        """
+        Description:    Checks if any of the players pieces could move to the given square
+        Input(s):       coords: tuple of (row, column) to check
+                        player: "B" or "R", the player that would be attacking
+        """
+
+        quiets = coords not in self.get_board()       # an occupied square can only be reached by a capture
+        for curr, new, captured in self.iter_moves(player, quiets=quiets):
+            if new == coords:
+                return True
+        return False
+
+    def general_attacked(self, player):
+        """
+        Description:    Checks if the players general can be captured by the other player
+        Input(s):       player: "B" or "R"
+        """
+
+        coords = self.find_general(player)
+        if coords is None:
+            return False
+        return self.is_attacked(coords, other_player(player))
+
+    def do_move(self, curr, new):
+        """
+        Description:    Moves a piece without any of the checks make_move does and hands the turn to the other player.
+                        Used by search so that a move can be tried and taken back with undo_move. Moving a piece onto
+                        its own square passes the turn.
+        Input(s):       curr:   tuple of (row, column) of the piece to move
+                        new:    tuple of (row, column) to move the piece to
+        Output(s):      the captured piece, None if nothing was captured
+        """
+
+        captured = None
+        if curr != new:
+            if self._owned is not None:
+                self.own_piece(curr)
+            board = self.get_board()
+            piece = board.pop(curr)
+            captured = board.get(new)
+            piece.set_row(new[0])
+            piece.set_column(new[1])
+            board[new] = piece
+            self.update_running(piece, curr, new, captured)
+        self._turn = other_player(self._turn)
+        self._hash ^= ZOBRIST_TURN
+        self._version = next(POSITION_VERSIONS)
+        self.push_history()
+        return captured
+
+    def update_running(self, piece, curr, new, captured):
+        """
+        Description:    Updates the running hash and scores for a piece that moved, leaving the turn bit alone.
+                        Every move goes through here so the hash and scores are never worked out from scratch.
+        Input(s):       piece:      the piece that moved
+                        curr:       tuple of (row, column) it moved from
+                        new:        tuple of (row, column) it moved to
+                        captured:   the piece it captured, None if nothing was captured
+        """
+
+        self._hash ^= ZOBRIST[piece.get_player(), piece.get_type(), curr[0], curr[1]] ^ \
+            ZOBRIST[piece.get_player(), piece.get_type(), new[0], new[1]]
+        self._scores[piece.get_player()] += \
+            SQUARE_VALUES[piece.get_player(), piece.get_type(), new[0], new[1]] - \
+            SQUARE_VALUES[piece.get_player(), piece.get_type(), curr[0], curr[1]]
+        if captured is not None:
+            self._hash ^= ZOBRIST[captured.get_player(), captured.get_type(), new[0], new[1]]
+            self._scores[captured.get_player()] -= \
+                SQUARE_VALUES[captured.get_player(), captured.get_type(), new[0], new[1]]
+
+    def undo_move(self, curr, new, captured):
+        """
+        Description:    Takes back a move made with do_move
+        Input(s):       curr:       tuple of (row, column) the piece moved from
+                        new:        tuple of (row, column) the piece moved to
+                        captured:   the piece returned by do_move
+        """
+
+        self.pop_history()
+        self._turn = other_player(self._turn)
+        self._hash ^= ZOBRIST_TURN
+        self._version = next(POSITION_VERSIONS)
+        if curr != new:
+            if self._owned is not None:
+                self.own_piece(new)
+            board = self.get_board()
+            piece = board[new]
+            piece.set_row(curr[0])
+            piece.set_column(curr[1])
+            board[curr] = piece
+            self._hash ^= ZOBRIST[piece.get_player(), piece.get_type(), curr[0], curr[1]] ^ \
+                ZOBRIST[piece.get_player(), piece.get_type(), new[0], new[1]]
+            self._scores[piece.get_player()] += \
+                SQUARE_VALUES[piece.get_player(), piece.get_type(), curr[0], curr[1]] - \
+                SQUARE_VALUES[piece.get_player(), piece.get_type(), new[0], new[1]]
+            if captured is None:
+                del board[new]
+            else:
+                board[new] = captured
+                self._hash ^= ZOBRIST[captured.get_player(), captured.get_type(), new[0], new[1]]
+                self._scores[captured.get_player()] += \
+                    SQUARE_VALUES[captured.get_player(), captured.get_type(), new[0], new[1]]
+
+    def fork(self):
+        """
+        Description:    Makes a new game that starts from this position, for trying out other moves without
+                        changing this game. The board and pieces are shared until one of the games changes them.
+                        After that the board dictionary is copied once, and a piece is only copied when it moves.
+                        Moves worked out by get_moves are kept with the position version they belong to, so a
+                        shared piece never hands one game the moves of another.
+        Output(s):      the new JanggiGame
+        """
+
+        if len(self._history) > 0:
+            self._history_base = HistorySegment.freeze(self._history_base, self._history, self._counts)
+            self._history = []
+            self._counts = dict()
+        child = JanggiGame.__new__(JanggiGame)
+        child.__dict__.update(self.__dict__)
+        child._scores = dict(self._scores)
+        child._history = []
+        child._counts = dict()
+        child._pieces = None                 # worked out from the board if anyone asks, see get_pieces
+        child._observers = []                # a fork is for trying moves, nobody is watching it
+        for game in (self, child):
+            game._board_shared = True
+            game._owned = set()
+        return child
+
+    def own_board(self):
+        """
+        Description:    Copies the board dictionary and set of pieces if they may be shared with a fork
+        """
+
+        if self._board_shared:
+            self._board = dict(self._board)
+            if self._pieces is not None:
+                self._pieces = set(self._pieces)
+            self._board_shared = False
+
+    def own_piece(self, coords):
+        """
+        Description:    Copies the piece at the given square if it may be shared with a fork, so it can be moved
+        Input(s):       coords: tuple of (row, column) of the piece
+        """
+
+        self.own_board()
+        piece = self._board[coords]
+        if self._owned is not None and piece not in self._owned:
+            copy = piece.copy()
+            self._board[coords] = copy
+            if self._pieces is not None:
+                self._pieces.discard(piece)
+                self._pieces.add(copy)
+            self._owned.add(copy)
+
+    def iter_moves(self, player=None, captures=True, quiets=True):
+        """
+        Description:    Goes through the moves of the players pieces one at a time, using the precomputed tables in
+                        MOVE_TABLES instead of building a dictionary for each piece. Follows the same rules as
+                        piece_moves, so generals only get their palace moves.
+        Input(s):       player:     "B" or "R", defaults to whose turn it is
+                        captures:   include moves that capture a piece
+                        quiets:     include moves that do not capture
+        Output(s):      yields (current coordinates, new coordinates, captured piece or None) tuples
+        """
+
+        if player is None:
+            player = self.get_turn()
+        board = self.get_board()
+        for curr, piece in list(board.items()):
+            if piece.get_player() != player:
+                continue
+            piece_type = piece.get_type()
+
+            if piece_type == "chariot" or piece_type == "cannon":
+                for ray in MOVE_TABLES["rays"][curr]:
+                    screen = piece_type == "chariot"     # chariots move as if they have already jumped
+                    for new in ray:
+                        target = board.get(new)
+                        if not screen:
+                            if target is not None:
+                                if target.get_type() == "cannon":
+                                    break                # can't jump cannons
+                                screen = True
+                            continue
+                        if target is None:
+                            if quiets:
+                                yield curr, new, None
+                        else:
+                            if captures and target.get_player() != player and \
+                                    (piece_type == "chariot" or target.get_type() != "cannon"):
+                                yield curr, new, target      # cannons can't capture cannons
+                            break
+
+            elif piece_type == "horse" or piece_type == "elephant":
+                for blocks, new in MOVE_TABLES[piece_type][curr]:
+                    for block in blocks:
+                        if block in board:
+                            break
+                    else:
+                        target = board.get(new)
+                        if target is None:
+                            if quiets:
+                                yield curr, new, None
+                        elif captures and target.get_player() != player:
+                            yield curr, new, target
+
+            else:
+                if piece_type == "soldier":
+                    targets = MOVE_TABLES["soldier"][player, curr]
+                else:
+                    targets = MOVE_TABLES["palace"][player, curr]
+                for new in targets:
+                    target = board.get(new)
+                    if target is None:
+                        if quiets:
+                            yield curr, new, None
+                    elif captures and target.get_player() != player:
+                        yield curr, new, target
+
+    def legal_moves(self, player=None, allow_pass=False):
+        """
+        Description:    Makes a list of every move the player can make that does not leave their general where it
+                        can be captured. The moves come from iter_moves and are tried on a BitBoard of the
+                        position, so the game itself is not touched.
+        Input(s):       player:     "B" or "R", defaults to whose turn it is
+                        allow_pass: also include the pass move, which is only allowed when not in check
+        Output(s):      list of (current coordinates, new coordinates) tuples
+        """
+
+        if player is None:
+            player = self.get_turn()
+        board = self.to_bitboard()
+
+        moves = []
+        for curr, new, target in self.iter_moves(player):
+            start, end = square_index(curr), square_index(new)
+            captured = board.do_move(start, end)
+            if not board.general_attacked(player):
+                moves.append((curr, new))
+            board.undo_move(start, end, captured)
+
+        if allow_pass and not board.general_attacked(player):
+            general = self.find_general(player)
+            if general is not None:
+                moves.append((general, general))
+
+        return moves
+
+    def to_bitboard(self):
+        """
+        Description:    Returns the position as a janggi.bitboard.BitBoard. Trying every move on it is much quicker
+                        than do_move and general_attacked on this game, so legal_moves checks each move there.
+                        Single questions are still answered here, as making the BitBoard costs about as much.
+        """
+
+        from janggi.bitboard import BitBoard
+        return BitBoard((self._turn, [(piece.get_player(), piece.get_type(), row, column)
+                                      for (row, column), piece in self.get_board().items()]))
+
+    def show_board(self):
+        """
+        Description:    Used for my own sanity checks, will comment out for the final graded version. The drawing is
+                        done by janggi.render so game2dboard is only imported when it is used.
+        """
+
+        from janggi.render import show_board
+        show_board(self)
+
+
+class HistorySegment:
+    """
+    Description:    Part of a position history that no game adds to any more. Forking a game freezes the positions
+                    it has added since its last fork into a segment linked to the one before, and both games carry on
+                    from it with empty lists, so a fork never copies the history it was made with.
+    """
+
+    __slots__ = ("parent", "hashes", "counts", "length", "depth")
+
+    def __init__(self, parent, hashes, counts):
+        """
+        Description:    Makes a segment on top of an older one
+        Input(s):       parent:     the segment before this one, None if this is the oldest
+                        hashes:     list of position hashes in this segment, oldest first
+                        counts:     dictionary of hash to how many times it is in hashes
+        """
+
+        self.parent = parent
+        self.hashes = hashes
+        self.counts = counts
+        self.length = len(hashes) + (0 if parent is None else parent.length)
+        self.depth = 1 + (0 if parent is None else parent.depth)
+
+    @staticmethod
+    def freeze(parent, hashes, counts):
+        """
+        Description:    Makes a segment, joining the whole chain into one once it is HISTORY_DEPTH long so that
+                        counting repetitions in a game forked at every move stays cheap
+        Output(s):      the new segment
+        """
+
+        segment = HistorySegment(parent, hashes, counts)
+        if segment.depth <= HISTORY_DEPTH:
+            return segment
+        totals = dict()
+        link = segment
+        while link is not None:
+            for key, count in link.counts.items():
+                totals[key] = totals.get(key, 0) + count
+            link = link.parent
+        return HistorySegment(None, segment.get_hashes(), totals)
+
+    def get_hashes(self):
+        """
+        Description:    Returns a new list of every hash in this segment and the ones before it, oldest first
+        """
+
+        segments = []
+        link = self
+        while link is not None:
+            segments.append(link.hashes)
+            link = link.parent
+        hashes = []
+        for part in reversed(segments):
+            hashes.extend(part)
+        return hashes
+
+
+HISTORY_DEPTH = 16
+POSITION_VERSIONS = itertools.count(1)      # shared by every game, so forks never reuse a version
+TABLES = load_tables(JanggiGame)
+MOVE_TABLES = TABLES["moves"]
+ZOBRIST = TABLES["zobrist"]
+ZOBRIST_TURN = TABLES["zobrist_turn"]
+SQUARE_VALUES = TABLES["square_values"]
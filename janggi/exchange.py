@@ -0,0 +1,73 @@
+# Description:  Static exchange evaluation: what a capture wins once every capture back and forth on the same
+#               square has been played out, each side taking with its least valuable piece and free to stop when
+#               going on would lose. Cannons make the usual attacker lists unreliable, since taking a piece off a
+#               line can give a cannon a screen or take its screen away, so the exchange is played out on the board
+#               with do_move and the attackers are found again after each capture by iter_moves, which knows the
+#               cannon rules: a cannon needs exactly one piece to jump, can't jump another cannon and can't
+#               capture one.
+
+from janggi.ordering import ATTACKER_ORDER
+from janggi.rules import PIECE_VALUES, other_player
+
+# A general is never traded, it only takes part in an exchange as the last piece to capture
+EXCHANGE_VALUES = dict(PIECE_VALUES, general=1000)
+
+
+def least_attacker(game, coords, player):
+    """
+    Description:    Finds the least valuable of the players pieces that can capture on a square
+    Input(s):       game:   the JanggiGame
+                    coords: tuple of (row, column) of the square
+                    player: "B" or "R", the player capturing
+    Output(s):      the coordinates of the piece, None if no piece can capture there
+    """
+
+    board = game.get_board()
+    best = None
+    best_rank = len(ATTACKER_ORDER)
+    for curr, new, captured in game.iter_moves(player, quiets=False):
+        if new == coords:
+            rank = ATTACKER_ORDER.index(board[curr].get_type())
+            if rank < best_rank:
+                best, best_rank = curr, rank
+    return best
+
+
+def static_exchange(game, curr, new):
+    """
+    Description:    Scores a capture by playing out the exchange on the square it captures on. Pieces pinned to
+                    their general are still counted as attackers, but a general only captures when the square is
+                    not attacked any more. The game is back in its starting position when this returns.
+    Input(s):       game:   the JanggiGame, with the player to move making the capture
+                    curr:   tuple of (row, column) of the capturing piece
+                    new:    tuple of (row, column) of the piece being captured
+    Output(s):      the material the player to move wins, negative if the capture loses material
+    """
+
+    if game.get_board().get(new) is None or curr == new:
+        return 0
+
+    gains = [EXCHANGE_VALUES[game.get_board()[new].get_type()]]
+    undo = [(curr, new, game.do_move(curr, new))]
+    player = game.get_turn()
+    while True:
+        attacker = least_attacker(game, new, player)
+        if attacker is None:
+            break
+        if game.get_board()[attacker].get_type() == "general":
+            captured = game.do_move(attacker, new)
+            defended = least_attacker(game, new, other_player(player)) is not None
+            game.undo_move(attacker, new, captured)
+            if defended:
+                break
+        gains.append(EXCHANGE_VALUES[game.get_board()[new].get_type()] - gains[-1])
+        undo.append((attacker, new, game.do_move(attacker, new)))
+        player = other_player(player)
+
+    for move in reversed(undo):
+        game.undo_move(*move)
+
+    # each side stops capturing when going on would lose more than stopping
+    for depth in range(len(gains) - 1, 0, -1):
+        gains[depth - 1] = -max(-gains[depth - 1], gains[depth])
+    return gains[0]
@@ -0,0 +1,211 @@
+# Description:  Turns Janggi positions into stacked binary planes for machine learning. There is one 10x9 plane for
+#               each player and piece type, then a plane that is all ones when red is to move and a plane that is
+#               all ones when the player to move is in check. Positions can be encoded one at a time, in batches, or
+#               streamed from a record file into sharded .npz files. NumPy is only needed by this module and is
+#               imported when it is first used.
+
+import os
+
+from janggi.rules import PIECE_CLASSES, square_index
+
+PIECE_TYPES = list(PIECE_CLASSES)
+PLANE_COUNT = 2 * len(PIECE_TYPES) + 2
+TURN_PLANE = 2 * len(PIECE_TYPES)
+CHECK_PLANE = TURN_PLANE + 1
+PLANE_INDEX = dict()
+for plane_player in ("B", "R"):
+    for plane_type in PIECE_TYPES:
+        PLANE_INDEX[plane_player, plane_type] = (0 if plane_player == "B" else len(PIECE_TYPES)) + \
+            PIECE_TYPES.index(plane_type)
+
+
+def plane_names():
+    """
+    Description:    Returns a name for each plane, in order, for example "BSoldier", "turn" and "check"
+    """
+
+    names = [""] * PLANE_COUNT
+    for (player, piece_type), plane in PLANE_INDEX.items():
+        names[plane] = player + piece_type.capitalize()
+    names[TURN_PLANE] = "turn"
+    names[CHECK_PLANE] = "check"
+    return names
+
+
+def set_indices(game, indices, base=0):
+    """
+    Description:    Adds the flat index of every square that should be set to one for a position. Working with
+                    flat indices means the planes can be filled with one NumPy call instead of a loop over squares.
+    Input(s):       game:       the JanggiGame to encode
+                    indices:    list the indices are added to
+                    base:       the flat index of the first square of the position's planes
+    """
+
+    for coords, piece in game.get_board().items():
+        indices.append(base + PLANE_INDEX[piece.get_player(), piece.get_type()] * 90 + square_index(coords))
+    if game.get_turn() == "R":
+        indices.extend(range(base + TURN_PLANE * 90, base + TURN_PLANE * 90 + 90))
+    if game.general_attacked(game.get_turn()):
+        indices.extend(range(base + CHECK_PLANE * 90, base + CHECK_PLANE * 90 + 90))
+
+
+def encode(game):
+    """
+    Description:    Encodes one position
+    Input(s):       game:   the JanggiGame to encode
+    Output(s):      uint8 NumPy array of shape (PLANE_COUNT, 10, 9)
+    """
+
+    import numpy
+
+    planes = numpy.zeros(PLANE_COUNT * 90, dtype=numpy.uint8)
+    indices = []
+    set_indices(game, indices)
+    planes[indices] = 1
+    return planes.reshape(PLANE_COUNT, 10, 9)
+
+
+def encode_batch(games):
+    """
+    Description:    Encodes many positions into one array
+    Input(s):       games:  list of JanggiGame objects
+    Output(s):      uint8 NumPy array of shape (number of games, PLANE_COUNT, 10, 9)
+    """
+
+    import numpy
+
+    planes = numpy.zeros(len(games) * PLANE_COUNT * 90, dtype=numpy.uint8)
+    indices = []
+    for number, game in enumerate(games):
+        set_indices(game, indices, number * PLANE_COUNT * 90)
+    planes[indices] = 1
+    return planes.reshape(len(games), PLANE_COUNT, 10, 9)
+
+
+class ShardWriter:
+    """
+    Description:    Collects encoded positions and writes them out in shards of a fixed size. Each shard is a .npz
+                    file with the planes, the move played from each position as from square * 90 + to square (-1
+                    after the last move of a game), and the game number and ply of each position.
+    """
+
+    def __init__(self, directory, shard_size=100000, compress=False, prefix="shard"):
+        """
+        Description:    Sets up the writer.
+        Input(s):       directory:  where the shards are written
+                        shard_size: positions in each shard
+                        compress:   True to write compressed .npz files, slower to write but smaller
+                        prefix:     start of each shard file name
+        """
+
+        import numpy
+
+        self._numpy = numpy
+        self._directory = directory
+        self._shard_size = shard_size
+        self._compress = compress
+        self._prefix = prefix
+        self._shards = []
+        self._planes = numpy.zeros(shard_size * PLANE_COUNT * 90, dtype=numpy.uint8)
+        self._indices = []
+        self._moves = []
+        self._games = []
+        self._plies = []
+        os.makedirs(directory, exist_ok=True)
+
+    def get_shards(self):
+        """
+        Description:    Returns the paths of the shards written so far
+        """
+
+        return self._shards
+
+    def add(self, game, move, game_number, ply):
+        """
+        Description:    Adds a position
+        Input(s):       game:           the JanggiGame in the position
+                        move:           the move played from the position, None if it was the last
+                        game_number:    the game the position came from
+                        ply:            how many moves into the game the position is
+        """
+
+        set_indices(game, self._indices, len(self._moves) * PLANE_COUNT * 90)
+        self._moves.append(-1 if move is None else square_index(move[0]) * 90 + square_index(move[1]))
+        self._games.append(game_number)
+        self._plies.append(ply)
+        if len(self._moves) == self._shard_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Description:    Writes the positions collected so far as a shard
+        """
+
+        numpy = self._numpy
+        count = len(self._moves)
+        if count == 0:
+            return
+        self._planes[:count * PLANE_COUNT * 90] = 0
+        self._planes[self._indices] = 1
+        path = os.path.join(self._directory, "%s_%05d.npz" % (self._prefix, len(self._shards)))
+        save = numpy.savez_compressed if self._compress else numpy.savez
+        save(path, planes=self._planes[:count * PLANE_COUNT * 90].reshape(count, PLANE_COUNT, 10, 9),
+             moves=numpy.array(self._moves, dtype=numpy.int16),
+             games=numpy.array(self._games, dtype=numpy.int64),
+             plies=numpy.array(self._plies, dtype=numpy.int32))
+        self._shards.append(path)
+        self._indices = []
+        self._moves = []
+        self._games = []
+        self._plies = []
+
+    def close(self):
+        """
+        Description:    Writes the last, possibly smaller, shard
+        """
+
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def export_record(reader, directory, shard_size=100000, compress=False, games=None):
+    """
+    Description:    Streams every position of a record file into shards. Each game is replayed once with do_move,
+                    so no position is built twice.
+    Input(s):       reader:     a janggi.record.RecordReader
+                    directory:  where the shards are written
+                    shard_size: positions in each shard
+                    compress:   True to write compressed .npz files
+                    games:      the game numbers to export, None for all of them
+    Output(s):      the paths of the shards written
+    """
+
+    if games is None:
+        games = range(reader.game_count())
+    with ShardWriter(directory, shard_size, compress) as writer:
+        for game_number in games:
+            game = reader.position(game_number, 0)
+            moves = reader.game_moves(game_number)
+            for ply, move in enumerate(moves):
+                writer.add(game, move, game_number, ply)
+                game.do_move(move[0], move[1])
+            writer.add(game, None, game_number, len(moves))
+    return writer.get_shards()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from janggi.record import RecordReader
+
+    if len(sys.argv) < 3:
+        print("usage: python -m janggi.features <record file> <output directory> [shard size]")
+        sys.exit(1)
+    with RecordReader(sys.argv[1]) as record:
+        written = export_record(record, sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 100000)
+    print("\n".join(written))
@@ -0,0 +1,557 @@
+# Description:  Differential testing of the move generators. Seeded random games are played, and at every ply the
+#               moves, the legal moves and whether the player to move is in check are worked out by the reference
+#               rules and by each backend, and any difference is reported. The reference is the dictionary
+#               generators of JanggiGame (soldier_moves, cannon_moves and the rest, through piece_moves) run on a
+#               bare board, with legality decided by making each move on a new board. The same moves are also
+#               played with make_move, and its check and game state are compared with the reference. Every move
+#               the reference finds would leave the general attacked is also offered to make_move, which has to
+#               turn it down without changing the game.
+#
+#               A failing game is shrunk to the shortest list of moves that still shows the same difference, by
+#               replaying it with pieces of the list taken out. Games are spread over a pool of processes.
+#
+#               Run with "python -m janggi.fuzz [games] [plies] [workers] [first seed]".
+
+import abc
+import os
+import random
+import sys
+import time
+
+from janggi.bitboard import BitBoard
+from janggi.engine import JanggiGame
+from janggi.rules import PIECE_CLASSES, other_player, square_coords, square_index
+
+PASS_CHANCE = 0.05      # how often a game passes instead of moving, when it is allowed to
+FORK_EVERY = 5          # the backends continue on a fork of their game every this many plies
+
+
+class Mismatch(Exception):
+    """
+    Description:    Raised when a backend or make_move does not agree with the reference rules
+    """
+
+    def __init__(self, backend, what, moves, expected, got):
+        """
+        Description:    Records what did not agree
+        Input(s):       backend:    the name of the backend, or "make_move"
+                        what:       what was compared, for example "legal moves"
+                        moves:      the moves played from the start of the game to reach the position
+                        expected:   what the reference rules give
+                        got:        what the backend gave
+        """
+
+        super().__init__(backend, what, moves, expected, got)
+        self._backend = backend
+        self._what = what
+        self._moves = list(moves)
+        self._expected = expected
+        self._got = got
+
+    def get_backend(self):
+        """
+        Description:    Returns the name of the backend that did not agree
+        """
+
+        return self._backend
+
+    def get_what(self):
+        """
+        Description:    Returns what was compared
+        """
+
+        return self._what
+
+    def get_moves(self):
+        """
+        Description:    Returns the moves from the start of the game to the position that did not agree
+        """
+
+        return self._moves
+
+    def get_kind(self):
+        """
+        Description:    Returns (backend, what), a failure only counts as the same one while shrinking if these match
+        """
+
+        return self._backend, self._what
+
+    def describe(self):
+        """
+        Description:    Returns the failure as text, with the moves in the notation make_move takes
+        """
+
+        game = JanggiGame()
+        moves = " ".join(game.convert_loc(curr) + "-" + game.convert_loc(new) for curr, new in self._moves)
+        expected, got = self._expected, self._got
+        if isinstance(expected, set) and isinstance(got, set):
+            expected, got = sorted(expected - got), sorted(got - expected)
+            return "%s: %s after %d moves: %s\n    missing %s\n    extra   %s" % \
+                (self._backend, self._what, len(self._moves), moves, expected, got)
+        return "%s: %s after %d moves: %s\n    expected %r, got %r" % \
+            (self._backend, self._what, len(self._moves), moves, expected, got)
+
+
+class InvalidMoves(Exception):
+    """
+    Description:    Raised while replaying moves that are not legal, which happens when shrinking takes a move out
+                    that a later move depended on
+    """
+
+
+def reference_board(placements):
+    """
+    Description:    Makes a bare JanggiGame that only has a board, enough for the dictionary move generators
+    Input(s):       placements: iterable of (player, piece type, row, column) tuples
+    """
+
+    game = JanggiGame.__new__(JanggiGame)
+    game._board = dict()
+    for player, piece_type, row, column in placements:
+        game._board[row, column] = PIECE_CLASSES[piece_type](player, row, column)
+    return game
+
+
+def reference_moves(board, player):
+    """
+    Description:    Returns every move of the players pieces, from the dictionary generators
+    Input(s):       board:  a game from reference_board
+                    player: "B" or "R"
+    """
+
+    moves = set()
+    for curr, piece in board.get_board().items():
+        if piece.get_player() == player:
+            for new in board.piece_moves(piece):
+                moves.add((curr, new))
+    return moves
+
+
+def reference_attacked(board, player):
+    """
+    Description:    Checks if a piece of the other player could move onto the players general
+    Input(s):       board:  a game from reference_board
+                    player: "B" or "R", whose general to look at
+    """
+
+    for coords, piece in board.get_board().items():
+        if piece.get_type() == "general" and piece.get_player() == player:
+            return any(new == coords for curr, new in reference_moves(board, other_player(player)))
+    return False
+
+
+def moved(placements, curr, new):
+    """
+    Description:    Returns the placements after moving the piece on curr to new, capturing whatever is there
+    """
+
+    result = []
+    for player, piece_type, row, column in placements:
+        if (row, column) == new:
+            continue
+        if (row, column) == curr:
+            row, column = new
+        result.append((player, piece_type, row, column))
+    return result
+
+
+class Reference:
+    """
+    Description:    What the reference rules say about one position
+    """
+
+    def __init__(self, position):
+        """
+        Description:    Works out the moves, legal moves and check of a position
+        Input(s):       position:   (turn, placements), as returned by JanggiGame.export_position
+        """
+
+        turn, placements = position
+        board = reference_board(placements)
+        self.moves = {player: reference_moves(board, player) for player in ("B", "R")}
+        self.check = reference_attacked(board, turn)
+        self.legal = set()
+        for curr, new in self.moves[turn]:
+            if not reference_attacked(reference_board(moved(placements, curr, new)), turn):
+                self.legal.add((curr, new))
+
+
+class Backend(abc.ABC):
+    """
+    Description:    A move generator under test. It is given the moves of the game one at a time and answers
+                    questions about the position reached. This base class keeps a JanggiGame, moved with do_move and
+                    undo_move, and checks that the running hash and scores match ones worked out from scratch.
+                    Every FORK_EVERY plies it carries on with a fork of its game and checks the game it forked
+                    from was left alone. Subclasses answer the questions with moves, legal_moves and in_check.
+    """
+
+    name = None
+
+    def __init__(self):
+        """
+        Description:    Starts from a new game
+        """
+
+        self._game = JanggiGame()
+        self._parent = None
+        self._ply = 0
+
+    def play(self, curr, new):
+        """
+        Description:    Makes a move, a pass if curr and new are the same
+        """
+
+        self._ply += 1
+        self._parent = None
+        if self._ply % FORK_EVERY == 0:
+            self._parent = (self._game, self._game.export_position())
+            self._game = self._game.fork()
+        self._game.do_move(curr, new)
+
+    @abc.abstractmethod
+    def moves(self, player):
+        """
+        Description:    Returns the set of (current coordinates, new coordinates) moves of the players pieces,
+                        without checking if they leave the general attacked
+        """
+
+    @abc.abstractmethod
+    def legal_moves(self):
+        """
+        Description:    Returns the set of legal moves of the player to move, without the pass
+        """
+
+    @abc.abstractmethod
+    def in_check(self):
+        """
+        Description:    Returns True if the player to move has their general attacked
+        """
+
+    def problems(self):
+        """
+        Description:    Returns a list of (what, expected, got) for anything the backend finds wrong with itself
+        """
+
+        game = self._game
+        found = []
+        if game.get_hash() != game.compute_hash():
+            found.append(("running hash", game.compute_hash(), game.get_hash()))
+        if game._scores != game.compute_scores():
+            found.append(("running scores", game.compute_scores(), game._scores))
+        if self._parent is not None and self._parent[0].export_position() != self._parent[1]:
+            found.append(("forked from position", self._parent[1], self._parent[0].export_position()))
+        return found
+
+    def position(self):
+        """
+        Description:    Returns the position the backend has reached, as export_position would
+        """
+
+        return self._game.export_position()
+
+
+class IterMovesBackend(Backend):
+    """
+    Description:    The table driven generator: iter_moves, legal_moves, which tries each move on a BitBoard,
+                    and general_attacked
+    """
+
+    name = "iter_moves"
+
+    def moves(self, player):
+        return set((curr, new) for curr, new, captured in self._game.iter_moves(player))
+
+    def legal_moves(self):
+        return set(self._game.legal_moves())
+
+    def in_check(self):
+        return self._game.general_attacked(self._game.get_turn())
+
+
+class GetMovesBackend(Backend):
+    """
+    Description:    The moves kept on each piece by get_moves, which are only worked out again when the position
+                    version changes. Generals use palace_moves, as in piece_moves, since get_moves also leaves out
+                    squares the general would be attacked on.
+    """
+
+    name = "get_moves"
+
+    def piece_targets(self, coords):
+        piece = self._game.get_board()[coords]
+        if piece.get_type() == "general":
+            return self._game.palace_moves(piece)
+        return self._game.get_moves(coords)
+
+    def moves(self, player):
+        found = set()
+        for coords, piece in list(self._game.get_board().items()):
+            if piece.get_player() == player:
+                found.update((coords, new) for new in self.piece_targets(coords))
+        return found
+
+    def attacked(self, player):
+        general = self._game.find_general(player)
+        for coords, piece in list(self._game.get_board().items()):
+            if piece.get_player() != player and general in self.piece_targets(coords):
+                return True
+        return False
+
+    def legal_moves(self):
+        game = self._game
+        player = game.get_turn()
+        legal = set()
+        for curr, new in self.moves(player):
+            captured = game.do_move(curr, new)
+            if not self.attacked(player):
+                legal.add((curr, new))
+            game.undo_move(curr, new, captured)
+        return legal
+
+    def in_check(self):
+        return self.attacked(self._game.get_turn())
+
+
+class BitboardBackend(Backend):
+    """
+    Description:    The bitboard board of janggi.bitboard, which keeps its own position instead of a JanggiGame
+    """
+
+    name = "bitboard"
+
+    def __init__(self):
+        self._board = BitBoard()
+
+    def play(self, curr, new):
+        self._board.do_move(square_index(curr), square_index(new))
+
+    def moves(self, player):
+        return set((square_coords(curr), square_coords(new)) for curr, new in self._board.moves(player))
+
+    def legal_moves(self):
+        return set((square_coords(curr), square_coords(new)) for curr, new in self._board.legal_moves())
+
+    def in_check(self):
+        return self._board.general_attacked(self._board.get_turn())
+
+    def problems(self):
+        return []
+
+    def position(self):
+        return self._board.export_position()
+
+
+BACKENDS = {"iter_moves": IterMovesBackend, "get_moves": GetMovesBackend, "bitboard": BitboardBackend}
+
+
+def check_position(backends, reference, moves):
+    """
+    Description:    Compares every backend with the reference in the current position
+    Input(s):       backends:   the Backend objects, all in the same position
+                    reference:  the Reference for the position
+                    moves:      the moves played so far, for the failure report
+    """
+
+    for backend in backends:
+        for what, expected, got in backend.problems():
+            raise Mismatch(backend.name, what, moves, expected, got)
+        for player in ("B", "R"):
+            got = backend.moves(player)
+            if got != reference.moves[player]:
+                raise Mismatch(backend.name, "moves of " + player, moves, reference.moves[player], got)
+        got = backend.legal_moves()
+        if got != reference.legal:
+            raise Mismatch(backend.name, "legal moves", moves, reference.legal, got)
+        got = backend.in_check()
+        if got != reference.check:
+            raise Mismatch(backend.name, "check", moves, reference.check, got)
+
+
+def check_rejected(game, reference, moves):
+    """
+    Description:    Offers make_move every move of the player to move that the reference finds leaves their general
+                    attacked, and checks each one is turned down without changing the game
+    Input(s):       game:       the JanggiGame played with make_move
+                    reference:  the Reference for the position
+                    moves:      the moves played so far, for the failure report
+    """
+
+    def state():
+        return (game.export_position(), game.get_hash(), game.get_check(), game.get_game_state(),
+                game.history_length())
+
+    before = state()
+    for curr, new in sorted(reference.moves[game.get_turn()] - reference.legal):
+        if game.make_move(game.convert_loc(curr), game.convert_loc(new)):
+            raise Mismatch("make_move", "rejects illegal move", moves, (curr, new, False), (curr, new, True))
+        if state() != before:
+            raise Mismatch("make_move", "game after rejecting a move", moves, before, state())
+
+
+def play_game(backend_names, seed=None, plies=100, moves=None):
+    """
+    Description:    Plays a game, comparing the backends and make_move with the reference at every ply. The moves
+                    either come from a seeded random generator or are given, to replay a game.
+    Input(s):       backend_names:  names from BACKENDS to test
+                    seed:           seed for choosing random moves
+                    plies:          the most moves to play when choosing random moves
+                    moves:          list of (current coordinates, new coordinates) moves to play instead
+    Output(s):      the moves played. Raises Mismatch at the first difference, and InvalidMoves if a given move
+                    is not legal.
+    """
+
+    generator = random.Random(seed)
+    public = JanggiGame()
+    backends = [BACKENDS[name]() for name in backend_names]
+    seen = {public.export_position(): 1}
+    played = []
+    limit = plies if moves is None else len(moves)
+    while True:
+        position = public.export_position()
+        reference = Reference(position)
+        check_position(backends, reference, played)
+        for backend in backends:
+            if backend.position() != position:
+                raise Mismatch(backend.name, "position", played, position, backend.position())
+        check_rejected(public, reference, played)
+        if len(played) >= limit or len(reference.legal) == 0:
+            return played
+
+        general = public.find_general(public.get_turn())
+        if moves is not None:
+            move = moves[len(played)]
+            if move not in reference.legal and not (move == (general, general) and not reference.check):
+                raise InvalidMoves()
+        elif not reference.check and generator.random() < PASS_CHANCE:
+            move = (general, general)
+        else:
+            move = generator.choice(sorted(reference.legal))
+
+        played.append(move)
+        if not public.make_move(public.convert_loc(move[0]), public.convert_loc(move[1])):
+            raise Mismatch("make_move", "accepts legal move", played, True, False)
+        for backend in backends:
+            backend.play(*move)
+
+        position = public.export_position()
+        seen[position] = seen.get(position, 0) + 1
+        expected = "DRAW" if seen[position] >= 3 else "UNFINISHED"
+        after = Reference(position)
+        if after.check and len(after.legal) == 0:
+            expected = "RED_WON" if position[0] == "B" else "BLUE_WON"
+        if public.get_game_state() != expected:
+            raise Mismatch("make_move", "game state", played, expected, public.get_game_state())
+        expected = position[0] if after.check else None
+        if public.get_check() != expected:
+            raise Mismatch("make_move", "check", played, expected, public.get_check())
+        if public.get_game_state() != "UNFINISHED":
+            return played
+
+
+def reproduces(backend_names, moves, kind):
+    """
+    Description:    Replays moves and checks if the same kind of failure happens
+    Output(s):      the Mismatch if it does, None if not
+    """
+
+    try:
+        play_game(backend_names, moves=moves)
+    except Mismatch as failure:
+        if failure.get_kind() == kind:
+            return failure
+    except InvalidMoves:
+        pass
+    return None
+
+
+def shrink(backend_names, failure):
+    """
+    Description:    Finds a shorter list of moves that shows the same failure. Moves are taken out in chunks, from
+                    half of the list down to one move of each player, keeping every removal that still fails the
+                    same way. Chunks have an even number of moves so the moves after them are still made by the
+                    same player.
+    Input(s):       backend_names:  the backends that were tested
+                    failure:        the Mismatch to shrink
+    Output(s):      a Mismatch with as few moves as this could find
+    """
+
+    kind = failure.get_kind()
+    chunk = max(2, len(failure.get_moves()) // 4 * 2)
+    while True:
+        changed = False
+        start = 0
+        while start < len(failure.get_moves()):
+            moves = failure.get_moves()
+            smaller = reproduces(backend_names, moves[:start] + moves[start + chunk:], kind)
+            if smaller is not None:
+                failure = smaller
+                changed = True
+            else:
+                start += chunk
+        if chunk == 2 and not changed:
+            return failure
+        if not changed:
+            chunk = max(2, chunk // 4 * 2)
+
+
+def fuzz_games(backend_names, seeds, plies):
+    """
+    Description:    Runs in a worker process. Plays a game for each seed and shrinks the ones that fail.
+    Input(s):       backend_names:  names from BACKENDS to test
+                    seeds:          the seeds of the games
+                    plies:          the most moves to play in a game
+    Output(s):      (plies checked, list of (seed, failure description))
+    """
+
+    checked = 0
+    failures = []
+    for seed in seeds:
+        try:
+            checked += len(play_game(backend_names, seed, plies)) + 1
+        except Mismatch as failure:
+            checked += len(failure.get_moves()) + 1
+            failures.append((seed, shrink(backend_names, failure).describe()))
+    return checked, failures
+
+
+def fuzz(games, plies=100, workers=None, first_seed=0, backend_names=None, chunk=4):
+    """
+    Description:    Plays games with seeds first_seed, first_seed + 1 and so on, spread over a process pool
+    Input(s):       games:          how many games to play
+                    plies:          the most moves to play in a game
+                    workers:        number of processes, defaults to the number of cores
+                    first_seed:     the seed of the first game
+                    backend_names:  names from BACKENDS to test, defaults to all of them
+                    chunk:          how many games to send to a worker at a time
+    Output(s):      (plies checked, list of (seed, failure description) sorted by seed)
+    """
+
+    backend_names = list(backend_names or BACKENDS)
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(first_seed, first_seed + games))
+    batches = [seeds[start:start + chunk] for start in range(0, len(seeds), chunk)]
+    if workers == 1:
+        results = [fuzz_games(backend_names, batch, plies) for batch in batches]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(fuzz_games, [backend_names] * len(batches), batches, [plies] * len(batches)))
+    checked = sum(result[0] for result in results)
+    failures = sorted(failure for result in results for failure in result[1])
+    return checked, failures
+
+
+def main(args):
+    games, plies, workers, first_seed = [int(arg) for arg in args] + [200, 100, 0, 0][len(args):]
+    start = time.perf_counter()
+    checked, failures = fuzz(games, plies, workers or None, first_seed)
+    elapsed = time.perf_counter() - start
+    print("%d games, %d plies checked against %s in %.1fs, %.0f plies/s" %
+          (games, checked, ", ".join(BACKENDS), elapsed, checked / elapsed))
+    for seed, description in failures:
+        print("seed %d: %s" % (seed, description))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:5]))
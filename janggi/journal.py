@@ -0,0 +1,350 @@
+# Description:  Keeps live games on disk so they survive the process restarting. Every move make_move accepts is
+#               added to a write-ahead log, and every so often a snapshot of all the games is written so the log
+#               can start over. Opening the store again loads the latest snapshot and replays the log written
+#               after it.
+#
+#               Moves are written in groups: they collect in memory and go to the log in one write when the group
+#               is full or commit is called, and the log is only fsynced every few groups. Bigger groups and fewer
+#               fsyncs give more moves a second, at the cost of losing the last moves that were not synced yet if
+#               the machine goes down. commit() writes and fsyncs everything so far.
+#
+#               Files in the store directory, all numbers little endian:
+#                   log.<n>:    "JGWL", version (2 bytes), then frames: length of the records (4 bytes), crc32 of
+#                               the records (4 bytes), the records (kind (1 byte), game id (4 bytes), move packed
+#                               as in janggi.record (2 bytes)). A frame that was cut off or does not match its
+#                               crc32 is the end of the log.
+#                   snapshot:   "JGSN", version (2 bytes), first log to replay (4 bytes), next game id (4 bytes),
+#                               number of games (4 bytes), then for each game: id (4 bytes), game state (1 byte),
+#                               number of positions in the history (4 bytes), the history hashes (8 bytes each),
+#                               the position as a janggi.record checkpoint. The last 4 bytes are a crc32 of
+#                               the rest.
+
+import os
+import struct
+import zlib
+
+from janggi.engine import JanggiGame
+from janggi.record import decode_move, decode_position, encode_move, encode_position
+
+LOG_MAGIC = b"JGWL"
+SNAPSHOT_MAGIC = b"JGSN"
+VERSION = 1
+LOG_HEADER = struct.Struct("<4sH")
+FRAME = struct.Struct("<II")
+RECORD = struct.Struct("<BIH")
+SNAPSHOT_HEADER = struct.Struct("<4sHIII")
+GAME_ENTRY = struct.Struct("<IBI")
+
+NEW = 1
+MOVE = 2
+CLOSE = 3
+STATES = ["UNFINISHED", "RED_WON", "BLUE_WON", "DRAW"]
+
+
+def sync_directory(directory):
+    """
+    Description:    Fsyncs a directory so a file created or renamed in it is kept. Not every system can open a
+                    directory, those are skipped.
+    """
+
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(handle)
+    except OSError:
+        pass
+    finally:
+        os.close(handle)
+
+
+class GameStore:
+    """
+    Description:    A set of live games kept in a directory. Moves have to be made through the store, a move made
+                    on the JanggiGame directly is not logged and is lost on restart.
+    """
+
+    def __init__(self, directory, group_size=64, sync_every=1, snapshot_every=100000):
+        """
+        Description:    Opens the store, recovering the games already in it
+        Input(s):       directory:      where the log and snapshot are kept, created if needed
+                        group_size:     moves collected before they are written to the log
+                        sync_every:     groups written between fsyncs of the log, 0 to leave it to the system
+                        snapshot_every: moves logged between snapshots, None to only snapshot when asked
+        """
+
+        self._directory = directory
+        self._group_size = group_size
+        self._sync_every = sync_every
+        self._snapshot_every = snapshot_every
+        self._games = dict()
+        self._next_id = 0
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._unsynced = 0
+        self._since_snapshot = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        self._segment = self.recover()
+        self.open_segment(self._segment)
+
+    def get_games(self):
+        """
+        Description:    Returns the dictionary of game id to JanggiGame for every live game
+        """
+
+        return self._games
+
+    def get_game(self, game_id):
+        """
+        Description:    Returns the JanggiGame with the given id
+        """
+
+        return self._games[game_id]
+
+    def path(self, name):
+        """
+        Description:    Returns the path of a file in the store directory
+        """
+
+        return os.path.join(self._directory, name)
+
+    def new_game(self):
+        """
+        Description:    Starts a new game
+        Output(s):      the id of the game
+        """
+
+        game_id = self._next_id
+        self._next_id += 1
+        self._games[game_id] = JanggiGame()
+        self.append(NEW, game_id, 0)
+        return game_id
+
+    def make_move(self, game_id, current_loc, new_loc):
+        """
+        Description:    Makes a move in a game with make_move, and logs it if it was accepted
+        Input(s):       game_id:        the id of the game
+                        current_loc:    the location of the piece to move, such as "c7"
+                        new_loc:        the location to move it to
+        Output(s):      what make_move returned
+        """
+
+        game = self._games[game_id]
+        if not game.make_move(current_loc, new_loc):
+            return False
+        self.append(MOVE, game_id, encode_move(game.convert_coords(current_loc), game.convert_coords(new_loc)))
+        return True
+
+    def close_game(self, game_id):
+        """
+        Description:    Removes a game from the store, for example once it is over and has been saved elsewhere
+        """
+
+        del self._games[game_id]
+        self.append(CLOSE, game_id, 0)
+
+    def append(self, kind, game_id, move):
+        """
+        Description:    Adds a record to the group being collected, writing the group when it is full
+        """
+
+        self._pending += RECORD.pack(kind, game_id, move)
+        self._pending_count += 1
+        self._since_snapshot += 1
+        if self._pending_count >= self._group_size:
+            self.write_group()
+        if self._snapshot_every is not None and self._since_snapshot >= self._snapshot_every:
+            self.snapshot()
+
+    def write_group(self, sync=False):
+        """
+        Description:    Writes the collected records to the log as one frame, and fsyncs the log if enough groups
+                        have been written since the last fsync or sync is True
+        """
+
+        if self._pending_count > 0:
+            records = bytes(self._pending)
+            self._file.write(FRAME.pack(len(records), zlib.crc32(records)) + records)
+            self._file.flush()
+            self._pending = bytearray()
+            self._pending_count = 0
+            self._unsynced += 1
+        if self._unsynced > 0 and (sync or (self._sync_every and self._unsynced >= self._sync_every)):
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def commit(self):
+        """
+        Description:    Writes every move made so far to the log and fsyncs it. Once this returns the moves
+                        survive a crash.
+        """
+
+        self.write_group(sync=True)
+
+    def open_segment(self, number):
+        """
+        Description:    Starts writing to log number, adding to it if it already has records
+        """
+
+        path = self.path("log.%d" % number)
+        if os.path.exists(path):
+            self._file = open(path, "ab")
+        else:
+            self._file = open(path, "wb")
+            self._file.write(LOG_HEADER.pack(LOG_MAGIC, VERSION))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            sync_directory(self._directory)
+
+    def snapshot(self):
+        """
+        Description:    Writes every game to a new snapshot and starts a new log, then removes the logs the
+                        snapshot replaces. The snapshot is written to a temporary file and renamed over the old one,
+                        so a crash part way leaves the old snapshot and its logs in place.
+        """
+
+        self.commit()
+        self._file.close()
+        self._segment += 1
+        self.open_segment(self._segment)
+
+        data = bytearray(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, self._segment, self._next_id,
+                                              len(self._games)))
+        for game_id, game in self._games.items():
+            history = game.get_history()
+            data += GAME_ENTRY.pack(game_id, STATES.index(game.get_game_state()), len(history))
+            data += struct.pack("<%dQ" % len(history), *history)
+            data += encode_position(game)
+        data += struct.pack("<I", zlib.crc32(data))
+
+        with open(self.path("snapshot.tmp"), "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.path("snapshot.tmp"), self.path("snapshot"))
+        sync_directory(self._directory)
+
+        for name in os.listdir(self._directory):
+            if name.startswith("log.") and name[4:].isdigit() and int(name[4:]) < self._segment:
+                os.remove(self.path(name))
+        self._since_snapshot = 0
+
+    def load_snapshot(self):
+        """
+        Description:    Loads the games from the snapshot, if there is one
+        Output(s):      the number of the first log to replay
+        """
+
+        if not os.path.exists(self.path("snapshot")):
+            return 0
+        with open(self.path("snapshot"), "rb") as file:
+            data = file.read()
+        if len(data) < SNAPSHOT_HEADER.size + 4 or struct.unpack_from("<I", data, len(data) - 4)[0] != \
+                zlib.crc32(data[:-4]):
+            raise ValueError("snapshot is damaged: " + self.path("snapshot"))
+        magic, version, segment, self._next_id, count = SNAPSHOT_HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a Janggi snapshot: " + self.path("snapshot"))
+        if version != VERSION:
+            raise ValueError("unsupported snapshot version: " + str(version))
+
+        offset = SNAPSHOT_HEADER.size
+        for _ in range(count):
+            game_id, state, length = GAME_ENTRY.unpack_from(data, offset)
+            offset += GAME_ENTRY.size
+            history = struct.unpack_from("<%dQ" % length, data, offset)
+            offset += 8 * length
+            game = JanggiGame()
+            game.load_position(*decode_position(data, offset))
+            offset += 2 + 2 * data[offset + 1]
+            game.set_history(history)
+            game.set_game_state(STATES[state])
+            self._games[game_id] = game
+        return segment
+
+    def replay_segment(self, number, last):
+        """
+        Description:    Replays the records of a log. A damaged frame at the end of the last log is a write that
+                        was cut off by the crash, so the log is cut back to the frame before it. Anywhere else it
+                        means the log is damaged.
+        Input(s):       number: which log
+                        last:   True for the newest log
+        """
+
+        path = self.path("log.%d" % number)
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < LOG_HEADER.size or LOG_HEADER.unpack_from(data, 0) != (LOG_MAGIC, VERSION):
+            if last and len(data) < LOG_HEADER.size:
+                os.remove(path)         # the crash came before the header was written
+                return
+            raise ValueError("not a Janggi log: " + path)
+
+        offset = LOG_HEADER.size
+        while offset < len(data):
+            if offset + FRAME.size > len(data):
+                break
+            length, checksum = FRAME.unpack_from(data, offset)
+            records = data[offset + FRAME.size:offset + FRAME.size + length]
+            if len(records) < length or zlib.crc32(records) != checksum:
+                break
+            for kind, game_id, move in RECORD.iter_unpack(records):
+                self.replay(kind, game_id, move)
+            offset += FRAME.size + length
+
+        if offset < len(data):
+            if not last:
+                raise ValueError("log is damaged in the middle: " + path)
+            with open(path, "r+b") as file:
+                file.truncate(offset)
+                os.fsync(file.fileno())
+
+    def replay(self, kind, game_id, move):
+        """
+        Description:    Applies one log record to the games
+        """
+
+        if kind == NEW:
+            self._games[game_id] = JanggiGame()
+            self._next_id = max(self._next_id, game_id + 1)
+        elif kind == MOVE:
+            game = self._games[game_id]
+            curr, new = decode_move(move)
+            if not game.make_move(game.convert_loc(curr), game.convert_loc(new)):
+                raise ValueError("logged move %s-%s is not legal in game %d" %
+                                 (game.convert_loc(curr), game.convert_loc(new), game_id))
+        elif kind == CLOSE:
+            del self._games[game_id]
+        else:
+            raise ValueError("unknown log record kind: " + str(kind))
+
+    def recover(self):
+        """
+        Description:    Loads the snapshot and replays the logs after it
+        Output(s):      the number of the log to carry on writing to
+        """
+
+        first = self.load_snapshot()
+        segments = sorted(int(name[4:]) for name in os.listdir(self._directory)
+                          if name.startswith("log.") and name[4:].isdigit() and int(name[4:]) >= first)
+        for number in segments:
+            self.replay_segment(number, number == segments[-1])
+        return max(segments + [first])
+
+    def close(self):
+        """
+        Description:    Commits the moves not written yet and closes the log
+        """
+
+        if self._file is not None:
+            self.commit()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
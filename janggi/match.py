@@ -0,0 +1,386 @@
+# Description:  Plays two engine configurations against each other, to see what a change to the move generation or
+#               search does to strength and speed before it goes out. A configuration is a dictionary of settings
+#               for janggi.player.EnginePlayer and the Search it uses, see make_player.
+#
+#               The games start from balanced openings: every pairing of the horse and elephant setups of the two
+#               players, followed by a few random moves, kept only if a shallow search scores the position close
+#               to even. Each opening is played twice with the colours swapped, so neither engine gets the better
+#               side of an opening. Games are spread over a pool of processes. Every game is played with make_move
+#               and ends when get_game_state is no longer "UNFINISHED", by checkmate, repetition, the move limit
+#               or a player running out of time.
+#
+#               The report gives the score of the first engine, the Elo difference with a confidence interval,
+#               the nodes per second and time per move of each engine, and the result of a sequential probability
+#               ratio test: the match stops as soon as the test can say the first engine is at least elo1 stronger
+#               (H1) or no more than elo0 stronger (H0), with error rates alpha and beta.
+#
+#               Run with "python -m janggi.match first second [games] [workers]", the configurations as JSON, for
+#               example: python -m janggi.match '{"max_depth": 3}' '{"max_depth": 3, "quiescence": false}' 100
+
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+from janggi.clock import Clock
+from janggi.engine import JanggiGame
+from janggi.ordering import MoveOrdering
+from janggi.player import EnginePlayer
+from janggi.search import Search
+
+SETUPS = [(False, False), (True, False), (False, True), (True, True)]   # swap the horse and elephant on each side
+OPENING_PLIES = 2
+BALANCE_DEPTH = 2
+BALANCE_MARGIN = 20         # a soldier
+BALANCE_TRIES = 50
+MAX_PLIES = 200
+RESULTS = {"BLUE_WON": "B", "RED_WON": "R", "DRAW": None}
+PRIOR_WINS = 0.5            # added to the results of every match before the statistics
+PRIOR_LOSSES = 0.5
+
+
+def setup_position(blue_setup, red_setup):
+    """
+    Description:    Returns the starting position with the players' horse and elephant setups
+    Input(s):       blue_setup: (swap the left pair, swap the right pair) for blue, from SETUPS
+                    red_setup:  the same for red
+    Output(s):      the position, as returned by JanggiGame.export_position
+    """
+
+    turn, placements = JanggiGame().export_position()
+    swapped = []
+    for player, piece_type, row, column in placements:
+        swap_left, swap_right = blue_setup if player == "B" else red_setup
+        if piece_type in ("horse", "elephant") and ((column in (1, 2) and swap_left) or
+                                                     (column in (6, 7) and swap_right)):
+            piece_type = "elephant" if piece_type == "horse" else "horse"
+        swapped.append((player, piece_type, row, column))
+    return turn, tuple(swapped)
+
+
+def balanced_openings(count, plies=OPENING_PLIES, margin=BALANCE_MARGIN, seed=0):
+    """
+    Description:    Makes openings that go through every pairing of setups in turn, each followed by random moves
+                    that leave the position even. If none of BALANCE_TRIES tries is within the margin, the most
+                    even one is used.
+    Input(s):       count:  how many openings to make
+                    plies:  random moves after the setup
+                    margin: the most a depth BALANCE_DEPTH search may score the position for either player
+                    seed:   seed for the random moves
+    Output(s):      list of (position, moves), moves as (current coordinates, new coordinates)
+    """
+
+    generator = random.Random(seed)
+    pairings = [(blue, red) for blue in SETUPS for red in SETUPS]
+    openings = []
+    while len(openings) < count:
+        position = setup_position(*pairings[len(openings) % len(pairings)])
+        best = None
+        for _ in range(BALANCE_TRIES):
+            game = JanggiGame()
+            game.load_position(*position)
+            moves = []
+            for _ in range(plies):
+                legal = game.legal_moves()
+                if len(legal) == 0:
+                    break
+                moves.append(generator.choice(legal))
+                game.make_move(game.convert_loc(moves[-1][0]), game.convert_loc(moves[-1][1]))
+            if game.get_game_state() != "UNFINISHED":
+                continue
+            score = abs(Search(game).search(BALANCE_DEPTH)[1])
+            if best is None or score < best[0]:
+                best = (score, moves)
+            if score <= margin:
+                break
+        openings.append((position, best[1]))
+    return openings
+
+
+def make_player(config, clock=None):
+    """
+    Description:    Makes an EnginePlayer from a configuration. Pondering is always off, since both engines share a
+                    process.
+    Input(s):       config: dictionary with any of
+                                max_depth:  the deepest search, defaults to 64
+                                movetime:   seconds per move when the match has no clock
+                                quiescence: search captures past the end of the depth, defaults to True
+                                mvv_lva, killers, history:  the move ordering heuristics, each defaults to True
+                    clock:  the Clock of the game, None for none
+    """
+
+    def search(game):
+        ordering = MoveOrdering(config.get("mvv_lva", True), config.get("killers", True), config.get("history", True))
+        return Search(game, ordering=ordering, quiescence=config.get("quiescence", True))
+
+    return EnginePlayer(clock, config.get("max_depth", 64), ponder=False, search=search,
+                        movetime=config.get("movetime"))
+
+
+def play_game(opening, blue, red, time_control=None, max_plies=MAX_PLIES):
+    """
+    Description:    Runs in a worker process. Plays one game with make_move until get_game_state says it is over.
+    Input(s):       opening:        (position, moves), from balanced_openings
+                    blue:           the configuration playing blue
+                    red:            the configuration playing red
+                    time_control:   (main time, increment, byoyomi, periods) for a Clock, None for no clock
+                    max_plies:      the game is drawn after this many moves, the opening included
+    Output(s):      (game state, plies, {player: (moves, seconds, positions searched)})
+    """
+
+    game = JanggiGame()
+    game.load_position(*opening[0])
+    game.set_draw_rules(3, max_plies)
+    for curr, new in opening[1]:
+        game.make_move(game.convert_loc(curr), game.convert_loc(new))
+
+    clock = None
+    if time_control is not None:
+        clock = Clock(*time_control)
+        clock.watch(game)
+        clock.start(game.get_turn())
+    players = {"B": make_player(blue, clock), "R": make_player(red, clock)}
+    stats = {"B": [0, 0.0, 0], "R": [0, 0.0, 0]}
+    plies = len(opening[1])
+
+    while game.get_game_state() == "UNFINISHED":
+        player = game.get_turn()
+        move = players[player].choose_move(game)
+        if not game.make_move(game.convert_loc(move[0]), game.convert_loc(move[1])):
+            raise ValueError("engine played an illegal move: %s-%s" %
+                             (game.convert_loc(move[0]), game.convert_loc(move[1])))
+        plies += 1
+        found = players[player].get_last()
+        stats[player][0] += 1
+        stats[player][1] += found[4]
+        stats[player][2] += found[5]
+        if clock is not None and clock.get_flagged() is not None:
+            game.set_game_state("RED_WON" if clock.get_flagged() == "B" else "BLUE_WON")
+    return game.get_game_state(), plies, {player: tuple(values) for player, values in stats.items()}
+
+
+def score_and_spread(wins, draws, losses):
+    """
+    Description:    Works out the mean score of the games and the variance of the score of one game, with
+                    PRIOR_WINS and PRIOR_LOSSES added to the results. Without them a match where one side won
+                    every game, or every game was drawn, has no spread at all, and the tests built on it can never
+                    decide.
+    Output(s):      (games with the prior, mean score, variance of one game)
+    """
+
+    wins, losses = wins + PRIOR_WINS, losses + PRIOR_LOSSES
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    spread = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    return games, score, spread
+
+
+def elo_difference(wins, draws, losses, confidence=0.95):
+    """
+    Description:    Works out the Elo difference from a score, with a confidence interval from the spread of the
+                    game results. The interval is worked out around the Elo difference, with the standard error of
+                    the score scaled by the slope of score_to_elo, so it stays finite when one side scores
+                    everything.
+    Output(s):      (Elo difference, low end, high end)
+    """
+
+    games, score, spread = score_and_spread(wins, draws, losses)
+    slope = 400 / (math.log(10) * score * (1 - score))
+    margin = statistics.NormalDist().inv_cdf((1 + confidence) / 2) * math.sqrt(spread / games) * slope
+    elo = score_to_elo(score)
+    return elo, elo - margin, elo + margin
+
+
+def score_to_elo(score):
+    """
+    Description:    Converts an expected score between 0 and 1 to an Elo difference
+    """
+
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1) + 0.0     # no "-0.0" for an even score
+
+
+def elo_to_score(elo):
+    """
+    Description:    Converts an Elo difference to an expected score between 0 and 1
+    """
+
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def sprt(wins, draws, losses, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+    """
+    Description:    The sequential probability ratio test of H1, the first engine is elo1 stronger, against H0, it
+                    is elo0 stronger. Uses the normal approximation of the log likelihood ratio on the game scores,
+                    with the prior of score_and_spread.
+    Output(s):      (log likelihood ratio, lower bound, upper bound, "H0", "H1" or None while undecided)
+    """
+
+    lower = math.log(beta / (1 - alpha))
+    upper = math.log((1 - beta) / alpha)
+    games, score, spread = score_and_spread(wins, draws, losses)
+    score0, score1 = elo_to_score(elo0), elo_to_score(elo1)
+    llr = games * (score1 - score0) * (2 * score - score0 - score1) / (2 * spread)
+    if llr >= upper:
+        return llr, lower, upper, "H1"
+    if llr <= lower:
+        return llr, lower, upper, "H0"
+    return llr, lower, upper, None
+
+
+class Match:
+    """
+    Description:    A match between two engine configurations
+    """
+
+    def __init__(self, first, second, time_control=None, max_plies=MAX_PLIES, workers=None,
+                 sprt_bounds=(0.0, 10.0, 0.05, 0.05), seed=0):
+        """
+        Description:    Sets up the match
+        Input(s):       first:          the configuration being tested
+                        second:         the configuration it is compared with
+                        time_control:   (main time, increment, byoyomi, periods), None for no clock. The clocks
+                                        run on the real time, so with more workers than cores the engines get
+                                        less search for the same time and lose more games on time
+                        max_plies:      games are drawn after this many moves
+                        workers:        number of processes, defaults to the number of cores
+                        sprt_bounds:    (elo0, elo1, alpha, beta) for the test, None to always play every game
+                        seed:           seed for the openings
+        """
+
+        self._configs = (first, second)
+        self._time_control = time_control
+        self._max_plies = max_plies
+        self._workers = workers or os.cpu_count() or 1
+        self._sprt_bounds = sprt_bounds
+        self._seed = seed
+        self._results = [0, 0, 0]                 # wins, draws and losses of the first engine
+        self._stats = [[0, 0.0, 0], [0, 0.0, 0]]  # moves, seconds and positions searched of each engine
+        self._plies = 0
+        self._decision = None
+
+    def get_results(self):
+        """
+        Description:    Returns (wins, draws, losses) of the first engine
+        """
+
+        return tuple(self._results)
+
+    def get_decision(self):
+        """
+        Description:    Returns "H0" or "H1" if the test stopped the match, None otherwise
+        """
+
+        return self._decision
+
+    def add_result(self, first_player, state, plies, stats):
+        """
+        Description:    Counts a finished game
+        Input(s):       first_player:   the colour the first engine played
+                        state, plies, stats:    what play_game returned
+        """
+
+        winner = RESULTS[state]
+        if winner is None:
+            self._results[1] += 1
+        elif winner == first_player:
+            self._results[0] += 1
+        else:
+            self._results[2] += 1
+        self._plies += plies
+        second_player = "R" if first_player == "B" else "B"
+        for number, player in enumerate((first_player, second_player)):
+            for index in range(3):
+                self._stats[number][index] += stats[player][index]
+
+    def run(self, games, report=None):
+        """
+        Description:    Plays up to games games, in pairs on the same opening with the colours swapped, stopping
+                        early once the test decides
+        Input(s):       games:  the most games to play
+                        report: function called with the Match after each game, None for none
+        Output(s):      the Match
+        """
+
+        openings = balanced_openings((games + 1) // 2, seed=self._seed)
+        first, second = self._configs
+        jobs = []
+        for opening in openings:
+            jobs.append(("B", (opening, first, second, self._time_control, self._max_plies)))
+            jobs.append(("R", (opening, second, first, self._time_control, self._max_plies)))
+        jobs = jobs[:games]
+
+        if self._workers == 1:
+            for first_player, args in jobs:
+                self.add_result(first_player, *play_game(*args))
+                if report is not None:
+                    report(self)
+                if self.decide():
+                    break
+            return self
+
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        with ProcessPoolExecutor(self._workers) as pool:
+            running = {pool.submit(play_game, *args): first_player for first_player, args in jobs}
+            while running:
+                done, pending = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.add_result(running.pop(future), *future.result())
+                    if report is not None:
+                        report(self)
+                if self.decide():
+                    for future in running:
+                        future.cancel()
+                    break
+        return self
+
+    def decide(self):
+        """
+        Description:    Runs the test on the games so far
+        Output(s):      True if the match should stop
+        """
+
+        if self._sprt_bounds is not None:
+            self._decision = sprt(*self._results, *self._sprt_bounds)[3]
+        return self._decision is not None
+
+    def summary(self):
+        """
+        Description:    Describes the match so far as text
+        """
+
+        wins, draws, losses = self._results
+        games = wins + draws + losses
+        elo, low, high = elo_difference(wins, draws, losses)
+        lines = ["games %d: +%d =%d -%d, score %.1f%%, average %.0f plies" %
+                 (games, wins, draws, losses, 100 * (wins + draws / 2) / max(games, 1), self._plies / max(games, 1)),
+                 "Elo difference %+.1f, 95%% interval [%+.1f, %+.1f]" % (elo, low, high)]
+        if self._sprt_bounds is not None:
+            llr, lower, upper, decision = sprt(wins, draws, losses, *self._sprt_bounds)
+            lines.append("SPRT elo0 %g elo1 %g: LLR %.2f in [%.2f, %.2f], %s" %
+                         (self._sprt_bounds[0], self._sprt_bounds[1], llr, lower, upper,
+                          {"H0": "H0 accepted", "H1": "H1 accepted", None: "undecided"}[decision]))
+        for name, (moves, seconds, nodes) in zip(("first", "second"), self._stats):
+            lines.append("%-6s %8.0f nodes/s, %.3fs per move" %
+                         (name, nodes / seconds if seconds else 0.0, seconds / moves if moves else 0.0))
+        return "\n".join(lines)
+
+
+def main(args):
+    first, second = json.loads(args[0]), json.loads(args[1])
+    games, workers = [int(arg) for arg in args[2:]] + [100, 0][len(args) - 2:]
+    start = time.perf_counter()
+    match = Match(first, second, workers=workers or None).run(games)
+    print(match.summary())
+    print("%.1fs" % (time.perf_counter() - start))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:5]))
@@ -0,0 +1,449 @@
+# Description:  Monte Carlo tree search for Janggi. Moves are chosen with UCT, each new leaf is scored by playing a
+#               rollout to the end of the game or a fixed length, and the tree is kept between the moves of a game
+#               so the work done on the move that was played is not thrown away. Rollouts can be run in batches on
+#               a pool of processes.
+
+import math
+import os
+import random
+import time
+
+from janggi.engine import JanggiGame
+from janggi.rules import other_player
+
+
+def random_policy(game, moves, generator):
+    """
+    Description:    Rollout policy that picks any move
+    Input(s):       game:       the JanggiGame the rollout is played on
+                    moves:      list of (current coordinates, new coordinates, captured piece) tuples
+                    generator:  the random number generator of the rollout
+    """
+
+    return generator.choice(moves)
+
+
+def capture_policy(game, moves, generator):
+    """
+    Description:    Rollout policy that takes a piece when it can, otherwise picks any move
+    Input(s):       game:       the JanggiGame the rollout is played on
+                    moves:      list of (current coordinates, new coordinates, captured piece) tuples
+                    generator:  the random number generator of the rollout
+    """
+
+    captures = [move for move in moves if move[2] is not None]
+    if len(captures) > 0:
+        return generator.choice(captures)
+    return generator.choice(moves)
+
+
+def node_moves(game):
+    """
+    Description:    Returns the moves searched from a position. Passing is only searched when there is nothing
+                    else to do, which keeps the tree from filling up with passes.
+    Input(s):       game:   the JanggiGame to look at
+    """
+
+    moves = game.legal_moves()
+    if len(moves) == 0 and not game.general_attacked(game.get_turn()):
+        moves = game.legal_moves(allow_pass=True)
+    return moves
+
+
+def play_rollout(game, policy, max_length, generator):
+    """
+    Description:    Plays moves picked by the policy until a player is mated, the position repeats or max_length
+                    moves have been made. A rollout that runs out of moves is scored by the evaluation. The game is
+                    put back to where it started.
+    Input(s):       game:       the JanggiGame to play on
+                    policy:     function that picks a rollout move
+                    max_length: the most moves to play
+                    generator:  random number generator
+    Output(s):      the result for blue, 1 for a win, 0 for a loss and 0.5 for a draw
+    """
+
+    undo = []
+    result = None
+    for _ in range(max_length):
+        turn = game.get_turn()
+        moves = list(game.iter_moves(turn))
+        move = None
+        while len(moves) > 0:                   # only check the move that was picked is legal
+            move = policy(game, moves, generator)
+            captured = game.do_move(move[0], move[1])
+            if not game.general_attacked(turn):
+                undo.append((move[0], move[1], captured))
+                break
+            game.undo_move(move[0], move[1], captured)
+            moves.remove(move)
+            move = None
+        if move is None:
+            if game.general_attacked(turn):
+                result = 0.0 if turn == "B" else 1.0
+                break
+            undo.append((None, None, None))
+            game.do_move((0, 0), (0, 0))        # nothing to do but pass
+        if game.repetition_count() > 1:
+            result = 0.5
+            break
+
+    if result is None:
+        score = game.evaluate() if game.get_turn() == "B" else -game.evaluate()
+        result = 1.0 / (1.0 + math.exp(-score / 100.0))
+    for curr, new, captured in reversed(undo):
+        if curr is None:
+            game.undo_move((0, 0), (0, 0), None)
+        else:
+            game.undo_move(curr, new, captured)
+    return result
+
+
+def run_rollouts(position, history, policy, max_length, seeds):
+    """
+    Description:    Runs in a worker process. Plays one rollout for each seed from a position.
+    Input(s):       position:   the position, as returned by JanggiGame.export_position
+                    history:    the position hashes of the game so far
+                    policy:     the rollout policy, a function defined at the top level of a module
+                    max_length: the most moves to play in each rollout
+                    seeds:      one random seed for each rollout
+    Output(s):      list of results for blue
+    """
+
+    game = JanggiGame()
+    game.load_position(*position)
+    game.set_history(history)
+    return [play_rollout(game, policy, max_length, random.Random(seed)) for seed in seeds]
+
+
+class Node:
+    """
+    Description:    A position in the search tree. The score is kept for the player that made the move leading
+                    here, so a parent picks the child with the best score for itself.
+    """
+
+    def __init__(self, move, parent, player):
+        """
+        Description:    Initializes a node that has not been visited yet
+        Input(s):       move:   the move leading to this node, None for the root
+                        parent: the parent Node, None for the root
+                        player: "B" or "R", the player that made the move
+        """
+
+        self._move = move
+        self._parent = parent
+        self._player = player
+        self._children = dict()
+        self._untried = None
+        self._visits = 0
+        self._score = 0.0
+
+    def get_move(self):
+        """
+        Description:    Returns the move leading to this node
+        """
+
+        return self._move
+
+    def get_parent(self):
+        """
+        Description:    Returns the parent node, None for the root
+        """
+
+        return self._parent
+
+    def set_parent(self, parent):
+        """
+        Description:    Updates the parent node
+        """
+
+        self._parent = parent
+
+    def get_player(self):
+        """
+        Description:    Returns the player that made the move leading to this node
+        """
+
+        return self._player
+
+    def get_children(self):
+        """
+        Description:    Returns the dictionary of move to child node
+        """
+
+        return self._children
+
+    def get_visits(self):
+        """
+        Description:    Returns how many rollouts went through this node
+        """
+
+        return self._visits
+
+    def get_score(self):
+        """
+        Description:    Returns the total score of the rollouts for the player that made the move
+        """
+
+        return self._score
+
+    def get_untried(self):
+        """
+        Description:    Returns the moves that do not have a child yet, None until the node is expanded
+        """
+
+        return self._untried
+
+    def set_untried(self, moves):
+        """
+        Description:    Updates the moves that do not have a child yet
+        """
+
+        self._untried = moves
+
+    def update(self, result, visits=1):
+        """
+        Description:    Adds the results of rollouts through this node
+        Input(s):       result: the total result for blue
+                        visits: how many rollouts the result is for
+        """
+
+        self._visits += visits
+        if self._player == "B":
+            self._score += result
+        else:
+            self._score += visits - result
+
+    def select(self, exploration):
+        """
+        Description:    Picks the child with the highest upper confidence bound
+        Input(s):       exploration:    how much to favor children that have not been visited much
+        """
+
+        log_visits = math.log(max(self._visits, 1))
+        best = None
+        best_value = -1.0
+        for child in self._children.values():
+            if child._visits == 0:
+                return child
+            value = child._score / child._visits + exploration * math.sqrt(log_visits / child._visits)
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+
+class MCTS:
+    """
+    Description:    Monte Carlo tree search for one game. Call search to pick a move and advance after each move
+                    that is played, by either player, to keep the part of the tree that is still useful.
+    """
+
+    def __init__(self, game, exploration=1.4, policy=random_policy, rollout_length=80, workers=1,
+                 batch_size=None):
+        """
+        Description:    Initializes the search.
+        Input(s):       game:           the JanggiGame to search. It is forked, so the search never changes it
+                        exploration:    the UCT exploration constant
+                        policy:         the rollout policy. Must be a top level function to use workers
+                        rollout_length: the most moves in a rollout
+                        workers:        number of processes to run rollouts on, 1 runs them in this process
+                        batch_size:     leaves to collect before running their rollouts, defaults to 4 per worker
+        """
+
+        self._game = game.fork()
+        self._exploration = exploration
+        self._policy = policy
+        self._rollout_length = rollout_length
+        self._workers = workers or os.cpu_count() or 1
+        self._batch_size = batch_size or 4 * self._workers
+        from concurrent.futures import ProcessPoolExecutor
+        self._pool = ProcessPoolExecutor(self._workers) if self._workers > 1 else None
+        self._generator = random.Random()
+        self._root = Node(None, None, other_player(self._game.get_turn()))
+        self._playouts = 0
+        self._elapsed = 0.0
+
+    def get_root(self):
+        """
+        Description:    Returns the root node of the tree
+        """
+
+        return self._root
+
+    def get_playouts(self):
+        """
+        Description:    Returns how many rollouts have been played
+        """
+
+        return self._playouts
+
+    def playouts_per_second(self):
+        """
+        Description:    Returns the rollouts played per second of searching
+        """
+
+        if self._elapsed == 0:
+            return 0.0
+        return self._playouts / self._elapsed
+
+    def close(self):
+        """
+        Description:    Shuts down the process pool
+        """
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def advance(self, move):
+        """
+        Description:    Moves the root of the tree down to the position after a move that was played. The subtree
+                        of the move is kept, the rest is thrown away.
+        Input(s):       move:   (current coordinates, new coordinates) of the move that was played
+        """
+
+        child = self._root.get_children().get(move)
+        self._game.do_move(move[0], move[1])
+        if child is None:
+            child = Node(move, None, other_player(self._game.get_turn()))
+        child.set_parent(None)
+        self._root = child
+
+    def search(self, playouts=None, time_limit=None):
+        """
+        Description:    Runs rollouts until the number of playouts or the time limit is reached
+        Input(s):       playouts:   how many rollouts to play
+                        time_limit: seconds to search for
+        Output(s):      the most visited move from the root, None if there are no moves
+        """
+
+        if playouts is None and time_limit is None:
+            playouts = 1000
+        start = time.perf_counter()
+        played = 0
+        while True:
+            if playouts is not None and played >= playouts:
+                break
+            if time_limit is not None and time.perf_counter() - start >= time_limit:
+                break
+            batch = self._batch_size
+            if playouts is not None:
+                batch = min(batch, playouts - played)
+            played += self.run_batch(batch)
+        self._elapsed += time.perf_counter() - start
+        return self.best_move()
+
+    def best_move(self):
+        """
+        Description:    Returns the most visited move from the root
+        """
+
+        best = None
+        for move, child in self._root.get_children().items():
+            if best is None or child.get_visits() > best.get_visits():
+                best = child
+        if best is None:
+            moves = node_moves(self._game)
+            return moves[0] if len(moves) > 0 else None
+        return best.get_move()
+
+    def run_batch(self, size):
+        """
+        Description:    Picks size leaves, runs their rollouts and adds the results back up the tree. Each leaf gets
+                        a temporary loss while the batch is out so the next picks spread over other moves.
+        Input(s):       size:   how many leaves to pick
+        Output(s):      how many rollouts were played
+        """
+
+        leaves = []
+        for _ in range(size):
+            node, path, result = self.select_leaf()
+            if result is not None:
+                self.backup(node, result)
+                self._playouts += 1
+                continue
+            position = self._game.export_position()
+            history = list(self._game.get_history())
+            for curr, new, captured in reversed(path):
+                self._game.undo_move(curr, new, captured)
+            node.update(0.0 if node.get_player() == "B" else 1.0)     # temporary loss until the rollout returns
+            leaves.append((node, position, history))
+
+        if len(leaves) == 0:
+            return size
+        seeds = [self._generator.getrandbits(32) for _ in leaves]
+        if self._pool is None:
+            results = [run_rollouts(position, history, self._policy, self._rollout_length, [seed])[0]
+                       for (node, position, history), seed in zip(leaves, seeds)]
+        else:
+            futures = [self._pool.submit(run_rollouts, position, history, self._policy, self._rollout_length,
+                                         [seed]) for (node, position, history), seed in zip(leaves, seeds)]
+            results = [future.result()[0] for future in futures]
+
+        for (node, position, history), result in zip(leaves, results):
+            node.update(0.0 if node.get_player() == "B" else -1.0, -1)     # take the temporary loss back
+            self.backup(node, result)
+            self._playouts += 1
+        return size
+
+    def select_leaf(self):
+        """
+        Description:    Walks down the tree with UCT and adds one new child. The game is left in the position of the
+                        new child when it still needs a rollout.
+        Output(s):      (node, moves made on the game, result for blue if the node is the end of the game)
+        """
+
+        node = self._root
+        path = []
+        while True:
+            if node.get_untried() is None:
+                node.set_untried(node_moves(self._game))
+            if self._game.repetition_count() > 1 and node is not self._root:
+                result = 0.5
+                break
+            if len(node.get_untried()) == 0 and len(node.get_children()) == 0:
+                result = 0.0 if self._game.get_turn() == "B" else 1.0        # mated
+                break
+            if len(node.get_untried()) > 0:
+                untried = node.get_untried()
+                move = untried.pop(self._generator.randrange(len(untried)))
+                player = self._game.get_turn()
+                path.append((move[0], move[1], self._game.do_move(move[0], move[1])))
+                child = Node(move, node, player)
+                node.get_children()[move] = child
+                return child, path, None
+            node = node.select(self._exploration)
+            path.append((node.get_move()[0], node.get_move()[1],
+                         self._game.do_move(node.get_move()[0], node.get_move()[1])))
+
+        for curr, new, captured in reversed(path):
+            self._game.undo_move(curr, new, captured)
+        return node, [], result
+
+    def backup(self, node, result):
+        """
+        Description:    Adds a rollout result to a node and all of its parents
+        Input(s):       node:   the node the rollout was played from
+                        result: the result for blue
+        """
+
+        while node is not None:
+            node.update(result)
+            node = node.get_parent()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for workers in sorted(set([1, os.cpu_count() or 1])):
+        with MCTS(JanggiGame(), workers=workers) as mcts:
+            move = mcts.search(playouts=count)
+            print("workers %2d  %d playouts  %.1f playouts/s  best %s" %
+                  (workers, mcts.get_playouts(), mcts.playouts_per_second(), move))
@@ -0,0 +1,144 @@
+# Description:  Move ordering for alpha-beta search. Alpha-beta cuts off the most when the best move is searched
+#               first, so the moves of each position are sorted before they are searched: the move stored in the
+#               transposition table, then captures with the most valuable victim and least valuable attacker first,
+#               then the killer moves that cut off at the same ply elsewhere in the tree, then the remaining quiet
+#               moves by how often they have cut off before (the history table). The ordering only needs the board
+#               of the game, so any search that works on JanggiGame can use it.
+
+from janggi.rules import PIECE_CLASSES, PIECE_VALUES, square_index
+
+# Attackers from least to most valuable. Generals go last, trading one away loses the game.
+ATTACKER_ORDER = ["soldier", "advisor", "elephant", "horse", "cannon", "chariot", "general"]
+
+# Capture scores, the value of the victim first and the attacker only to break ties
+MVV_LVA = {(victim, attacker): PIECE_VALUES[victim] * len(ATTACKER_ORDER) + len(ATTACKER_ORDER) - 1 - rank
+           for victim in PIECE_CLASSES for rank, attacker in enumerate(ATTACKER_ORDER)}
+
+KILLER_SLOTS = 2
+HISTORY_LIMIT = 1 << 20     # the history table is halved when a score passes this
+
+# Bands the sort keys fall into, so every capture goes before every killer and every killer before quiet moves
+TABLE_BAND = 3
+CAPTURE_BAND = 2
+KILLER_BAND = 1
+QUIET_BAND = 0
+
+
+class MoveOrdering:
+    """
+    Description:    Sorts the moves of a position for a search and learns from the moves that cut off. One
+                    ordering is used for one search at a time. Each of the heuristics can be turned off to measure
+                    what it is worth.
+    """
+
+    def __init__(self, mvv_lva=True, killers=True, history=True):
+        """
+        Description:    Initializes an ordering with empty killer slots and an empty history table
+        Input(s):       mvv_lva:    sort captures by victim and attacker
+                        killers:    put the killer moves of each ply before the other quiet moves
+                        history:    sort the other quiet moves by the history table
+        """
+
+        self._mvv_lva = mvv_lva
+        self._use_killers = killers
+        self._use_history = history
+        self._killers = []
+        self._history = [0] * (90 * 90)
+
+    def get_killers(self, ply):
+        """
+        Description:    Returns the killer moves stored for a ply, most recent first
+        Input(s):       ply:    how far from the root
+        """
+
+        if ply < len(self._killers):
+            return list(self._killers[ply])
+        return []
+
+    def get_history(self, curr, new):
+        """
+        Description:    Returns the history score of a move
+        Input(s):       curr:   the coordinates the move is from
+                        new:    the coordinates the move is to
+        """
+
+        return self._history[square_index(curr) * 90 + square_index(new)]
+
+    def clear(self):
+        """
+        Description:    Forgets the killer moves and the history table, for a search of an unrelated position
+        """
+
+        self._killers = []
+        self._history = [0] * (90 * 90)
+
+    def new_search(self):
+        """
+        Description:    Called at the start of each search, but not when a search is carried on to its next depth.
+                        The killer moves are for plies of the last search, so they are dropped. The history table
+                        is halved so it follows the new position more than the old ones.
+        """
+
+        self._killers = []
+        self._history = [score >> 1 for score in self._history]
+
+    def order(self, game, moves, ply, table_move=None):
+        """
+        Description:    Sorts moves so the ones most likely to cut off come first
+        Input(s):       game:       the JanggiGame the moves are for, in the position they are made from
+                        moves:      list of (current coordinates, new coordinates) tuples
+                        ply:        how far from the root the position is
+                        table_move: the best move stored in the transposition table, searched first
+        Output(s):      the moves as a new list, in the order to search them
+        """
+
+        board = game.get_board()
+        killers = self._killers[ply] if self._use_killers and ply < len(self._killers) else ()
+        history = self._history if self._use_history else None
+        mvv_lva = self._mvv_lva
+
+        def key(move):
+            if move == table_move:
+                return TABLE_BAND, 0
+            curr, new = move
+            target = board.get(new)
+            if target is not None and curr != new:
+                if mvv_lva:
+                    return CAPTURE_BAND, MVV_LVA[target.get_type(), board[curr].get_type()]
+                return CAPTURE_BAND, 0
+            if move in killers:
+                return KILLER_BAND, -killers.index(move)
+            if history is not None:
+                return QUIET_BAND, history[square_index(curr) * 90 + square_index(new)]
+            return QUIET_BAND, 0
+
+        return sorted(moves, key=key, reverse=True)
+
+    def cutoff(self, game, move, depth, ply):
+        """
+        Description:    Records a move that was good enough to cut off the search. Captures are already sorted
+                        first, so only quiet moves are remembered as killers and in the history table.
+        Input(s):       game:   the JanggiGame, in the position the move was made from
+                        move:   (current coordinates, new coordinates)
+                        depth:  plies that were left to search, deeper cutoffs count for more
+                        ply:    how far from the root the position is
+        """
+
+        curr, new = move
+        if curr != new and new in game.get_board():
+            return
+
+        if self._use_killers:
+            while len(self._killers) <= ply:
+                self._killers.append([])
+            killers = self._killers[ply]
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+
+        if self._use_history:
+            index = square_index(curr) * 90 + square_index(new)
+            self._history[index] += depth * depth
+            if self._history[index] > HISTORY_LIMIT:
+                self._history = [score >> 1 for score in self._history]
@@ -0,0 +1,171 @@
+# Description:  An engine that plays timed games. It thinks for as long as janggi.clock.allocate_time gives it, and
+#               ponders: once it has moved, it guesses the reply from the principal variation and searches the
+#               position after that reply in a background thread while the opponent thinks. If the opponent plays
+#               the guessed move the pondering search simply carries on with a deadline, so the time the opponent
+#               spent thinking counts towards the engine's search without coming off its clock. Otherwise the
+#               pondering is stopped and thrown away.
+#
+#               The pondering search runs on its own copy of the game, loaded from export_position rather than
+#               forked, so the two threads never share pieces. Python runs one thread at a time, so pondering only
+#               gains when the opponent is not using the same process, such as a person or another program.
+
+import threading
+import time
+
+from janggi.clock import NEW_DEPTH_SHARE, allocate_time
+from janggi.engine import JanggiGame
+from janggi.search import Search
+
+
+def copy_game(game):
+    """
+    Description:    Makes a JanggiGame with the position and history of a game that shares nothing with it
+    """
+
+    copy = JanggiGame()
+    copy.load_position(*game.export_position())
+    copy.set_history(game.get_history())
+    return copy
+
+
+class EnginePlayer:
+    """
+    Description:    Chooses moves for one side of a timed game
+    """
+
+    def __init__(self, clock=None, max_depth=64, ponder=True, search=Search, allocate=allocate_time, movetime=None):
+        """
+        Description:    Sets up the player
+        Input(s):       clock:      the janggi.clock.Clock of the game, None to search to max_depth every move
+                        max_depth:  the deepest search to run, in plies
+                        ponder:     search the expected reply while the opponent thinks
+                        search:     function making the Search for a game
+                        allocate:   function deciding how long to think, called like allocate_time
+                        movetime:   seconds to think on each move when there is no clock, None to search to
+                                    max_depth
+        """
+
+        self._clock = clock
+        self._max_depth = max_depth
+        self._ponder = ponder
+        self._search = search
+        self._allocate = allocate
+        self._movetime = movetime
+        self._pondering = None          # (position hash, Search, thread, result list, started)
+        self._last = None
+        self._ponders = 0
+        self._hits = 0
+
+    def get_last(self):
+        """
+        Description:    Returns what the last search found: (best move, score, principal variation, depth reached,
+                        seconds taken, positions searched)
+        """
+
+        return self._last
+
+    def get_ponders(self):
+        """
+        Description:    Returns how many times the player pondered
+        """
+
+        return self._ponders
+
+    def get_hits(self):
+        """
+        Description:    Returns how many times the opponent played the move the player pondered on
+        """
+
+        return self._hits
+
+    def choose_move(self, game):
+        """
+        Description:    Chooses a move for the player to move in a game, using the pondering search if the opponent
+                        played the expected move. The game is not changed.
+        Input(s):       game:   the JanggiGame
+        Output(s):      (current coordinates, new coordinates), a pass (the general's square twice) if the player
+                        has no other move, or None if the player is checkmated
+        """
+
+        start = time.perf_counter()
+        target, limit = None, None
+        if self._clock is not None:
+            target, limit = self._allocate(game, *self._clock.get_state(game.get_turn()))
+        elif self._movetime is not None:
+            target, limit = self._movetime * NEW_DEPTH_SHARE, self._movetime
+
+        result, search = None, None
+        if self._pondering is not None:
+            key, search, thread, found, pondered = self._pondering
+            self._pondering = None
+            if key == game.get_hash():
+                self._hits += 1
+                if target is not None:
+                    # the time spent pondering already went to this move, so only the rest of the target is left
+                    search.set_limits(limit, max(0.0, target - (start - pondered)))
+                thread.join()
+                result = found[0]
+                if result[0] is None:
+                    result = None
+            else:
+                search.stop()
+                thread.join()
+                search = None
+
+        if result is None:
+            if target is not None:
+                spent = time.perf_counter() - start
+                target, limit = max(0.0, target - spent), max(0.0, limit - spent)
+            search = self._search(copy_game(game))
+            result = search.search(self._max_depth, limit, soft_limit=target)
+        if result[0] is None:
+            moves = game.legal_moves(allow_pass=True)
+            if len(moves) == 0:
+                return None
+            result = (moves[0],) + result[1:]           # no depth finished in time or only a pass is left
+        self._last = result + (time.perf_counter() - start, search.get_nodes())
+        return result[0]
+
+    def ponder(self, game):
+        """
+        Description:    Starts searching the expected reply in the background. Call it after the player's move has
+                        been made, with the opponent to move.
+        Input(s):       game:   the JanggiGame
+        """
+
+        self.stop_pondering()
+        if not self._ponder or self._last is None or game.get_game_state() != "UNFINISHED":
+            return
+        pv = self._last[2]
+        if len(pv) < 2 or pv[1] not in game.legal_moves():
+            return
+        copy = copy_game(game)
+        copy.do_move(*pv[1])
+        if len(copy.legal_moves()) == 0:
+            return
+        search = self._search(copy)
+        found = [None]
+        thread = threading.Thread(target=self.run_ponder, args=(search, found), daemon=True)
+        self._pondering = (copy.get_hash(), search, thread, found, time.perf_counter())
+        self._ponders += 1
+        thread.start()
+
+    def run_ponder(self, search, found):
+        """
+        Description:    Runs in the pondering thread. Searches until stopped or given a deadline by choose_move.
+        Input(s):       search: the Search of the position after the expected reply
+                        found:  list whose one item is set to the result
+        """
+
+        found[0] = search.search(self._max_depth)
+
+    def stop_pondering(self):
+        """
+        Description:    Stops pondering, for example when the game is over
+        """
+
+        if self._pondering is not None:
+            key, search, thread, found, pondered = self._pondering
+            self._pondering = None
+            search.stop()
+            thread.join()
@@ -0,0 +1,165 @@
+# Description:  An index of every position reached in a set of archived games, stored in SQLite. Each position is
+#               found by its zobrist hash, and the table is kept in hash order so finding the games that reached a
+#               position is one index lookup. Games are added as they are archived, so the index never has to be
+#               rebuilt from the start.
+
+import sqlite3
+
+from janggi.engine import JanggiGame
+
+
+def signed(value):
+    """
+    Description:    SQLite only stores signed 64-bit integers, so hashes above 2**63 are stored as negative numbers
+    Input(s):       value:  the unsigned 64-bit hash
+    """
+
+    if value >= 1 << 63:
+        return value - (1 << 64)
+    return value
+
+
+class PositionIndex:
+    """
+    Description:    Maps position hashes to the (game number, ply) where they were reached.
+    """
+
+    def __init__(self, path):
+        """
+        Description:    Opens the index, creating it if needed.
+        Input(s):       path:   the SQLite file, ":memory:" for an index that is not saved
+        """
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS positions (hash INTEGER NOT NULL, game INTEGER NOT NULL, "
+                                 "ply INTEGER NOT NULL, PRIMARY KEY (hash, game, ply)) WITHOUT ROWID")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS games (game INTEGER PRIMARY KEY, plies INTEGER)")
+        self._connection.commit()
+
+    def game_count(self):
+        """
+        Description:    Returns how many games have been indexed
+        """
+
+        return self._connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def position_count(self):
+        """
+        Description:    Returns how many positions have been indexed
+        """
+
+        return self._connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def has_game(self, game_number):
+        """
+        Description:    Checks if a game has already been indexed
+        Input(s):       game_number:    the number of the game
+        """
+
+        row = self._connection.execute("SELECT 1 FROM games WHERE game = ?", (game_number,)).fetchone()
+        return row is not None
+
+    def add_game(self, game_number, moves, start=None, commit=True):
+        """
+        Description:    Replays a game and adds every position it reached, the starting position included. A game
+                        that is already in the index is skipped.
+        Input(s):       game_number:    the number of the game, for example its number in a record file
+                        moves:          list of (current coordinates, new coordinates) tuples
+                        start:          the JanggiGame the game started from, None for a new game
+                        commit:         False to leave the changes for a later commit, when adding many games
+        """
+
+        if self.has_game(game_number):
+            return
+        game = JanggiGame() if start is None else start.fork()
+        rows = [(signed(game.get_hash()), game_number, 0)]
+        for ply, (curr, new) in enumerate(moves):
+            game.do_move(curr, new)
+            rows.append((signed(game.get_hash()), game_number, ply + 1))
+        self._connection.executemany("INSERT OR IGNORE INTO positions VALUES (?, ?, ?)", rows)
+        self._connection.execute("INSERT INTO games VALUES (?, ?)", (game_number, len(moves)))
+        if commit:
+            self._connection.commit()
+
+    def update_from_record(self, reader, batch_size=1000):
+        """
+        Description:    Adds the games of a record file that are not in the index yet
+        Input(s):       reader:     a janggi.record.RecordReader
+                        batch_size: games to add between commits
+        Output(s):      the number of games added
+        """
+
+        added = 0
+        for game_number in range(reader.game_count()):
+            if self.has_game(game_number):
+                continue
+            start = reader.position(game_number, 0)
+            self.add_game(game_number, reader.game_moves(game_number), start, commit=False)
+            added += 1
+            if added % batch_size == 0:
+                self._connection.commit()
+        self._connection.commit()
+        return added
+
+    def find(self, position, limit=None):
+        """
+        Description:    Returns where a position was reached
+        Input(s):       position:   a JanggiGame in the position, or the hash of the position
+                        limit:      the most results to return, None for all of them
+        Output(s):      list of (game number, ply) tuples
+        """
+
+        if isinstance(position, JanggiGame):
+            position = position.get_hash()
+        query = "SELECT game, ply FROM positions WHERE hash = ? ORDER BY game, ply"
+        if limit is not None:
+            query += " LIMIT " + str(int(limit))
+        return self._connection.execute(query, (signed(position),)).fetchall()
+
+    def find_games(self, position):
+        """
+        Description:    Returns the games that reached a position
+        Input(s):       position:   a JanggiGame in the position, or the hash of the position
+        Output(s):      sorted list of game numbers
+        """
+
+        if isinstance(position, JanggiGame):
+            position = position.get_hash()
+        rows = self._connection.execute("SELECT DISTINCT game FROM positions WHERE hash = ? ORDER BY game",
+                                        (signed(position),))
+        return [row[0] for row in rows]
+
+    def close(self):
+        """
+        Description:    Saves any changes and closes the index
+        """
+
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from janggi.record import RecordReader
+
+    if len(sys.argv) != 3:
+        print("usage: python -m janggi.positions <record file> <index file>")
+        sys.exit(1)
+    with RecordReader(sys.argv[1]) as record, PositionIndex(sys.argv[2]) as index:
+        began = time.perf_counter()
+        new_games = index.update_from_record(record)
+        print("added %d games in %.1fs, %d positions indexed" %
+              (new_games, time.perf_counter() - began, index.position_count()))
+        began = time.perf_counter()
+        found = index.find(JanggiGame())
+        print("starting position found %d times in %.2f ms" % (len(found), (time.perf_counter() - began) * 1000))
@@ -0,0 +1,332 @@
+# Description:  A compact binary file of finished games. Each move takes two bytes, the from and to square numbers,
+#               and every few moves a copy of the position is stored so a position in the middle of a game can be
+#               found by replaying only the moves since the last copy. A footer lists where each game starts, so a
+#               reader can go straight to any game through mmap without reading the games before it.
+#
+#               File layout, all numbers little endian:
+#                   header:     "JGRC", version (2 bytes), checkpoint interval (2 bytes)
+#                   each game:  number of moves (4 bytes), number of checkpoints (2 bytes), 2 unused bytes,
+#                               offset of each checkpoint from the start of the game (4 bytes each),
+#                               the moves (2 bytes each: from square << 7 | to square),
+#                               the checkpoints (turn, number of pieces, then piece code and square for each piece)
+#                   footer:     start of each game (8 bytes each), number of games (4 bytes),
+#                               start of the footer (8 bytes), "JGIX"
+#
+#               Adding games to a file writes them after its footer and then a new footer listing every game, so the
+#               old footer stays whole until the new one is written. A reader uses the last whole footer in the file,
+#               which after a crash part way through adding games is the one from before.
+
+import mmap
+import os
+import struct
+
+from janggi.engine import JanggiGame
+from janggi.rules import PIECE_CLASSES, square_coords, square_index
+
+MAGIC = b"JGRC"
+FOOTER_MAGIC = b"JGIX"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+GAME_HEADER = struct.Struct("<IHH")
+TRAILER = struct.Struct("<IQ4s")
+PIECE_TYPES = list(PIECE_CLASSES)
+
+
+def encode_move(curr, new):
+    """
+    Description:    Packs a move into two bytes. A pass has the same from and to square.
+    Input(s):       curr:   tuple of (row, column) the piece moves from
+                    new:    tuple of (row, column) the piece moves to
+    """
+
+    return square_index(curr) << 7 | square_index(new)
+
+
+def decode_move(value):
+    """
+    Description:    Unpacks a move packed by encode_move
+    Input(s):       value:  the packed move
+    Output(s):      (current coordinates, new coordinates)
+    """
+
+    return square_coords(value >> 7), square_coords(value & 127)
+
+
+def encode_position(game):
+    """
+    Description:    Packs the position on the board for a checkpoint
+    Input(s):       game:   the JanggiGame to pack
+    """
+
+    turn, placements = game.export_position()
+    data = bytearray([0 if turn == "B" else 1, len(placements)])
+    for player, piece_type, row, column in placements:
+        data.append((0 if player == "B" else 8) | PIECE_TYPES.index(piece_type))
+        data.append(square_index((row, column)))
+    return bytes(data)
+
+
+def decode_position(data, offset):
+    """
+    Description:    Unpacks a checkpoint packed by encode_position
+    Input(s):       data:   the bytes, or mmap, holding the checkpoint
+                    offset: where the checkpoint starts
+    Output(s):      (turn, list of (player, piece type, row, column)) ready for JanggiGame.load_position
+    """
+
+    turn = "B" if data[offset] == 0 else "R"
+    placements = []
+    for i in range(data[offset + 1]):
+        code = data[offset + 2 + 2 * i]
+        row, column = square_coords(data[offset + 3 + 2 * i])
+        placements.append(("R" if code & 8 else "B", PIECE_TYPES[code & 7], row, column))
+    return turn, placements
+
+
+def find_trailer(data):
+    """
+    Description:    Finds the last whole footer in a record file. Looks back from the end for the footer magic and
+                    takes the first one whose footer fits exactly in front of it.
+    Input(s):       data:   the bytes, or mmap, of the file
+    Output(s):      (number of games, start of the footer, end of the footer), None if there is no whole footer
+    """
+
+    limit = len(data)
+    while True:
+        found = data.rfind(FOOTER_MAGIC, HEADER.size, limit)
+        end = found + len(FOOTER_MAGIC)
+        if found < 0 or end - TRAILER.size < HEADER.size:
+            return None
+        count, footer, magic = TRAILER.unpack_from(data, end - TRAILER.size)
+        if HEADER.size <= footer and footer + 8 * count + TRAILER.size == end:
+            return count, footer, end
+        limit = end - 1
+
+
+class RecordWriter:
+    """
+    Description:    Writes games to a record file. Opening an existing file adds the new games after the ones
+                    already in it, leaving its footer in place until close writes the new one.
+    """
+
+    def __init__(self, path, checkpoint_interval=16):
+        """
+        Description:    Opens the file for writing.
+        Input(s):       path:                   the record file
+                        checkpoint_interval:    moves between stored positions, ignored if the file already exists
+        """
+
+        self._offsets = []
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with RecordReader(path) as reader:
+                self._offsets = list(reader.get_offsets())
+                self._interval = reader.get_checkpoint_interval()
+                end = reader.get_end()
+            self._file = open(path, "r+b")
+            self._file.seek(end)
+            self._file.truncate()           # only cuts off what a crashed writer left after the last footer
+        else:
+            self._interval = checkpoint_interval
+            self._file = open(path, "wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION, checkpoint_interval))
+
+    def add_game(self, moves, start=None):
+        """
+        Description:    Adds a game to the file. The moves are replayed without checking them, so they should come
+                        from a game played through make_move.
+        Input(s):       moves:  list of (current coordinates, new coordinates) tuples, or of algebraic pairs such
+                                as ("c7", "c6")
+                        start:  the JanggiGame the game started from, None for a new game
+        Output(s):      the number of the game in the file
+        """
+
+        game = JanggiGame() if start is None else start.fork()
+        coords = []
+        for curr, new in moves:
+            if isinstance(curr, str):
+                curr, new = game.convert_coords(curr), game.convert_coords(new)
+            coords.append((curr, new))
+
+        checkpoints = [encode_position(game)]
+        packed = []
+        for ply, (curr, new) in enumerate(coords):
+            packed.append(encode_move(curr, new))
+            game.do_move(curr, new)
+            if (ply + 1) % self._interval == 0 and ply + 1 < len(coords):
+                checkpoints.append(encode_position(game))
+
+        offsets = []
+        position = GAME_HEADER.size + 4 * len(checkpoints) + 2 * len(packed)
+        for checkpoint in checkpoints:
+            offsets.append(position)
+            position += len(checkpoint)
+
+        self._offsets.append(self._file.tell())
+        self._file.write(GAME_HEADER.pack(len(packed), len(checkpoints), 0))
+        self._file.write(struct.pack("<%dI" % len(offsets), *offsets))
+        self._file.write(struct.pack("<%dH" % len(packed), *packed))
+        for checkpoint in checkpoints:
+            self._file.write(checkpoint)
+        return len(self._offsets) - 1
+
+    def close(self):
+        """
+        Description:    Writes the footer and closes the file. The games are flushed to disk first, so the new
+                        footer never reaches the disk ahead of the games it lists.
+        """
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        start = self._file.tell()
+        self._file.write(struct.pack("<%dQ" % len(self._offsets), *self._offsets))
+        self._file.write(TRAILER.pack(len(self._offsets), start, FOOTER_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RecordReader:
+    """
+    Description:    Reads games from a record file through mmap. Only the footer is read when the file is opened.
+    """
+
+    def __init__(self, path):
+        """
+        Description:    Opens the file and reads the footer.
+        Input(s):       path:   the record file
+        """
+
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._interval = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a Janggi record file: " + str(path))
+        if version != VERSION:
+            raise ValueError("unsupported record version: " + str(version))
+        trailer = find_trailer(self._data)
+        if trailer is None:
+            raise ValueError("record file has no footer, it was not closed: " + str(path))
+        count, self._footer, self._end = trailer
+        self._offsets = struct.unpack_from("<%dQ" % count, self._data, self._footer)
+
+    def get_checkpoint_interval(self):
+        """
+        Description:    Returns the number of moves between stored positions
+        """
+
+        return self._interval
+
+    def get_offsets(self):
+        """
+        Description:    Returns where each game starts in the file
+        """
+
+        return self._offsets
+
+    def get_footer_offset(self):
+        """
+        Description:    Returns where the footer starts
+        """
+
+        return self._footer
+
+    def get_end(self):
+        """
+        Description:    Returns where the footer ends. Anything after it was left by a writer that did not close.
+        """
+
+        return self._end
+
+    def game_count(self):
+        """
+        Description:    Returns the number of games in the file
+        """
+
+        return len(self._offsets)
+
+    def game_length(self, game_number):
+        """
+        Description:    Returns the number of moves in a game
+        Input(s):       game_number:    the number of the game, starting at 0
+        """
+
+        return GAME_HEADER.unpack_from(self._data, self._offsets[game_number])[0]
+
+    def game_moves(self, game_number):
+        """
+        Description:    Returns the moves of a game
+        Input(s):       game_number:    the number of the game, starting at 0
+        Output(s):      list of (current coordinates, new coordinates) tuples
+        """
+
+        start = self._offsets[game_number]
+        plies, checkpoints, unused = GAME_HEADER.unpack_from(self._data, start)
+        moves_start = start + GAME_HEADER.size + 4 * checkpoints
+        return [decode_move(value) for value in struct.unpack_from("<%dH" % plies, self._data, moves_start)]
+
+    def position(self, game_number, ply):
+        """
+        Description:    Returns the position after ply moves of a game, by loading the nearest stored position and
+                        replaying the moves after it.
+        Input(s):       game_number:    the number of the game, starting at 0
+                        ply:            the number of moves played, 0 for the starting position
+        Output(s):      a JanggiGame set up in the position
+        """
+
+        start = self._offsets[game_number]
+        plies, checkpoints, unused = GAME_HEADER.unpack_from(self._data, start)
+        if ply < 0 or ply > plies:
+            raise IndexError("game " + str(game_number) + " has " + str(plies) + " moves")
+        checkpoint = min(ply // self._interval, checkpoints - 1)
+        offset = struct.unpack_from("<I", self._data, start + GAME_HEADER.size + 4 * checkpoint)[0]
+
+        game = JanggiGame()
+        game.load_position(*decode_position(self._data, start + offset))
+        moves_start = start + GAME_HEADER.size + 4 * checkpoints
+        first = checkpoint * self._interval
+        if ply > first:
+            for value in struct.unpack_from("<%dH" % (ply - first), self._data, moves_start + 2 * first):
+                curr, new = decode_move(value)
+                game.do_move(curr, new)
+        return game
+
+    def close(self):
+        """
+        Description:    Closes the file
+        """
+
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def parse_text_game(line):
+    """
+    Description:    Reads one game from a text move list, a line of squares in pairs such as "c7 c6 c1 d3"
+    Input(s):       line:   the line of text
+    Output(s):      list of (from, to) algebraic pairs
+    """
+
+    squares = line.replace(",", " ").replace("-", " ").split()
+    return list(zip(squares[0::2], squares[1::2]))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        print("usage: python -m janggi.record <text move lists> <record file>")
+        sys.exit(1)
+    with open(sys.argv[1]) as text, RecordWriter(sys.argv[2]) as writer:
+        for text_line in text:
+            if text_line.strip():
+                writer.add_game(parse_text_game(text_line))
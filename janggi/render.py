@@ -0,0 +1,17 @@
+# Description:  Draws the board in a window with game2dboard. Kept apart from the engine so game2dboard is only
+#               imported by programs that draw something.
+
+
+def show_board(game):
+    """
+    Description:    Shows the pieces of a game in a window
+    Input(s):       game:   the JanggiGame to draw
+    """
+
+    from game2dboard import Board
+
+    b = Board(10, 9)  # 10 rows, 9 columns, filled w/ None
+    b.cell_size = 80
+    for item in game.get_board().keys():
+        b[item[0]][item[1]] = game.get_board()[item].get_name()
+    b.show()
@@ -0,0 +1,475 @@
+# Author:       Derek Hand
+# Date:         02/27/2021
+# Description:  The pieces of Janggi and the values and numbering the rest of the package shares. Each piece
+#               class only knows its player, position and moves, the movement rules themselves are in
+#               janggi.engine.
+
+
+class Piece:
+    """
+    Description:    Represents a piece object in the game. It is also the parent class for each piece type.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes a piece object for the given player and position. Called by JanggiGame when
+                        the game is first initialized
+        Input(s):       player: the player who's pieces are being initialized
+                        row:    x-coordinate to place the piece
+                        column: y-coordinate to place the piece
+        """
+
+        self._player = player
+        self._row = row
+        self._column = column
+        self._moves = dict()       # used to track moves available to each piece
+        self._moves_version = None # the position version the moves were worked out for
+
+    def get_row(self):
+        """
+        Description:    Returns the row the piece is in
+        """
+
+        return self._row
+
+    def set_row(self, value):
+        """
+        Description:    Updates the row value the piece is in
+        Input(s):       value:  The new row value
+        """
+
+        self._row = value
+
+    def get_column(self):
+        """
+        Description:    Returns the column the piece is in
+        """
+
+        return self._column
+
+    def set_column(self, value):
+        """
+        Description:    Updates the column value the piece is in
+        Input(s):       value:  the new column value
+        """
+
+        self._column = value
+
+    def get_player(self):
+        """
+        Description:    Returns who belongs the piece at the given location
+        """
+
+        return self._player
+
+    def get_moves(self):
+        """
+        Description:    Returns the pieces available moves
+        """
+
+        return self._moves
+
+    def get_moves_version(self):
+        """
+        Description:    Returns the position version the pieces moves were worked out for
+        """
+
+        return self._moves_version
+
+    def set_moves(self, moves, version=None):
+        """
+        Description:    Updates a pieces available moves
+        Input(s):       moves:      dictionary of the moves
+                        version:    the position version the moves belong to, None if they should not be reused
+        """
+
+        self._moves = moves
+        self._moves_version = version
+
+    def copy(self):
+        """
+        Description:    Returns a new piece of the same type, player, position and moves
+        """
+
+        piece = self.__class__(self._player, self._row, self._column)
+        piece.set_moves(self._moves, self._moves_version)
+        return piece
+
+
+class Soldier(Piece):
+    """
+    Description:    Represents the soldier pieces. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the soldier piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "Soldier"
+        self._type = "soldier"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+class Cannon(Piece):
+    """
+    Description:    Represents the cannon pieces. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the cannon piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "Cannon"
+        self._type = "cannon"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+class Chariot(Piece):
+    """
+    Description:    Represents the chariot pieces. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the chariot piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "Chariot"
+        self._type = "chariot"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+class Elephant(Piece):
+    """
+    Description:    Represents the elephants. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the elephant piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "Elephant"
+        self._type = "elephant"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+class Horse(Piece):
+    """
+    Description:    Represents the horses. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the horse piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "Horse"
+        self._type = "horse"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+class Advisor(Piece):
+    """
+    Description:    Represents the Advisors. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the advisor piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "Advisor"
+        self._type = "advisor"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+class General(Piece):
+    """
+    Description:    Represents the generals. A child class of Piece. Used to make an object for each piece
+                    on the board.
+    """
+
+    def __init__(self, player, row, column):
+        """
+        Description:    Initializes the general piece for a given player using the parent Piece class.
+        Input(s):       player: who to initialize the piece for
+                        row:    what row to initialize the piece in
+                        column: what column to initialize the piece in
+        """
+
+        super().__init__(player, row, column)
+        self._name = str(player) + "General"
+        self._type = "general"
+
+    def get_name(self):
+        """
+        Description:    Returns the name of the piece and who owns it. Will be used for sanity checks
+        """
+
+        return self._name
+
+    def get_type(self):
+        """
+        Description:    Returns what kind of piece it is
+        """
+
+        return self._type
+
+
+PIECE_CLASSES = {"soldier": Soldier, "cannon": Cannon, "chariot": Chariot, "elephant": Elephant,
+                 "horse": Horse, "advisor": Advisor, "general": General}
+
+
+PIECE_VALUES = {"soldier": 20, "cannon": 70, "chariot": 130, "elephant": 30, "horse": 50, "advisor": 30,
+                "general": 0}
+
+# Piece-square values from the red side of the board, row 0 is red's back row. Blue uses the rows flipped.
+PIECE_SQUARE = {
+    "soldier": [[0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [2, 0, 4, 0, 6, 0, 4, 0, 2],
+                [4, 4, 6, 8, 8, 8, 6, 4, 4],
+                [6, 6, 8, 10, 10, 10, 8, 6, 6],
+                [6, 8, 10, 14, 16, 14, 10, 8, 6],
+                [4, 6, 8, 16, 20, 16, 8, 6, 4],
+                [0, 2, 4, 10, 12, 10, 4, 2, 0]],
+    "cannon": [[0, 0, 2, 4, 4, 4, 2, 0, 0],
+               [0, 2, 2, 4, 6, 4, 2, 2, 0],
+               [2, 2, 4, 4, 4, 4, 4, 2, 2],
+               [0, 0, 2, 2, 4, 2, 2, 0, 0],
+               [0, 0, 0, 2, 2, 2, 0, 0, 0],
+               [0, 0, 0, 2, 2, 2, 0, 0, 0],
+               [0, 0, 2, 2, 4, 2, 2, 0, 0],
+               [0, 2, 2, 4, 6, 4, 2, 2, 0],
+               [0, 0, 2, 4, 6, 4, 2, 0, 0],
+               [0, 0, 0, 2, 4, 2, 0, 0, 0]],
+    "chariot": [[-2, 0, 2, 4, 4, 4, 2, 0, -2],
+                [0, 2, 2, 4, 4, 4, 2, 2, 0],
+                [0, 2, 2, 4, 4, 4, 2, 2, 0],
+                [2, 4, 4, 6, 6, 6, 4, 4, 2],
+                [4, 6, 6, 8, 8, 8, 6, 6, 4],
+                [4, 6, 6, 8, 8, 8, 6, 6, 4],
+                [4, 6, 6, 8, 8, 8, 6, 6, 4],
+                [6, 8, 8, 10, 12, 10, 8, 8, 6],
+                [6, 8, 8, 12, 14, 12, 8, 8, 6],
+                [4, 6, 6, 10, 10, 10, 6, 6, 4]],
+    "elephant": [[0, 0, 0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 2, 2, 2, 2, 2, 0, 0],
+                 [0, 2, 4, 4, 6, 4, 4, 2, 0],
+                 [0, 2, 4, 6, 6, 6, 4, 2, 0],
+                 [0, 2, 4, 6, 8, 6, 4, 2, 0],
+                 [0, 2, 4, 6, 8, 6, 4, 2, 0],
+                 [0, 2, 4, 6, 6, 6, 4, 2, 0],
+                 [0, 2, 2, 4, 4, 4, 2, 2, 0],
+                 [0, 0, 2, 2, 2, 2, 2, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0, 0, 0]],
+    "horse": [[-4, -2, 0, 0, 0, 0, 0, -2, -4],
+              [-2, 0, 2, 2, 2, 2, 2, 0, -2],
+              [0, 2, 4, 4, 6, 4, 4, 2, 0],
+              [0, 2, 6, 6, 8, 6, 6, 2, 0],
+              [0, 4, 6, 8, 8, 8, 6, 4, 0],
+              [0, 4, 6, 8, 8, 8, 6, 4, 0],
+              [0, 4, 6, 8, 10, 8, 6, 4, 0],
+              [0, 2, 4, 6, 8, 6, 4, 2, 0],
+              [-2, 0, 2, 4, 4, 4, 2, 0, -2],
+              [-4, -2, 0, 0, 0, 0, 0, -2, -4]],
+    "advisor": [[0, 0, 0, 2, 0, 2, 0, 0, 0],
+                [0, 0, 0, 0, 4, 0, 0, 0, 0],
+                [0, 0, 0, 0, 2, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0]],
+    "general": [[0, 0, 0, -2, -4, -2, 0, 0, 0],
+                [0, 0, 0, 0, 4, 0, 0, 0, 0],
+                [0, 0, 0, -4, -2, -4, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0]],
+}
+
+
+def square_values():
+    """
+    Description:    Adds the material and piece-square value of each piece on each square, with the tables flipped
+                    for blue so both players read them from their own side of the board
+    Output(s):      dictionary of (player, piece type, row, column) to value
+    """
+
+    values = dict()
+    for player in ("B", "R"):
+        for piece_type, table in PIECE_SQUARE.items():
+            for row in range(10):
+                for column in range(9):
+                    table_row = row if player == "R" else 9 - row
+                    values[player, piece_type, row, column] = PIECE_VALUES[piece_type] + table[table_row][column]
+    return values
+
+
+def zobrist_keys(seed):
+    """
+    Description:    Makes a random key for each piece on each square, used to hash positions. The keys come from a
+                    fixed seed so every process gets the same hashes.
+    Input(s):       seed:   the seed for the random numbers
+    Output(s):      (dictionary of (player, piece type, row, column) to key, key for red to move)
+    """
+
+    import random                   # only needed when the tables are built, see janggi.tables
+
+    generator = random.Random(seed)
+    keys = dict()
+    for player in ("B", "R"):
+        for piece_type in PIECE_CLASSES:
+            for row in range(10):
+                for column in range(9):
+                    keys[player, piece_type, row, column] = generator.getrandbits(64)
+    return keys, generator.getrandbits(64)
+
+
+def square_index(coords):
+    """
+    Description:    Numbers the squares of the board from 0 to 89, row by row, in the same order as convert_coords
+    Input(s):       coords: tuple of (row, column)
+    """
+
+    return coords[0] * 9 + coords[1]
+
+
+def square_coords(index):
+    """
+    Description:    Returns the (row, column) of a square number. The reverse of square_index
+    Input(s):       index:  the square number, 0 to 89
+    """
+
+    return divmod(index, 9)
+
+
+def other_player(player):
+    """
+    Description:    Returns the other player
+    Input(s):       player: "B" or "R"
+    """
+
+    if player == "B":
+        return "R"
+    return "B"
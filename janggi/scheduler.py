@@ -0,0 +1,350 @@
+# Description:  A scheduler for analysis jobs in front of the search. Jobs come in priority classes, interactive
+#               before normal before bulk, and each has a depth, a time budget and a node budget. A job is run one
+#               depth of iterative deepening at a time: after each depth it goes back in the queue, so a long bulk
+#               review gives up its worker to a waiting interactive request at the next depth and carries on
+#               afterwards with its moves in the order it left them. Within a class jobs run in the order they
+#               were submitted.
+#
+#               The depths run in a pool of processes, one per available core. Each worker keeps the Search of its
+#               last few jobs, so a job that comes back to the same worker still has its transposition table,
+#               killer moves and history. On another worker those start over, but the root moves keep their order.
+#
+#               stats() reports how many jobs of each class are waiting and running, and percentiles of the time
+#               from submitting a job to its result. A depth that raises in its worker stops its job, and the
+#               exception is raised again by Job.wait and Job.get_result.
+
+import collections
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from janggi.engine import JanggiGame
+from janggi.search import Search
+
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+CLASS_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BULK: "bulk"}
+
+WORKER_SEARCHES = collections.OrderedDict()     # job id to (game, Search), kept in each worker process
+WORKER_SEARCH_LIMIT = 4
+
+
+def available_cores():
+    """
+    Description:    Returns the number of cores this process may run on
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run_depth(job_id, position, history, depth, root_moves, time_limit, node_limit):
+    """
+    Description:    Runs in a worker process. Searches one depth of a job.
+    Input(s):       job_id:     the id of the job, to find its Search if this worker ran it before
+                    position:   the position, as returned by JanggiGame.export_position
+                    history:    the position hashes of the game so far
+                    depth:      the depth to search
+                    root_moves: the root moves, best first, None to search every legal move
+                    time_limit: seconds the depth may take, None for no limit
+                    node_limit: positions the depth may search, None for no limit
+    Output(s):      (best move, score, principal variation, depth reached, positions searched, root moves in the
+                    order to search them at the next depth)
+    """
+
+    game, search = WORKER_SEARCHES.pop(job_id, (None, None))
+    if search is None:
+        game = JanggiGame()
+        game.load_position(*position)
+        game.set_history(history)
+        search = Search(game)
+    WORKER_SEARCHES[job_id] = (game, search)
+    while len(WORKER_SEARCHES) > WORKER_SEARCH_LIMIT:
+        WORKER_SEARCHES.popitem(last=False)
+
+    if root_moves is None:
+        root_moves = search.get_ordering().order(game, game.legal_moves(), 0)
+    start = search.get_nodes()
+    move, score, pv, reached = search.search(depth, time_limit, root_moves, min_depth=depth,
+                                             node_limit=None if node_limit is None else start + node_limit)
+    return move, score, pv, reached, search.get_nodes() - start, search.get_root_order()
+
+
+class Job:
+    """
+    Description:    An analysis job and, once it has run, its result
+    """
+
+    def __init__(self, game, max_depth, priority=NORMAL, time_budget=None, node_budget=None):
+        """
+        Description:    Describes the job. The position of the game is copied, so the game can change afterwards.
+        Input(s):       game:           the JanggiGame to analyse
+                        max_depth:      the deepest search to run
+                        priority:       INTERACTIVE, NORMAL or BULK
+                        time_budget:    seconds of search the job may use, None for no limit
+                        node_budget:    positions the job may search, None for no limit. The search checks
+                                        it every 64 positions, so it can go that much over
+        """
+
+        self._position = game.export_position()
+        self._history = list(game.get_history())
+        self._max_depth = max_depth
+        self._priority = priority
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._root_moves = None
+        self._depth = 0
+        self._result = (None, None, [], 0)
+        self._error = None
+        self._nodes = 0
+        self._searched = 0.0
+        self._submitted = None
+        self._started = None
+        self._finished = None
+        self._done = threading.Event()
+
+    def get_priority(self):
+        """
+        Description:    Returns the priority class of the job
+        """
+
+        return self._priority
+
+    def get_result(self):
+        """
+        Description:    Returns (best move, score, principal variation, depth reached) of the deepest depth finished.
+                        Raises the exception a depth of the job raised in its worker, if one did.
+        """
+
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def get_error(self):
+        """
+        Description:    Returns the exception that stopped the job, None if it did not fail
+        """
+
+        return self._error
+
+    def get_nodes(self):
+        """
+        Description:    Returns how many positions the job has searched
+        """
+
+        return self._nodes
+
+    def get_latency(self):
+        """
+        Description:    Returns the seconds from submitting the job to its result, None if it is not done
+        """
+
+        if self._finished is None:
+            return None
+        return self._finished - self._submitted
+
+    def get_wait(self):
+        """
+        Description:    Returns the seconds from submitting the job to its first depth starting
+        """
+
+        if self._started is None:
+            return None
+        return self._started - self._submitted
+
+    def is_done(self):
+        """
+        Description:    Returns True once the job has its result
+        """
+
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Description:    Waits for the job to finish
+        Output(s):      the result, as get_result. Raises the exception of the job if it failed.
+        """
+
+        self._done.wait(timeout)
+        return self.get_result()
+
+    def remaining_time(self):
+        """
+        Description:    Returns the seconds of the time budget left, None if there is no time budget
+        """
+
+        if self._time_budget is None:
+            return None
+        return max(0.0, self._time_budget - self._searched)
+
+    def remaining_nodes(self):
+        """
+        Description:    Returns the positions of the node budget left, None if there is no node budget
+        """
+
+        if self._node_budget is None:
+            return None
+        return max(0, self._node_budget - self._nodes)
+
+    def finished(self):
+        """
+        Description:    Checks if the job has nothing left to search: it reached its depth, ran out of budget or
+                        has no moves
+        """
+
+        return self._depth >= self._max_depth or self.remaining_time() == 0 or self.remaining_nodes() == 0 or \
+            (self._root_moves is not None and len(self._root_moves) == 0)
+
+
+class Scheduler:
+    """
+    Description:    Runs analysis jobs on a pool of worker processes, highest priority class first, one depth at a
+                    time.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Description:    Starts the worker processes
+        Input(s):       workers:    number of processes, defaults to the number of available cores
+        """
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._workers = workers or available_cores()
+        self._pool = ProcessPoolExecutor(self._workers)
+        self._lock = threading.RLock()          # a depth that is already done runs its callback in submit
+        self._queue = []                # heap of (priority, submission number, job id)
+        self._jobs = dict()
+        self._running = collections.Counter()
+        self._latencies = collections.defaultdict(list)
+        self._ids = itertools.count()
+        self._closed = False
+
+    def get_workers(self):
+        """
+        Description:    Returns the number of worker processes
+        """
+
+        return self._workers
+
+    def submit(self, job):
+        """
+        Description:    Queues a job
+        Output(s):      the job, to wait on
+        """
+
+        with self._lock:
+            job_id = next(self._ids)
+            job._submitted = time.perf_counter()
+            self._jobs[job_id] = job
+            heapq.heappush(self._queue, (job.get_priority(), job_id, job_id))
+            self.dispatch()
+        return job
+
+    def dispatch(self):
+        """
+        Description:    Starts the next depth of the highest priority jobs on any free workers. Called with the lock
+                        held.
+        """
+
+        while not self._closed and self._queue and sum(self._running.values()) < self._workers:
+            priority, order, job_id = heapq.heappop(self._queue)
+            job = self._jobs[job_id]
+            if job._started is None:
+                job._started = time.perf_counter()
+            self._running[priority] += 1
+            future = self._pool.submit(run_depth, job_id, job._position, job._history, job._depth + 1,
+                                       job._root_moves, job.remaining_time(), job.remaining_nodes())
+            future.add_done_callback(lambda future, job_id=job_id, started=time.perf_counter():
+                                     self.depth_done(job_id, started, future))
+
+    def depth_done(self, job_id, started, future):
+        """
+        Description:    Takes the result of a depth and either finishes the job or puts it back in the queue. A depth
+                        that raised finishes the job with the exception kept on it, for wait and get_result to raise.
+        """
+
+        from concurrent.futures import CancelledError
+
+        with self._lock:
+            job = self._jobs[job_id]
+            self._running[job.get_priority()] -= 1
+            job._searched += time.perf_counter() - started
+            error = CancelledError() if future.cancelled() else future.exception()
+            job._error = error
+            if error is None:
+                move, score, pv, reached, nodes, root_moves = future.result()
+                job._nodes += nodes
+                job._root_moves = root_moves
+                if reached > 0:
+                    job._result = (move, score, pv, reached)
+                    job._depth = reached
+                else:
+                    job._depth = job._max_depth         # the budget ran out part way through the depth
+            if error is not None or job.finished() or self._closed:
+                self.finish(job_id)
+            else:
+                heapq.heappush(self._queue, (job.get_priority(), job_id, job_id))
+            self.dispatch()
+
+    def finish(self, job_id):
+        """
+        Description:    Hands a job its result and forgets it. Called with the lock held.
+        """
+
+        job = self._jobs.pop(job_id)
+        job._finished = time.perf_counter()
+        self._latencies[job.get_priority()].append(job.get_latency())
+        job._done.set()
+
+    def stats(self):
+        """
+        Description:    Reports on each priority class
+        Output(s):      dictionary of class name to a dictionary with "queued", "running", "done" and the 50th, 90th
+                        and 99th percentile of the latency of the finished jobs in seconds ("p50", "p90", "p99")
+        """
+
+        with self._lock:
+            queued = collections.Counter(priority for priority, order, job_id in self._queue)
+            report = dict()
+            for priority, name in CLASS_NAMES.items():
+                latencies = sorted(self._latencies[priority])
+                report[name] = {"queued": queued[priority], "running": self._running[priority],
+                                "done": len(latencies)}
+                for percentile in (50, 90, 99):
+                    report[name]["p%d" % percentile] = percentile_of(latencies, percentile)
+            return report
+
+    def close(self):
+        """
+        Description:    Shuts down the worker processes once the depths already running finish. Queued jobs are
+                        finished with the deepest result they have.
+        """
+
+        with self._lock:
+            self._closed = True
+            for priority, order, job_id in self._queue:
+                self.finish(job_id)
+            self._queue = []
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def percentile_of(values, percentile):
+    """
+    Description:    Returns the nearest rank percentile of sorted values, None if there are none
+    """
+
+    if len(values) == 0:
+        return None
+    rank = max(1, -(-len(values) * percentile // 100))
+    return values[rank - 1]
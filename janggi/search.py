@@ -0,0 +1,545 @@
+# Description:  Alpha-beta search for Janggi, built on the move generation of JanggiGame. A single search runs
+#               iterative deepening with a transposition table, and at the end of the depth keeps searching
+#               captures until the position is quiet, so an exchange is not scored halfway through. The parallel
+#               search splits the root moves across a pool of processes, each searching its share of the moves,
+#               and merges their results into one best move and principal variation.
+
+import os
+import time
+
+from janggi.engine import JanggiGame
+from janggi.exchange import static_exchange
+from janggi.ordering import MoveOrdering
+
+MATE = 100000
+EXACT = 0
+LOWER = 1
+UPPER = 2
+CHECK_MASK = 63             # the time and node limits are checked when the node count has these bits clear
+
+
+def evaluate(game):
+    """
+    Description:    Scores the position for the player to move with the running scores of the game
+    Input(s):       game:   the JanggiGame to score
+    """
+
+    return game.evaluate()
+
+
+class SearchTimeout(Exception):
+    """
+    Description:    Raised inside the search when the time or node limit runs out, or it is told to stop
+    """
+
+
+class Search:
+    """
+    Description:    Negamax alpha-beta search with iterative deepening and a transposition table keyed by the
+                    zobrist hash of the game. The moves of each position are sorted by a MoveOrdering.
+    """
+
+    def __init__(self, game, evaluate=evaluate, ordering=None, quiescence=True, stop=None):
+        """
+        Description:    Initializes the search for a game. The game is changed during the search with do_move and
+                        undo_move, and is back in its starting position when the search returns.
+        Input(s):       game:       the JanggiGame to search
+                        evaluate:   function that scores a game for the player to move
+                        ordering:   the MoveOrdering to sort moves with, defaults to one with every heuristic
+                        quiescence: search captures past the end of the depth, False to score the position there
+                        stop:       an Event, from threading or multiprocessing, that stops the search when set
+        """
+
+        self._game = game
+        self._evaluate = evaluate
+        self._ordering = ordering if ordering is not None else MoveOrdering()
+        self._quiescence = quiescence
+        self._table = dict()
+        self._nodes = 0
+        self._quiescence_nodes = 0
+        self._deadline = None
+        self._soft_deadline = None
+        self._node_limit = None
+        self._root_order = []
+        self._stop = stop
+
+    def get_nodes(self):
+        """
+        Description:    Returns how many positions have been searched
+        """
+
+        return self._nodes
+
+    def get_quiescence_nodes(self):
+        """
+        Description:    Returns how many of the positions searched were in the quiescence search, counting the
+                        positions where the depth ran out
+        """
+
+        return self._quiescence_nodes
+
+    def get_ordering(self):
+        """
+        Description:    Returns the move ordering
+        """
+
+        return self._ordering
+
+    def get_table(self):
+        """
+        Description:    Returns the transposition table
+        """
+
+        return self._table
+
+    def get_root_order(self):
+        """
+        Description:    Returns the root moves of the last search, best first as of the deepest depth it finished
+        """
+
+        return self._root_order
+
+    def search(self, max_depth, time_limit=None, root_moves=None, min_depth=1, node_limit=None, soft_limit=None):
+        """
+        Description:    Searches deeper and deeper until max_depth is reached or the time runs out. The result of
+                        the last depth that finished is returned.
+        Input(s):       max_depth:  the deepest search to run, in plies
+                        time_limit: seconds to search for, None for no limit. A depth still running then is
+                                    thrown away
+                        root_moves: only search these moves from the root, None for all legal moves
+                        min_depth:  the first depth to search, to carry on a search that already reached
+                                    min_depth - 1 with root_moves in the order it left them. Past depth 1 the
+                                    killer moves and history of that search are kept
+                        node_limit: stop once get_nodes passes this, None for no limit
+                        soft_limit: seconds after which no new depth is started, None for no limit
+        Output(s):      (best move, score, principal variation, depth reached)
+        """
+
+        self.set_limits(time_limit, soft_limit)
+        self._node_limit = node_limit
+        if min_depth <= 1:
+            self._ordering.new_search()
+        if root_moves is None:
+            root_moves = self._ordering.order(self._game, self._game.legal_moves(), 0)
+        self._root_order = list(root_moves)
+        result = (None, self._evaluate(self._game), [], 0)
+        for depth in range(min_depth, max_depth + 1):
+            try:
+                scores = self.search_root(depth, root_moves)
+            except SearchTimeout:
+                break
+            if len(scores) == 0:
+                break
+            score, move, pv, bound = scores[0]
+            result = (move, score, pv, depth)
+            root_moves = [item[1] for item in scores]      # best moves first at the next depth
+            self._root_order = root_moves
+            if self._soft_deadline is not None and time.perf_counter() > self._soft_deadline:
+                break
+        self._deadline = None
+        self._soft_deadline = None
+        self._node_limit = None
+        return result
+
+    def set_limits(self, time_limit=None, soft_limit=None):
+        """
+        Description:    Sets the time limits of the search, counted from now. Can be called from another thread
+                        while the search runs, to give a search that was started without limits a deadline. A limit
+                        that is None is left as it was.
+        Input(s):       time_limit: seconds until the search stops, throwing away the depth it is on
+                        soft_limit: seconds after which no new depth is started
+        """
+
+        if time_limit is not None:
+            self._deadline = time.perf_counter() + time_limit
+        if soft_limit is not None:
+            self._soft_deadline = time.perf_counter() + soft_limit
+
+    def stop(self):
+        """
+        Description:    Makes a running search stop within the next 64 positions. Can be called from another
+                        thread.
+        """
+
+        self._deadline = time.perf_counter()
+
+    def search_root(self, depth, root_moves, shared=None):
+        """
+        Description:    Searches each root move with a window from the best score so far. A move that can't beat it
+                        gets an upper bound instead of its exact score, which is enough to rank it below the best.
+                        A bound can tie the best score, so each result says which it is, and a tie goes to the
+                        exact score.
+        Input(s):       depth:      the depth to search, in plies
+                        root_moves: the moves to search
+                        shared:     a multiprocessing Value holding the best score any worker has found at this
+                                    depth, read before each move and raised after it. None when searching alone
+        Output(s):      list of (score, move, principal variation, EXACT or UPPER), best first
+        """
+
+        scores = []
+        alpha = -MATE - 1
+        for curr, new in root_moves:
+            if shared is not None:
+                alpha = max(alpha, shared.value)
+            captured = self._game.do_move(curr, new)
+            score = -self.negamax(depth - 1, -MATE - 1, -alpha, 1)
+            pv = [(curr, new)] + self.principal_variation(depth - 1)
+            self._game.undo_move(curr, new, captured)
+            scores.append((score, (curr, new), pv, EXACT if score > alpha else UPPER))
+            alpha = max(alpha, score)
+            if shared is not None and score > shared.value:
+                with shared.get_lock():
+                    shared.value = max(shared.value, score)
+        scores.sort(key=lambda item: (-item[0], item[3]))
+        return scores
+
+    def check_limits(self):
+        """
+        Description:    Raises SearchTimeout if the time or the node limit has run out or the stop event is set.
+                        Called every 64 positions.
+        """
+
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise SearchTimeout()
+        if self._stop is not None and self._stop.is_set():
+            raise SearchTimeout()
+
+    def negamax(self, depth, alpha, beta, ply):
+        """
+        Description:    Scores the position for the player to move, searching depth plies ahead
+        Input(s):       depth:  plies left to search
+                        alpha:  the score the player to move is already sure of
+                        beta:   the score the other player is already sure of
+                        ply:    how far from the root the position is
+        """
+
+        if depth <= 0 and self._quiescence:
+            return self.quiescence(alpha, beta, ply)
+        self._nodes += 1
+        if self._nodes & CHECK_MASK == 0:
+            self.check_limits()
+
+        game = self._game
+        if game.repetition_count() > 1:     # a repeated position is scored as a draw
+            return 0
+        key = game.get_hash()
+        entry = self._table.get(key)
+        best_move = None
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, best_move = entry
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER and entry_score <= alpha:
+                    return entry_score
+
+        if depth <= 0:
+            return self._evaluate(game)
+
+        moves = game.legal_moves()
+        if len(moves) == 0:
+            if game.general_attacked(game.get_turn()):
+                return -MATE + ply
+            return self._evaluate(game)
+        moves = self._ordering.order(game, moves, ply, best_move)
+
+        original_alpha = alpha
+        best_score = -MATE - 1
+        for curr, new in moves:
+            captured = game.do_move(curr, new)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            game.undo_move(curr, new, captured)
+            if score > best_score:
+                best_score = score
+                best_move = (curr, new)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._ordering.cutoff(game, (curr, new), depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._table[key] = (depth, best_score, flag, best_move)
+        return best_score
+
+    def quiescence(self, alpha, beta, ply):
+        """
+        Description:    Scores the position for the player to move once only captures are left to look at. The
+                        player can stand on the score of the position instead of capturing, unless their general
+                        is attacked, in which case every legal move is searched. Captures that lose material in a
+                        static exchange are skipped, they can't raise the score above standing.
+        Input(s):       alpha:  the score the player to move is already sure of
+                        beta:   the score the other player is already sure of
+                        ply:    how far from the root the position is
+        """
+
+        self._nodes += 1
+        self._quiescence_nodes += 1
+        if self._nodes & CHECK_MASK == 0:
+            self.check_limits()
+
+        game = self._game
+        if game.repetition_count() > 1:
+            return 0
+        player = game.get_turn()
+        if game.general_attacked(player):
+            moves = game.legal_moves()
+            if len(moves) == 0:
+                return -MATE + ply
+            best_score = -MATE - 1
+        else:
+            best_score = self._evaluate(game)
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            moves = []
+            for curr, new, target in list(game.iter_moves(player, quiets=False)):
+                if static_exchange(game, curr, new) < 0:
+                    continue
+                captured = game.do_move(curr, new)
+                if not game.general_attacked(player):
+                    moves.append((curr, new))
+                game.undo_move(curr, new, captured)
+
+        for curr, new in self._ordering.order(game, moves, ply):
+            captured = game.do_move(curr, new)
+            score = -self.quiescence(-beta, -alpha, ply + 1)
+            game.undo_move(curr, new, captured)
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best_score
+
+    def principal_variation(self, depth):
+        """
+        Description:    Follows the best moves stored in the transposition table from the current position
+        Input(s):       depth:  the most moves to follow
+        """
+
+        pv = []
+        undo = []
+        seen = set()
+        while len(pv) < depth:
+            entry = self._table.get(self._game.get_hash())
+            if entry is None or entry[3] is None or self._game.get_hash() in seen:
+                break
+            seen.add(self._game.get_hash())
+            curr, new = entry[3]
+            if curr not in self._game.get_board():
+                break
+            undo.append((curr, new, self._game.do_move(curr, new)))
+            pv.append((curr, new))
+        for curr, new, captured in reversed(undo):
+            self._game.undo_move(curr, new, captured)
+        return pv
+
+
+def search_worker(connection, stop, shared):
+    """
+    Description:    Runs in a worker process of ParallelSearch. Keeps one Search, and so one transposition table and
+                    move ordering, for the whole of a search, and searches its share of the root moves at each depth
+                    it is sent.
+    Input(s):       connection: the worker's end of a Pipe. Messages are ("position", position, history),
+                                ("depth", depth, moves, seconds left or None) and ("close",)
+                    stop:       the Event that stops the search when set
+                    shared:     the Value holding the best root score found at the current depth
+    """
+
+    search = None
+    while True:
+        message = connection.recv()
+        if message[0] == "close":
+            return
+        if message[0] == "position":
+            game = JanggiGame()
+            game.load_position(*message[1])
+            game.set_history(message[2])
+            search = Search(game, stop=stop)
+            search.get_ordering().new_search()
+        else:
+            depth, moves, remaining = message[1:]
+            nodes = search.get_nodes()
+            search.set_limits(remaining)
+            try:
+                scores = search.search_root(depth, moves, shared)
+            except SearchTimeout:
+                scores = None
+            search._deadline = None
+            connection.send((scores, search.get_nodes() - nodes))
+
+
+class ParallelSearch:
+    """
+    Description:    Splits the root moves of a position across worker processes. Each worker is given its share of
+                    the moves once, best first, and keeps it for every depth so its transposition table carries
+                    over. At each depth the workers share the best score found so far, so a move in one worker is
+                    searched with the bound another worker already proved, the way the serial search passes it from
+                    one root move to the next.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Description:    Starts the worker processes.
+        Input(s):       workers:    number of processes, defaults to the number of cores
+        """
+
+        import multiprocessing
+
+        self._workers = workers or os.cpu_count() or 1
+        self._stop = multiprocessing.Event()
+        self._shared = multiprocessing.Value("i", 0)
+        self._connections = []
+        self._processes = []
+        for _ in range(self._workers):
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=search_worker, args=(child, self._stop, self._shared),
+                                              daemon=True)
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+        self._nodes = 0
+
+    def get_workers(self):
+        """
+        Description:    Returns the number of worker processes
+        """
+
+        return self._workers
+
+    def get_nodes(self):
+        """
+        Description:    Returns how many positions the workers searched in the last search
+        """
+
+        return self._nodes
+
+    def stop(self):
+        """
+        Description:    Makes the workers give up the depth they are on within the next 64 positions
+        """
+
+        self._stop.set()
+
+    def close(self):
+        """
+        Description:    Stops the worker processes
+        """
+
+        self.stop()
+        for connection, process in zip(self._connections, self._processes):
+            connection.send(("close",))
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def search(self, game, max_depth, time_limit=None):
+        """
+        Description:    Searches the position of the game with every worker.
+        Input(s):       game:       the JanggiGame to search. It is not changed
+                        max_depth:  the deepest search to run, in plies
+                        time_limit: seconds to search for. A depth that does not finish in time is thrown away
+        Output(s):      (best move, score, principal variation, depth reached)
+        """
+
+        start = time.perf_counter()
+        self._stop.clear()
+        self._nodes = 0
+        position = game.export_position()
+        for connection in self._connections:
+            connection.send(("position", position, game.get_history()))
+
+        root_moves = MoveOrdering().order(game, game.legal_moves(), 0)
+        shares = [root_moves[i::self._workers] for i in range(self._workers)]
+        result = (None, game.evaluate(), [], 0)
+        for depth in range(1, max_depth + 1):
+            if len(root_moves) == 0:
+                break
+            remaining = None
+            if time_limit is not None:
+                remaining = time_limit - (time.perf_counter() - start)
+                if remaining <= 0:
+                    break
+            self._shared.value = -MATE - 1
+            busy = [connection for connection, share in zip(self._connections, shares) if share]
+            for connection, share in zip(busy, [share for share in shares if share]):
+                connection.send(("depth", depth, share, remaining))
+
+            scores = []
+            finished = True
+            for connection in busy:
+                wait = None if remaining is None else max(0.0, time_limit - (time.perf_counter() - start)) + 1.0
+                if not connection.poll(wait):
+                    self._stop.set()        # a worker missed its own deadline, stop it from here
+                share_scores, nodes = connection.recv()
+                self._nodes += nodes
+                if share_scores is None:
+                    finished = False
+                else:
+                    scores.extend(share_scores)
+            if not finished:
+                break
+
+            scores = self.merge(scores, root_moves, shares, depth, start, time_limit)
+            if scores is None:
+                break
+            score, move, pv, bound = scores[0]
+            result = (move, score, pv, depth)
+            rank = {item[1]: number for number, item in enumerate(scores)}
+            shares = [sorted(share, key=rank.get) for share in shares]     # same moves, best first
+            root_moves = [item[1] for item in scores]
+        return result
+
+    def merge(self, scores, root_moves, shares, depth, start, time_limit):
+        """
+        Description:    Puts the results of the workers in one list, best first. A move that failed low against the
+                        bound of another worker has an upper bound that can tie the best score, so ties go to the
+                        exact score and then to the move first in root_moves. A bound that ties the best score on a
+                        move before it is searched again with a full window by the worker that has the move, so the
+                        same move wins as in the serial search.
+        Input(s):       scores:     the (score, move, principal variation, EXACT or UPPER) of every worker
+                        root_moves: the moves in the order they were searched at this depth
+                        shares:     the moves of each worker
+                        depth:      the depth searched
+                        start:      when the search started, for time_limit
+                        time_limit: seconds for the whole search, None for no limit
+        Output(s):      the merged list, None if the search ran out of time
+        """
+
+        order = {move: number for number, move in enumerate(root_moves)}
+        scores.sort(key=lambda item: (-item[0], item[3], order[item[1]]))
+        best = scores[0]
+        ties = [item for item in scores if item[0] == best[0] and item[3] != EXACT and order[item[1]] < order[best[1]]]
+        for item in ties:
+            remaining = None
+            if time_limit is not None:
+                remaining = time_limit - (time.perf_counter() - start)
+                if remaining <= 0:
+                    return None
+            worker = [number for number, share in enumerate(shares) if item[1] in share][0]
+            self._shared.value = -MATE - 1
+            self._connections[worker].send(("depth", depth, [item[1]], remaining))
+            again, nodes = self._connections[worker].recv()
+            self._nodes += nodes
+            if again is None:
+                return None
+            scores[scores.index(item)] = again[0]
+        scores.sort(key=lambda item: (-item[0], item[3], order[item[1]]))
+        return scores
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,488 @@
+# Description:  Endgame tablebases for Janggi. Positions with both generals and a few other pieces are solved with
+#               retrograde analysis, using the same piece movement rules as JanggiGame. Every position gets a
+#               win/draw/loss result and the distance to mate in plies, which are stored in a compact binary file
+#               so search and analysis can look them up by index.
+#
+#               Tables go up to MAX_PIECES pieces besides the generals. Each piece multiplies the table by up to
+#               90 squares, so a third piece means billions of positions: more than the 32-bit sizes
+#               of the file can hold, and hours of pure Python to solve. Larger signatures raise ValueError.
+
+import array
+import heapq
+import os
+import struct
+import sys
+
+from janggi.bitboard import (BitBoard, ELEPHANT_FROM, HORSE_FROM, PALACE_FROM, SOLDIER_FROM, cannon_attacks,
+                             chariot_attacks, to_squares)
+from janggi.rules import other_player, square_coords, square_index
+
+INVALID = 0
+DRAW = 1
+WIN = 2
+LOSS = 3
+
+MAX_PIECES = 2              # pieces besides the generals, see the header
+MAGIC = b"JGTB"
+VERSION = 1
+PIECE_TYPES = ["soldier", "cannon", "chariot", "elephant", "horse", "advisor", "general"]
+PALACE = {"R": [(row, col) for row in range(0, 3) for col in range(3, 6)],
+          "B": [(row, col) for row in range(7, 10) for col in range(3, 6)]}
+
+
+def material_signature(game):
+    """
+    Description:    Returns the pieces on the board, other than the generals, in the order the tablebases use
+    Input(s):       game:   the JanggiGame to look at
+    Output(s):      sorted tuple of (player, piece type) tuples
+    """
+
+    signature = []
+    for piece in game.get_board().values():
+        if piece.get_type() != "general":
+            signature.append((piece.get_player(), piece.get_type()))
+    return tuple(sorted(signature))
+
+
+def signature_name(signature):
+    """
+    Description:    Returns the file name used for a tablebase, for example "RChariot" or "BAdvisor_RChariot"
+    Input(s):       signature:  sorted tuple of (player, piece type) tuples
+    """
+
+    if len(signature) == 0:
+        return "generals"
+    return "_".join(player + piece_type.capitalize() for player, piece_type in signature)
+
+
+def piece_squares(player, piece_type):
+    """
+    Description:    Returns the squares a piece can stand on. Advisors and generals never leave their palace and
+                    soldiers never move backwards, so they get fewer squares, which keeps the tables small.
+    Input(s):       player:     "B" or "R"
+                    piece_type: the type of the piece
+    """
+
+    if piece_type in ("advisor", "general"):
+        return PALACE[player]
+    if piece_type == "soldier" and player == "R":
+        return [(row, col) for row in range(3, 10) for col in range(9)]
+    if piece_type == "soldier" and player == "B":
+        return [(row, col) for row in range(0, 7) for col in range(9)]
+    return [(row, col) for row in range(10) for col in range(9)]
+
+
+class Tablebase:
+    """
+    Description:    The results for every position of one material signature. Positions are numbered with a mixed
+                    radix index of whose turn it is, the square of each general and the square of each other piece,
+                    so a probe is a handful of multiplications and one array lookup.
+    """
+
+    def __init__(self, signature, values=None):
+        """
+        Description:    Sets up the index for the signature. values is None until the table is generated or loaded.
+        Input(s):       signature:  sorted tuple of (player, piece type) tuples, generals not included
+                        values:     array of packed results, one for each index
+        """
+
+        self._signature = tuple(signature)
+        self._slots = [("R", "general"), ("B", "general")] + list(self._signature)
+        self._squares = [piece_squares(player, piece_type) for player, piece_type in self._slots]
+        self._lookup = [dict((square, i) for i, square in enumerate(squares)) for squares in self._squares]
+        self._size = 2
+        for squares in self._squares:
+            self._size *= len(squares)
+        self._values = values
+
+    def get_signature(self):
+        """
+        Description:    Returns the material signature of the table
+        """
+
+        return self._signature
+
+    def get_slots(self):
+        """
+        Description:    Returns the (player, piece type) of each square in an index, generals first
+        """
+
+        return self._slots
+
+    def get_size(self):
+        """
+        Description:    Returns the number of positions in the table
+        """
+
+        return self._size
+
+    def get_values(self):
+        """
+        Description:    Returns the packed results of the table
+        """
+
+        return self._values
+
+    def index(self, turn, squares):
+        """
+        Description:    Returns the index of a position
+        Input(s):       turn:       "B" or "R"
+                        squares:    the (row, column) of each slot, in the same order as get_slots
+        Output(s):      the index, None if a piece is on a square the table does not cover
+        """
+
+        index = 0 if turn == "R" else 1
+        for lookup, square in zip(self._lookup, squares):
+            position = lookup.get(square)
+            if position is None:
+                return None
+            index = index * len(lookup) + position
+        return index
+
+    def decode(self, index):
+        """
+        Description:    Returns the position for an index. The reverse of index
+        Input(s):       index:  the index of the position
+        Output(s):      (turn, list of the (row, column) of each slot)
+        """
+
+        squares = []
+        for slot_squares in reversed(self._squares):
+            index, position = divmod(index, len(slot_squares))
+            squares.append(slot_squares[position])
+        squares.reverse()
+        turn = "R" if index == 0 else "B"
+        return turn, squares
+
+    def game_squares(self, game):
+        """
+        Description:    Matches the pieces on the board to the slots of the table
+        Input(s):       game:   the JanggiGame to look at
+        Output(s):      list of the (row, column) of each slot, None if the material does not match
+        """
+
+        remaining = {}
+        for coords, piece in game.get_board().items():
+            remaining.setdefault((piece.get_player(), piece.get_type()), []).append(coords)
+        squares = []
+        for slot in self._slots:
+            if len(remaining.get(slot, [])) == 0:
+                return None
+            squares.append(remaining[slot].pop())
+        for left in remaining.values():
+            if len(left) != 0:
+                return None
+        return squares
+
+    def probe_index(self, index):
+        """
+        Description:    Returns the result stored for an index
+        Input(s):       index:  the index of the position
+        Output(s):      (result, distance to mate in plies). result is WIN or LOSS for the player to move, DRAW,
+                        or INVALID for positions that can not happen
+        """
+
+        value = self._values[index]
+        return value & 3, value >> 2
+
+    def probe(self, game):
+        """
+        Description:    Returns the result for the position on the board
+        Input(s):       game:   the JanggiGame to look at
+        Output(s):      (result, distance to mate in plies), None if the table does not cover the position
+        """
+
+        squares = self.game_squares(game)
+        if squares is None:
+            return None
+        index = self.index(game.get_turn(), squares)
+        if index is None:
+            return None
+        return self.probe_index(index)
+
+    def save(self, path):
+        """
+        Description:    Writes the table to a file. The file is a short header with the signature followed by two
+                        bytes for each position.
+        Input(s):       path:   the file to write
+        """
+
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<HH", VERSION, len(self._signature)))
+            for player, piece_type in self._signature:
+                file.write(struct.pack("<cB", player.encode(), PIECE_TYPES.index(piece_type)))
+            file.write(struct.pack("<I", self._size))
+            values = array.array("H", self._values)
+            if sys.byteorder == "big":
+                values.byteswap()
+            values.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Description:    Reads a table written by save
+        Input(s):       path:   the file to read
+        """
+
+        with open(path, "rb") as file:
+            if file.read(4) != MAGIC:
+                raise ValueError("not a Janggi tablebase: " + str(path))
+            version, count = struct.unpack("<HH", file.read(4))
+            if version != VERSION:
+                raise ValueError("unsupported tablebase version: " + str(version))
+            signature = []
+            for _ in range(count):
+                player, type_index = struct.unpack("<cB", file.read(2))
+                signature.append((player.decode(), PIECE_TYPES[type_index]))
+            size = struct.unpack("<I", file.read(4))[0]
+            values = array.array("H")
+            values.fromfile(file, size)
+            if sys.byteorder == "big":
+                values.byteswap()
+        table = cls(tuple(signature), values)
+        if table.get_size() != size:
+            raise ValueError("tablebase size does not match its signature: " + str(path))
+        return table
+
+
+class TablebaseGenerator:
+    """
+    Description:    Solves tablebases with retrograde analysis. Every position of the signature is set up on a
+                    BitBoard to count its legal moves. Mates are then worked backwards through the predecessors in
+                    order of distance, so the first time a position is reached is its distance to mate. Captures
+                    lead into smaller tables, which are generated first.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Description:    Initializes the generator.
+        Input(s):       directory:  where tables are read from and saved to. None keeps them in memory only
+        """
+
+        self._directory = directory
+        self._tables = dict()
+
+    def get_table(self, signature):
+        """
+        Description:    Returns the table for the signature, loading or generating it if needed
+        Input(s):       signature:  sorted tuple of (player, piece type) tuples
+        """
+
+        signature = tuple(sorted(signature))
+        if signature in self._tables:
+            return self._tables[signature]
+        if self._directory is not None:
+            path = os.path.join(self._directory, signature_name(signature) + ".jgtb")
+            if os.path.exists(path):
+                self._tables[signature] = Tablebase.load(path)
+                return self._tables[signature]
+        table = self.generate(signature)
+        self._tables[signature] = table
+        if self._directory is not None:
+            os.makedirs(self._directory, exist_ok=True)
+            table.save(os.path.join(self._directory, signature_name(signature) + ".jgtb"))
+        return table
+
+    def generate(self, signature):
+        """
+        Description:    Solves every position of the signature. Each position is set up on a BitBoard once to count
+                        its legal moves and look up its captures in the smaller tables. The positions before a
+                        solved position are found by taking moves back on its board when it is solved, so no list
+                        of moves is kept.
+        Input(s):       signature:  sorted tuple of (player, piece type) tuples
+        Output(s):      the solved Tablebase
+        """
+
+        if len(signature) > MAX_PIECES:
+            raise ValueError("tablebases are limited to %d pieces besides the generals, %s has %d" %
+                             (MAX_PIECES, signature_name(signature), len(signature)))
+        table = Tablebase(signature)
+        size = table.get_size()
+        slots = table.get_slots()
+
+        values = array.array("H", bytes(2 * size))
+        remaining = array.array("i", bytes(4 * size))   # moves not yet known to lose for the player moving
+        events = []
+
+        for index in range(size):
+            turn, squares = table.decode(index)
+            if len(set(squares)) < len(squares):
+                continue
+            board = BitBoard((turn, [slot + square for slot, square in zip(slots, squares)]))
+            if board.general_attacked(other_player(turn)):  # the player that just moved left their general
+                continue
+            values[index] = DRAW
+            moves = board.legal_moves(turn)
+            if not board.general_attacked(turn):
+                moves.append(None)                          # passing is allowed when not in check
+            if len(moves) == 0:
+                heapq.heappush(events, (0, LOSS, index))     # checkmate
+                continue
+            remaining[index] = len(moves)
+            for move in moves:
+                if move is not None and board.get_square(move[1]) is not None:
+                    result, distance = self.probe_capture(signature, turn, squares, move)
+                    if result == WIN or result == LOSS:
+                        heapq.heappush(events, (distance, result, -1 - index))
+
+        while len(events) > 0:
+            distance, result, index = heapq.heappop(events)
+            if index < 0:
+                self.update(values, remaining, events, -1 - index, result, distance)
+                continue
+            if values[index] != DRAW:
+                continue
+            values[index] = (distance << 2) | result
+            for before in self.predecessors(table, index):
+                self.update(values, remaining, events, before, result, distance)
+
+        table._values = values
+        return table
+
+    def update(self, values, remaining, events, index, result, distance):
+        """
+        Description:    Tells a position that one of its moves leads to a solved position
+        Input(s):       values:     the packed results found so far
+                        remaining:  how many moves of each position are not known to lose
+                        events:     the heap of positions waiting to be solved
+                        index:      the position the move is played from
+                        result:     the result of the position after the move, for the other player
+                        distance:   the distance to mate of the position after the move
+        """
+
+        if values[index] != DRAW:
+            return
+        if result == LOSS:
+            heapq.heappush(events, (distance + 1, WIN, index))
+        elif result == WIN:
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                heapq.heappush(events, (distance + 1, LOSS, index))
+
+    def predecessors(self, table, index):
+        """
+        Description:    Returns the positions of the table that reach a position with one move that captures
+                        nothing, or a pass. Every piece moves back the way it came except horses, elephants and
+                        soldiers, whose moves can't be reversed, so those look up where they could have come from.
+                        Positions that can't happen are left in, update skips them.
+        Input(s):       table:  the table being generated
+                        index:  the position reached
+        Output(s):      list of indexes, each with the other player to move
+        """
+
+        turn, squares = table.decode(index)
+        player = other_player(turn)
+        slots = table.get_slots()
+        board = BitBoard((turn, [slot + square for slot, square in zip(slots, squares)]))
+        occupied = board.get_occupied()
+        cannons = board.get_pieces("B", "cannon") | board.get_pieces("R", "cannon")
+        found = [table.index(player, squares)]               # a pass
+        for slot, ((owner, piece_type), square) in enumerate(zip(slots, squares)):
+            if owner != player:
+                continue
+            new = square_index(square)
+            if piece_type == "chariot":
+                sources = chariot_attacks(new, occupied)
+            elif piece_type == "cannon":
+                sources = cannon_attacks(new, occupied, cannons)
+            elif piece_type == "horse" or piece_type == "elephant":
+                sources = 0
+                for source, blocks in (HORSE_FROM if piece_type == "horse" else ELEPHANT_FROM)[new]:
+                    if not blocks & occupied:
+                        sources |= source
+            elif piece_type == "soldier":
+                sources = SOLDIER_FROM[player][new]
+            else:
+                sources = PALACE_FROM[player][new]
+            for curr in to_squares(sources & ~occupied):
+                moved = list(squares)
+                moved[slot] = square_coords(curr)
+                before = table.index(player, moved)
+                if before is not None:
+                    found.append(before)
+        return found
+
+    def probe_capture(self, signature, turn, squares, move):
+        """
+        Description:    Looks up the position after a capture in the smaller table
+        Input(s):       signature:  the signature of the table being generated
+                        turn:       the player making the capture
+                        squares:    the (row, column) of each slot of the table being generated
+                        move:       (square number from, square number to) of the capture
+        Output(s):      (result, distance to mate) for the player to move after the capture
+        """
+
+        curr, new = square_coords(move[0]), square_coords(move[1])
+        slots = [("R", "general"), ("B", "general")] + list(signature)
+        smaller = list(signature)
+        after = []
+        for slot, square in zip(slots, squares):
+            if square == new:
+                smaller.remove(slot)
+            else:
+                after.append(new if square == curr else square)
+        table = self.get_table(tuple(smaller))
+        return table.probe_index(table.index(other_player(turn), after))
+
+
+class Tablebases:
+    """
+    Description:    The probe API used by search and analysis. Tables are read from a directory the first time a
+                    signature is asked for and kept in memory after that.
+    """
+
+    def __init__(self, directory, max_pieces=MAX_PIECES):
+        """
+        Description:    Initializes the probe API.
+        Input(s):       directory:  the directory the tables were saved in
+                        max_pieces: positions with more pieces than this, generals not included, are not probed
+        """
+
+        self._directory = directory
+        self._max_pieces = max_pieces
+        self._tables = dict()
+
+    def get_table(self, signature):
+        """
+        Description:    Returns the table for the signature, None if there is no file for it
+        Input(s):       signature:  sorted tuple of (player, piece type) tuples
+        """
+
+        if signature not in self._tables:
+            path = os.path.join(self._directory, signature_name(signature) + ".jgtb")
+            self._tables[signature] = Tablebase.load(path) if os.path.exists(path) else None
+        return self._tables[signature]
+
+    def probe(self, game):
+        """
+        Description:    Returns the result for the position on the board
+        Input(s):       game:   the JanggiGame to look at
+        Output(s):      (result, distance to mate in plies) for the player to move, None if no table covers it
+        """
+
+        if len(game.get_board()) > self._max_pieces + 2:
+            return None
+        table = self.get_table(material_signature(game))
+        if table is None:
+            return None
+        return table.probe(game)
+
+
+if __name__ == "__main__":
+    import time
+
+    names = sys.argv[2:] or ["RChariot"]
+    generator = TablebaseGenerator(sys.argv[1] if len(sys.argv) > 1 else "tablebases")
+    for name in names:
+        wanted = []
+        for part in name.split("_"):
+            wanted.append((part[0], part[1:].lower()))
+        start = time.perf_counter()
+        solved = generator.get_table(tuple(sorted(wanted)))
+        counts = dict()
+        for value in solved.get_values():
+            counts[value & 3] = counts.get(value & 3, 0) + 1
+        print(signature_name(solved.get_signature()), solved.get_size(), "positions",
+              counts.get(WIN, 0), "wins", counts.get(LOSS, 0), "losses", counts.get(DRAW, 0), "draws",
+              "%.1fs" % (time.perf_counter() - start))
@@ -0,0 +1,171 @@
+# Description:  The tables the engine looks things up in: where each piece can move from each square, the zobrist
+#               hash keys and the piece-square values. Working them out takes longer than reading them, so they are
+#               saved with marshal in the user's cache directory the first time they are built, or ahead of time
+#               with "python -m janggi.tables". The saved copy carries a checksum of the source files it was built
+#               from and is rebuilt when any of them change. Nothing is ever written into the package itself.
+
+import marshal
+import os
+import sys
+import zlib
+
+from janggi.rules import General, Soldier, square_values, zobrist_keys
+
+ZOBRIST_SEED = 20210227
+SOURCES = ["engine.py", "rules.py", "tables.py"]
+
+
+def cache_directory():
+    """
+    Description:    Returns the directory the tables are saved in: $JANGGI_CACHE if it is set, otherwise a janggi
+                    directory in $XDG_CACHE_HOME, ~/.cache or, on Windows, %LOCALAPPDATA%
+    """
+
+    if os.environ.get("JANGGI_CACHE"):
+        return os.environ["JANGGI_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base and os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "janggi")
+
+
+# marshal data is only readable by the Python version that wrote it, so each version keeps its own copy
+CACHE_PATH = os.path.join(cache_directory(), "tables-%d.%d.marshal" % sys.version_info[:2])
+
+
+def move_tables(game_class):
+    """
+    Description:    Precomputes where each piece can go from each square on an empty board, used by iter_moves.
+                    Soldiers, advisors and generals only step, so their targets come straight from the move
+                    helpers. Horses and elephants get their targets with the squares that would block them, and
+                    chariots and cannons get the squares along each direction, nearest first.
+    Input(s):       game_class: the JanggiGame class, whose move helpers are used on an empty board
+    Output(s):      dictionary of table name to table
+    """
+
+    game = game_class.__new__(game_class)
+    game._board = dict()
+    squares = [(row, col) for row in range(10) for col in range(9)]
+    tables = {"soldier": dict(), "palace": dict(), "horse": dict(), "elephant": dict(), "rays": dict()}
+
+    for player in ("B", "R"):
+        for row, col in squares:
+            tables["soldier"][player, (row, col)] = tuple(game.soldier_moves(Soldier(player, row, col)))
+            tables["palace"][player, (row, col)] = tuple(game.palace_moves(General(player, row, col)))
+
+    for row, col in squares:
+        horse = []
+        for leg, targets in [((1, 0), [(2, 1), (2, -1)]), ((-1, 0), [(-2, 1), (-2, -1)]),
+                             ((0, 1), [(1, 2), (-1, 2)]), ((0, -1), [(1, -2), (-1, -2)])]:
+            for target in targets:
+                if row + target[0] in range(10) and col + target[1] in range(9):
+                    horse.append((((row + leg[0], col + leg[1]),), (row + target[0], col + target[1])))
+        tables["horse"][row, col] = tuple(horse)
+
+        elephant = []
+        for first, second, target in [((1, 0), (2, 1), (3, 2)), ((1, 0), (2, -1), (3, -2)),
+                                      ((-1, 0), (-2, 1), (-3, 2)), ((-1, 0), (-2, -1), (-3, -2)),
+                                      ((0, 1), (1, 2), (2, 3)), ((0, 1), (-1, 2), (-2, 3)),
+                                      ((0, -1), (1, -2), (2, -3)), ((0, -1), (-1, -2), (-2, -3))]:
+            if row + target[0] in range(10) and col + target[1] in range(9):
+                blocks = ((row + first[0], col + first[1]), (row + second[0], col + second[1]))
+                elephant.append((blocks, (row + target[0], col + target[1])))
+        tables["elephant"][row, col] = tuple(elephant)
+
+        rays = []
+        for step_row, step_col in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            ray = []
+            counter = 1
+            while row + step_row * counter in range(10) and col + step_col * counter in range(9):
+                ray.append((row + step_row * counter, col + step_col * counter))
+                counter += 1
+            rays.append(tuple(ray))
+        tables["rays"][row, col] = tuple(rays)
+
+    return tables
+
+
+def fingerprint():
+    """
+    Description:    Returns a checksum of the source files the tables are built from
+    """
+
+    checksum = 0
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCES:
+        with open(os.path.join(directory, name), "rb") as file:
+            checksum = zlib.crc32(file.read(), checksum)
+    return checksum
+
+
+def build_tables(game_class):
+    """
+    Description:    Works out every table from scratch
+    Input(s):       game_class: the JanggiGame class
+    Output(s):      dictionary with "moves", "zobrist", "zobrist_turn" and "square_values"
+    """
+
+    zobrist, zobrist_turn = zobrist_keys(ZOBRIST_SEED)
+    return {"moves": move_tables(game_class), "zobrist": zobrist, "zobrist_turn": zobrist_turn,
+            "square_values": square_values()}
+
+
+def load_tables(game_class, path=CACHE_PATH):
+    """
+    Description:    Reads the saved tables, building and saving them if there is no up to date copy. A copy that
+                    can not be saved, for example with no writable home directory, is just used without saving it.
+    Input(s):       game_class: the JanggiGame class
+                    path:       where the tables are saved
+    Output(s):      dictionary with "moves", "zobrist", "zobrist_turn" and "square_values"
+    """
+
+    checksum = fingerprint()
+    try:
+        with open(path, "rb") as file:
+            saved = marshal.loads(file.read())
+        if saved.get("fingerprint") == checksum:
+            return saved
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+
+    tables = build_tables(game_class)
+    tables["fingerprint"] = checksum
+    save_tables(tables, path)
+    return tables
+
+
+def save_tables(tables, path):
+    """
+    Description:    Saves the tables through a temporary file, so a reader never sees half a copy. Each process
+                    writes its own temporary file, so two processes starting at once do not mix their copies.
+    Input(s):       tables: the tables, with their fingerprint
+                    path:   where to save them
+    Output(s):      True if they were saved
+    """
+
+    temporary = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, "wb") as file:
+            file.write(marshal.dumps(tables))
+        os.replace(temporary, path)
+        return True
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        return False
+
+
+if __name__ == "__main__":
+    from janggi.engine import JanggiGame
+
+    built = build_tables(JanggiGame)
+    built["fingerprint"] = fingerprint()
+    if not save_tables(built, CACHE_PATH):
+        print("could not write", CACHE_PATH)
+        sys.exit(1)
+    print("wrote", CACHE_PATH)
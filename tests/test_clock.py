@@ -0,0 +1,115 @@
+# Description:  Tests janggi.clock on a fake timer, so no test waits for real time: byoyomi periods used by moves
+#               that overrun, flagging, the increment, and allocate_time staying inside what the clock has left.
+#               Also tests that EnginePlayer counts a pondered reply the opponent played as a hit and any other
+#               reply as a miss.
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.clock import MARGIN, Clock, allocate_time
+from janggi.engine import JanggiGame
+from janggi.player import EnginePlayer
+
+
+class FakeTimer:
+    """
+    Description:    A timer that only moves when told to
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def timed_move(clock, timer, player, seconds):
+    """
+    Description:    Runs the player's clock for a move that takes the given seconds
+    """
+
+    clock.start(player)
+    timer.now += seconds
+    return clock.stop()
+
+
+class ClockTest(unittest.TestCase):
+
+    def test_byoyomi_periods(self):
+        timer = FakeTimer()
+        clock = Clock(10, byoyomi=5, periods=3, timer=timer)
+        timed_move(clock, timer, "B", 8)
+        self.assertEqual((clock.get_main("B"), clock.get_periods("B")), (2.0, 3))
+        timed_move(clock, timer, "B", 6)             # 4 seconds into the first period
+        self.assertEqual((clock.get_main("B"), clock.get_periods("B")), (0.0, 3))
+        timed_move(clock, timer, "B", 4.5)           # within a period, nothing is used up
+        self.assertEqual(clock.get_periods("B"), 3)
+        timed_move(clock, timer, "B", 7)             # overran one period
+        self.assertEqual(clock.get_periods("B"), 2)
+        self.assertIsNone(clock.get_flagged())
+        timed_move(clock, timer, "B", 11)            # overran both periods left
+        self.assertEqual(clock.get_periods("B"), 0)
+        self.assertEqual(clock.get_flagged(), "B")
+        self.assertEqual(clock.get_used("B"), [8, 6, 4.5, 7, 11])
+        self.assertEqual(clock.get_periods("R"), 3)
+
+    def test_increment(self):
+        timer = FakeTimer()
+        clock = Clock(10, increment=2, timer=timer)
+        clock.start("B")
+        timer.now += 5
+        clock.press()
+        self.assertEqual(clock.get_main("B"), 7.0)
+        self.assertEqual(clock.get_running(), "R")
+        timer.now += 3
+        self.assertEqual(clock.get_main("R"), 7.0)       # counts the running clock
+        clock.press()
+        timer.now += 7.5                                 # past the main time: the increment comes too late
+        clock.press()
+        self.assertEqual(clock.get_flagged(), "B")
+        self.assertIsNone(clock.get_running())
+
+    def test_allocate_within_clock(self):
+        game = JanggiGame()
+        for state in [(1.0, 0.0, 0.0, 0), (0.0, 0.0, 5.0, 1), (300.0, 2.0, 0.0, 0), (0.0, 0.0, 5.0, 0)]:
+            soft, limit = allocate_time(game, *state)
+            self.assertLessEqual(soft, limit)
+            self.assertLessEqual(limit, max(0.0, state[0] + (state[2] if state[3] > 0 else 0.0) - MARGIN))
+        self.assertGreater(allocate_time(game, 0.0, 0.0, 5.0, 1)[1], 0)
+        self.assertEqual(allocate_time(game, 0.0, 0.0, 5.0, 0), (0.0, 0.0))
+
+
+class PonderTest(unittest.TestCase):
+
+    def reply(self, expected):
+        """
+        Description:    Has the engine move and ponder, then plays the expected reply or another one
+        Output(s):      the engine after its next move
+        """
+
+        game = JanggiGame()
+        engine = EnginePlayer(max_depth=3)
+        curr, new = engine.choose_move(game)
+        guess = engine.get_last()[2][1]
+        self.assertTrue(game.make_move(game.convert_loc(curr), game.convert_loc(new)))
+        engine.ponder(game)
+        self.assertEqual(engine.get_ponders(), 1)
+        if not expected:
+            guess = [move for move in game.legal_moves() if move != guess][0]
+        self.assertTrue(game.make_move(game.convert_loc(guess[0]), game.convert_loc(guess[1])))
+        self.assertIn(engine.choose_move(game), game.legal_moves())
+        engine.stop_pondering()
+        return engine
+
+    def test_hit(self):
+        self.assertEqual(self.reply(True).get_hits(), 1)
+
+    def test_miss(self):
+        self.assertEqual(self.reply(False).get_hits(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# Description:  Tests that the running zobrist hash and piece-square scores of JanggiGame, which make_move, do_move
+#               and undo_move update move by move, always match the values worked out from scratch. The games turn
+#               on set_eval_check, so every call to evaluate also asserts the scores against compute_scores.
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+
+
+def checked_game():
+    """
+    Description:    Returns a new game with the full recompute check turned on
+    """
+
+    game = JanggiGame()
+    game.set_eval_check(True)
+    return game
+
+
+class RunningValuesTest(unittest.TestCase):
+
+    def assert_running(self, game):
+        """
+        Description:    Checks the running hash and scores against compute_hash and compute_scores
+        """
+
+        self.assertEqual(game.get_hash(), game.compute_hash())
+        game.evaluate()             # asserts the scores while the check is on
+
+    def test_make_move(self):
+        captures = 0
+        for seed in range(8):
+            generator = random.Random(seed)
+            game = checked_game()
+            for _ in range(150):
+                moves = game.legal_moves()
+                if len(moves) == 0 or game.get_game_state() != "UNFINISHED":
+                    break
+                curr, new = generator.choice(moves)
+                captures += new in game.get_board()
+                self.assertTrue(game.make_move(game.convert_loc(curr), game.convert_loc(new)))
+                self.assert_running(game)
+        self.assertGreater(captures, 20)
+
+    def test_rejected_move_leaves_values(self):
+        game = checked_game()
+        before = (game.get_hash(), dict(game._scores))
+        self.assertFalse(game.make_move("a1", "a5"))         # a chariot can't jump over the soldier
+        self.assertEqual((game.get_hash(), game._scores), before)
+        self.assert_running(game)
+
+    def test_pinned_piece(self):
+        game = checked_game()
+        game.load_position("B", [("B", "general", 8, 4), ("B", "chariot", 6, 4), ("R", "chariot", 2, 4),
+                                 ("R", "general", 1, 3)])
+        before = (game.get_hash(), dict(game._scores), game.export_position())
+        self.assertFalse(game.make_move("e7", "a7"))         # the chariot shields the general from the other one
+        self.assertEqual((game.get_hash(), game._scores, game.export_position()), before)
+        self.assertTrue(game.make_move("e7", "e3"))
+        self.assert_running(game)
+
+    def test_pass(self):
+        game = checked_game()
+        general = game.convert_loc(game.find_general("B"))
+        self.assertTrue(game.make_move(general, general))
+        self.assert_running(game)
+
+    def test_do_and_undo_move(self):
+        generator = random.Random(1)
+        game = checked_game()
+        for _ in range(60):
+            moves = game.legal_moves()
+            if len(moves) == 0 or game.get_game_state() != "UNFINISHED":
+                break
+            before = (game.get_hash(), dict(game._scores), dict(game.get_board()))
+            for curr, new in moves:
+                captured = game.do_move(curr, new)
+                self.assert_running(game)
+                game.undo_move(curr, new, captured)
+                self.assertEqual((game.get_hash(), game._scores, game.get_board()), before)
+            curr, new = generator.choice(moves)
+            game.make_move(game.convert_loc(curr), game.convert_loc(new))
+
+    def test_capture_sequence(self):
+        game = checked_game()
+        for curr, new in [("c7", "c6"), ("c4", "c5"), ("c6", "c5")]:      # blue's soldier takes red's
+            self.assertTrue(game.make_move(curr, new))
+            self.assert_running(game)
+        self.assertEqual(sum(piece.get_type() == "soldier" for piece in game.get_board().values()), 9)
+        line = []
+        for curr, new in [((3, 4), (4, 4)), ((6, 4), (5, 4)), ((4, 4), (5, 4))]:
+            line.append((curr, new, game.do_move(curr, new)))
+            self.assert_running(game)
+        self.assertIsNotNone(line[-1][2])
+        for curr, new, captured in reversed(line):
+            game.undo_move(curr, new, captured)
+            self.assert_running(game)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# Description:  Tests that games made with JanggiGame.fork keep their own position history while sharing the part
+#               they were forked with, and that repetition counts, the move limit and undo_move see the whole of it.
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import HISTORY_DEPTH, JanggiGame
+
+
+class ForkHistoryTest(unittest.TestCase):
+
+    def test_fork_every_move(self):
+        generator = random.Random(29)
+        game = JanggiGame()
+        expected = [game.get_hash()]
+        for _ in range(3 * HISTORY_DEPTH):
+            parent, game = game, game.fork()
+            curr, new = generator.choice(game.legal_moves())
+            game.do_move(curr, new)
+            expected.append(game.get_hash())
+            self.assertEqual(game.get_history(), expected)
+            self.assertEqual(parent.get_history(), expected[:-1])
+            self.assertEqual(game.history_length(), len(expected))
+            self.assertEqual(game.repetition_count(), expected.count(game.get_hash()))
+
+    def test_forks_do_not_share_moves(self):
+        game = JanggiGame()
+        self.assertTrue(game.make_move("c7", "c6"))
+        start = list(game.get_history())
+        first, second = game.fork(), game.fork()
+        first.do_move((3, 0), (4, 0))
+        second.do_move((3, 8), (4, 8))
+        self.assertTrue(game.make_move("a4", "a5"))
+        self.assertEqual(first.get_history(), start + [first.get_hash()])
+        self.assertEqual(second.get_history(), start + [second.get_hash()])
+        self.assertEqual(game.get_history(), start + [game.get_hash()])
+        self.assertEqual(len(game.get_pieces()), 32)
+        self.assertEqual(len(first.get_pieces()), 32)
+
+    def test_repetition_across_fork(self):
+        game = JanggiGame()
+        game.set_draw_rules(3)
+        moves = [("h10", "g8"), ("h1", "g3"), ("g8", "h10"), ("g3", "h1")]
+        for curr, new in moves:
+            self.assertTrue(game.make_move(curr, new))
+        branch = game.fork()
+        for curr, new in moves:
+            self.assertEqual(branch.get_game_state(), "UNFINISHED")
+            branch.make_move(curr, new)
+        self.assertEqual(branch.repetition_count(), 3)
+        self.assertEqual(branch.get_game_state(), "DRAW")
+        self.assertEqual(game.repetition_count(), 2)
+
+    def test_undo_past_fork(self):
+        game = JanggiGame()
+        first = game.do_move((6, 2), (5, 2))
+        branch = game.fork()
+        second = branch.do_move((3, 2), (4, 2))
+        branch.undo_move((3, 2), (4, 2), second)
+        branch.undo_move((6, 2), (5, 2), first)
+        self.assertEqual(branch.get_history(), [JanggiGame().get_hash()])
+        self.assertEqual(branch.repetition_count(), 1)
+        self.assertEqual(game.history_length(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
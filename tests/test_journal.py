@@ -0,0 +1,101 @@
+# Description:  Tests that janggi.journal recovers games after a crash: a snapshot followed by logged moves is loaded
+#               and replayed, a frame cut off part way through the last log is dropped along with the moves in it,
+#               and files in the store directory that are not logs are left alone.
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.journal import GameStore
+
+
+def play(store, game_id, generator, count):
+    """
+    Description:    Makes random moves in a game of the store
+    Output(s):      the history of the game after each move
+    """
+
+    game = store.get_game(game_id)
+    histories = []
+    for _ in range(count):
+        curr, new = generator.choice(game.legal_moves())
+        store.make_move(game_id, game.convert_loc(curr), game.convert_loc(new))
+        histories.append(list(game.get_history()))
+    return histories
+
+
+def crash(store):
+    """
+    Description:    Drops the store the way a crash would, without writing the moves still collected
+    """
+
+    store._file.close()
+    store._file = None
+
+
+class GameStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.generator = random.Random(42)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_snapshot_and_log(self):
+        store = GameStore(self.directory, group_size=4, snapshot_every=None)
+        first, second = store.new_game(), store.new_game()
+        play(store, first, self.generator, 10)
+        store.snapshot()
+        play(store, second, self.generator, 7)
+        expected = play(store, first, self.generator, 5)[-1]
+        store.close_game(second)
+        store.commit()
+        crash(store)
+
+        store = GameStore(self.directory)
+        self.assertEqual(list(store.get_games()), [first])
+        self.assertEqual(store.get_game(first).get_history(), expected)
+        self.assertEqual(store.new_game(), second + 1)
+        store.close()
+
+    def test_crash_mid_segment(self):
+        store = GameStore(self.directory, group_size=1, snapshot_every=None)
+        game_id = store.new_game()
+        play(store, game_id, self.generator, 6)
+        store.snapshot()
+        histories = play(store, game_id, self.generator, 6)
+        crash(store)
+        log = os.path.join(self.directory, "log.1")
+        with open(log, "r+b") as file:
+            file.truncate(os.path.getsize(log) - 3)         # the last move was only partly written
+
+        store = GameStore(self.directory, group_size=1)
+        self.assertEqual(store.get_game(game_id).get_history(), histories[-2])
+        expected = play(store, game_id, self.generator, 3)[-1]
+        store.close()
+        store = GameStore(self.directory)
+        self.assertEqual(store.get_game(game_id).get_history(), expected)
+        store.close()
+
+    def test_other_files(self):
+        open(os.path.join(self.directory, "log.tmp"), "wb").close()
+        store = GameStore(self.directory, snapshot_every=None)
+        game_id = store.new_game()
+        expected = play(store, game_id, self.generator, 4)[-1]
+        store.snapshot()
+        store.close()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "log.tmp")))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "log.0")))
+        store = GameStore(self.directory)
+        self.assertEqual(store.get_game(game_id).get_history(), expected)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
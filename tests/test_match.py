@@ -0,0 +1,36 @@
+# Description:  Tests the statistics of janggi.match on results with no spread: one side winning every game, or every
+#               game drawn, has to give a finite Elo interval and a decided sequential probability ratio test.
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.match import elo_difference, sprt
+
+
+class MatchStatisticsTest(unittest.TestCase):
+
+    def test_one_sided(self):
+        self.assertEqual(sprt(200, 0, 0)[3], "H1")
+        self.assertEqual(sprt(0, 0, 200)[3], "H0")
+        self.assertEqual(sprt(0, 200, 0)[3], "H0")       # even, so not 10 Elo stronger
+
+    def test_finite_interval(self):
+        for result in [(4, 0, 0), (0, 0, 4), (0, 5, 0), (0, 0, 0), (200, 0, 0)]:
+            elo, low, high = elo_difference(*result)
+            self.assertTrue(all(math.isfinite(value) for value in (elo, low, high)), result)
+            self.assertLess(low, elo)
+            self.assertLess(elo, high)
+        self.assertGreater(elo_difference(4, 0, 0)[0], 0)
+        self.assertLess(elo_difference(0, 0, 4)[0], 0)
+
+    def test_few_games_undecided(self):
+        self.assertIsNone(sprt(4, 0, 0)[3])
+        self.assertIsNone(sprt(0, 0, 0)[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
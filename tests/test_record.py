@@ -0,0 +1,69 @@
+# Description:  Tests that games added to an existing record file never leave it unreadable: until the new footer is
+#               written the reader finds the old one, and the next writer carries on from it.
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.record import RecordReader, RecordWriter
+
+GAMES = [[("c7", "c6"), ("c1", "d3")], [("a7", "a6"), ("a4", "a5"), ("e9", "e8")], [("c10", "d8")]]
+
+
+class RecordAppendTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".jgr")
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def read_moves(self):
+        with RecordReader(self.path) as reader:
+            return [reader.game_moves(number) for number in range(reader.game_count())]
+
+    def test_append(self):
+        with RecordWriter(self.path) as writer:
+            writer.add_game(GAMES[0])
+        with RecordWriter(self.path) as writer:
+            writer.add_game(GAMES[1])
+            writer.add_game(GAMES[2])
+        moves = self.read_moves()
+        self.assertEqual(len(moves), 3)
+        self.assertEqual(len(moves[1]), 3)
+        with RecordReader(self.path) as reader:
+            self.assertEqual(reader.get_end(), os.path.getsize(self.path))
+
+    def test_crash_while_appending(self):
+        with RecordWriter(self.path) as writer:
+            writer.add_game(GAMES[0])
+        before = self.read_moves()
+
+        writer = RecordWriter(self.path)
+        writer.add_game(GAMES[1])
+        writer._file.close()                # stands in for a crash before close writes the footer
+        self.assertEqual(self.read_moves(), before)
+
+        with RecordWriter(self.path) as writer:
+            self.assertEqual(writer.add_game(GAMES[2]), 1)
+        moves = self.read_moves()
+        self.assertEqual(moves[0], before[0])
+        self.assertEqual(len(moves), 2)
+        self.assertEqual(len(moves[1]), 1)
+
+    def test_not_closed(self):
+        writer = RecordWriter(self.path)
+        writer.add_game(GAMES[0])
+        writer._file.close()
+        with self.assertRaises(ValueError):
+            RecordReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
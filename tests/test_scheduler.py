@@ -0,0 +1,61 @@
+# Description:  Tests that a job whose search raises in a worker process finishes with the exception, which
+#               Job.wait and Job.get_result raise again, while the other jobs on the Scheduler still get their result.
+#               Also tests that a job carried on to its next depth keeps the order of all its root moves and the
+#               killer moves and history of its Search.
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.scheduler import WORKER_SEARCHES, Job, Scheduler, run_depth
+from janggi.search import Search
+
+
+class SchedulerErrorTest(unittest.TestCase):
+
+    def test_worker_exception(self):
+        broken = Job(JanggiGame(), 2)
+        broken._position = ("B", (("B", "dragon", 0, 0),))      # load_position has no such piece type
+        with Scheduler(1) as scheduler:
+            job = scheduler.submit(Job(JanggiGame(), 2))
+            scheduler.submit(broken)
+            self.assertEqual(job.wait()[3], 2)
+            with self.assertRaises(KeyError):
+                broken.wait()
+        self.assertTrue(broken.is_done())
+        self.assertIsInstance(broken.get_error(), KeyError)
+        self.assertIsNone(job.get_error())
+        with self.assertRaises(KeyError):
+            broken.get_result()
+
+
+
+class ResumeTest(unittest.TestCase):
+
+    def test_run_depth_keeps_ordering(self):
+        game = JanggiGame()
+        position, history = game.export_position(), game.get_history()
+        first = run_depth("resume", position, history, 1, None, None, None)
+        game, search = WORKER_SEARCHES["resume"]
+        self.assertEqual(sorted(first[5]), sorted(game.legal_moves()))
+        self.assertEqual(first[5][0], first[0])
+
+        cleared = []
+        search.get_ordering().new_search = lambda: cleared.append(True)
+        second = run_depth("resume", position, history, 2, first[5], None, None)
+        self.assertEqual(cleared, [])
+        self.assertEqual(second[3], 2)
+        self.assertEqual(second[5], search.get_root_order())
+        self.assertEqual(sorted(second[5]), sorted(first[5]))
+        self.assertEqual(second[5][0], second[0])
+        del WORKER_SEARCHES["resume"]
+
+        fresh = Search(game)
+        self.assertEqual(fresh.search(2)[1], second[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
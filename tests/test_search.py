@@ -0,0 +1,47 @@
+# Description:  Tests that the parallel search, where a root move can fail low against a bound found by another
+#               worker, returns the same best move and score as the serial search.
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.search import ParallelSearch, Search
+
+
+def opening():
+    """
+    Description:    Returns the position of benchmarks/bench_parallel_search.py, where many root moves tie
+    """
+
+    game = JanggiGame()
+    for curr, new in [("c7", "c6"), ("c1", "d3"), ("b10", "d7"), ("b3", "e3"), ("c10", "d8"), ("h1", "g3")]:
+        game.make_move(curr, new)
+    return game
+
+
+def random_game(seed, plies):
+    generator = random.Random(seed)
+    game = JanggiGame()
+    for _ in range(plies):
+        curr, new = generator.choice(game.legal_moves())
+        game.make_move(game.convert_loc(curr), game.convert_loc(new))
+    return game
+
+
+class ParallelSearchTest(unittest.TestCase):
+
+    def test_same_as_serial(self):
+        games = [opening(), random_game(5, 16), random_game(6, 16)]
+        with ParallelSearch(2) as parallel:
+            for game in games:
+                move, score, pv, depth = Search(game.fork()).search(3)
+                for _ in range(3):
+                    self.assertEqual(parallel.search(game, 3)[:2], (move, score))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# Description:  Tests janggi.tablebase on the red soldier table, the smallest one with wins in it: mates found by the
+#               generator are mates on a JanggiGame, each win has a move into a loss one ply nearer mate, tables
+#               without wins are all draws, a saved table loads back the same, and too many pieces are rejected.
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janggi.engine import JanggiGame
+from janggi.tablebase import DRAW, INVALID, LOSS, MAX_PIECES, WIN, Tablebase, TablebaseGenerator
+
+SOLDIER = (("R", "soldier"),)
+
+
+def load(table, index):
+    """
+    Description:    Sets up the position of a table index on a JanggiGame
+    """
+
+    turn, squares = table.decode(index)
+    game = JanggiGame()
+    game.load_position(turn, [slot + square for slot, square in zip(table.get_slots(), squares)])
+    return game
+
+
+class TablebaseTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = TablebaseGenerator()
+        cls.table = cls.generator.get_table(SOLDIER)
+
+    def results(self, table, result, distance=None):
+        return [index for index in range(table.get_size()) if table.probe_index(index)[0] == result and
+                (distance is None or table.probe_index(index)[1] == distance)]
+
+    def test_mates(self):
+        mates = self.results(self.table, LOSS, 0)
+        self.assertGreater(len(mates), 0)
+        for index in mates:
+            game = load(self.table, index)
+            self.assertEqual(game.get_check(), game.get_turn())
+            self.assertEqual(game.legal_moves(allow_pass=True), [])
+            self.assertEqual(self.table.probe(game), (LOSS, 0))
+
+    def test_wins(self):
+        wins = self.results(self.table, WIN)
+        self.assertGreater(len(wins), 0)
+        for index in wins:
+            game = load(self.table, index)
+            distance = self.table.probe(game)[1]
+            replies = []
+            for curr, new in game.legal_moves():
+                captured = game.do_move(curr, new)
+                replies.append(self.table.probe(game))
+                game.undo_move(curr, new, captured)
+            self.assertIn((LOSS, distance - 1), replies)
+            self.assertTrue(all(reply is None or reply[0] != WIN for reply in replies))
+
+    def test_draws(self):
+        table = self.generator.get_table((("B", "advisor"),))
+        self.assertEqual(self.results(table, WIN) + self.results(table, LOSS), [])
+        self.assertGreater(len(self.results(table, DRAW)), 0)
+        self.assertEqual(table.probe(load(table, self.results(table, DRAW)[0])), (DRAW, 0))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "soldier.jgtb")
+            self.table.save(path)
+            loaded = Tablebase.load(path)
+        self.assertEqual(loaded.get_signature(), SOLDIER)
+        self.assertEqual(loaded.get_size(), self.table.get_size())
+        self.assertEqual(list(loaded.get_values()), list(self.table.get_values()))
+        self.assertIn(INVALID, loaded.get_values())
+
+    def test_too_many_pieces(self):
+        signature = (("B", "chariot"),) * (MAX_PIECES + 1)
+        self.assertRaises(ValueError, self.generator.generate, signature)
+
+
+if __name__ == "__main__":
+    unittest.main()